@@ -32,6 +32,7 @@ from models.order_detail import OrderDetailModel
 from models.bill import BillModel
 from models.address import AddressModel
 from models.review import ReviewModel
+from models.product_rating_stats import ProductRatingStatsModel
 
 target_metadata = base.metadata
 
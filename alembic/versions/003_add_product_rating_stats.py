@@ -0,0 +1,60 @@
+"""Add product_rating_stats table
+
+Revision ID: 003_product_rating_stats
+Revises: 002_add_client_id
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_product_rating_stats'
+down_revision = '002_add_client_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the per-product review aggregates table and backfill it"""
+
+    # Step 1: Create table (one row per reviewed product)
+    op.create_table(
+        'product_rating_stats',
+        sa.Column('id_key', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.Float(), nullable=False),
+        sa.Column('rating_count', sa.Integer(), nullable=False),
+        sa.Column('rating_1', sa.Integer(), nullable=False),
+        sa.Column('rating_2', sa.Integer(), nullable=False),
+        sa.Column('rating_3', sa.Integer(), nullable=False),
+        sa.Column('rating_4', sa.Integer(), nullable=False),
+        sa.Column('rating_5', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id_key'], ),
+        sa.PrimaryKeyConstraint('id_key'),
+        sa.UniqueConstraint('product_id')
+    )
+
+    # Step 2: Backfill from existing reviews (ratings bucketed half up)
+    op.execute("""
+        INSERT INTO product_rating_stats
+            (product_id, rating_sum, rating_count, rating_1, rating_2, rating_3, rating_4, rating_5)
+        SELECT
+            product_id,
+            SUM(rating),
+            COUNT(*),
+            SUM(CASE WHEN rating < 1.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 1.5 AND rating < 2.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 2.5 AND rating < 3.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 3.5 AND rating < 4.5 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN rating >= 4.5 THEN 1 ELSE 0 END)
+        FROM reviews
+        WHERE product_id IS NOT NULL
+        GROUP BY product_id
+    """)
+
+
+def downgrade() -> None:
+    """Drop the per-product review aggregates table"""
+    op.drop_table('product_rating_stats')
@@ -0,0 +1,27 @@
+"""Add composite indexes for paginated review listings
+
+Revision ID: 004_review_listing_indexes
+Revises: 003_product_rating_stats
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '004_review_listing_indexes'
+down_revision = '003_product_rating_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create (product_id, id_key) and (product_id, rating, id_key) indexes on reviews"""
+    op.create_index('ix_reviews_product_id_id_key', 'reviews', ['product_id', 'id_key'], unique=False)
+    op.create_index('ix_reviews_product_id_rating', 'reviews', ['product_id', 'rating', 'id_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the review listing indexes"""
+    op.drop_index('ix_reviews_product_id_rating', table_name='reviews')
+    op.drop_index('ix_reviews_product_id_id_key', table_name='reviews')
@@ -14,6 +14,20 @@ class PaginationConfig:
     MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', '1000'))
     MIN_LIMIT = 1
 
+    # Total counts: below this size COUNT(*) is exact, above it planner estimates are used
+    EXACT_COUNT_THRESHOLD = int(os.getenv('PAGINATION_EXACT_COUNT_THRESHOLD', '10000'))
+
+    # Batch fetch (`?ids=1,2,3`): hard cap on ids per request
+    MAX_BATCH_IDS = int(os.getenv('PAGINATION_MAX_BATCH_IDS', '100'))
+
+    # Cursor-paginated order history (/orders/me)
+    HISTORY_DEFAULT_LIMIT = 20
+    HISTORY_MAX_LIMIT = 100
+
+    # Cursor-paginated product reviews (/reviews/product/{id})
+    REVIEWS_DEFAULT_LIMIT = 20
+    REVIEWS_MAX_LIMIT = 100
+
 
 class CacheConfig:
     """Cache TTL and configuration constants"""
@@ -23,6 +37,30 @@ class CacheConfig:
     PRODUCT_ITEM_TTL = 300  # 5 minutes
     CATEGORY_LIST_TTL = 3600  # 1 hour (rarely changes)
     CATEGORY_ITEM_TTL = 3600  # 1 hour
+    LIST_COUNT_TTL = 30  # 30 seconds (totals tolerate slight staleness)
+    ORDER_HISTORY_TTL = 300  # 5 minutes (invalidated on the user's order writes)
+    REVIEW_STATS_TTL = 600  # 10 minutes (invalidated on review writes)
+    REVIEW_PAGE_TTL = 600  # 10 minutes (first pages only, invalidated on review writes)
+    PRINCIPAL_TTL = 60  # 1 minute (authenticated user, invalidated on user updates)
+
+
+class InventoryConfig:
+    """Hot-inventory (Redis stock reservation) constants"""
+    # Products whose stock is reserved in Redis instead of by a DB row lock (opt-in)
+    HOT_PRODUCT_IDS = frozenset(
+        int(product_id) for product_id in os.getenv('HOT_INVENTORY_PRODUCT_IDS', '').split(',')
+        if product_id.strip()
+    )
+    RESERVATION_TTL = int(os.getenv('HOT_INVENTORY_RESERVATION_TTL', '300'))  # 5 minutes
+    RECONCILE_BATCH_SIZE = int(os.getenv('HOT_INVENTORY_RECONCILE_BATCH_SIZE', '500'))
+    RECONCILE_INTERVAL = int(os.getenv('HOT_INVENTORY_RECONCILE_INTERVAL', '5'))  # seconds
+
+
+class PasswordHashConfig:
+    """Bounded process pool used for bcrypt hashing and verification"""
+    WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+    MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', '32'))  # queued + running before 503
+    TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))  # seconds
 
 
 class LogConfig:
@@ -31,6 +69,27 @@ class LogConfig:
     LOG_BACKUP_COUNT = 5
     DEFAULT_LOG_LEVEL = 'INFO'
 
+    # Handlers run on background threads behind bounded queues (see config.logging_config)
+    ASYNC = os.getenv('LOG_ASYNC', 'true').lower() == 'true'
+    QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))  # records per handler
+    # "drop_new": discard the incoming record when full; "drop_oldest": evict the oldest queued one
+    DROP_POLICY = os.getenv('LOG_DROP_POLICY', 'drop_new')
+
+    # "text" or "json" (one object per line, for log aggregation)
+    FORMAT = os.getenv('LOG_FORMAT', 'text')
+    # Share of successful requests written to the access log (4xx/5xx always are)
+    ACCESS_LOG_SAMPLE_RATE = float(os.getenv('LOG_ACCESS_SAMPLE_RATE', '1.0'))
+
+
+class TracingConfig:
+    """OpenTelemetry tracing (see utils.tracing)"""
+    ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+    SERVICE_NAME = os.getenv('OTEL_SERVICE_NAME', 'ecommerce-api')
+    # Head sampling: share of new traces recorded; requests with a sampled
+    # traceparent are always recorded (parent-based)
+    SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', '0.1'))
+    # Spans are exported over OTLP/HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (default http://localhost:4318)
+
 
 class RateLimitConfig:
     """Rate limiting constants"""
@@ -47,6 +106,13 @@ class RateLimitConfig:
     REVIEW_CREATE_CALLS = 3  # requests per minute
     REVIEW_CREATE_PERIOD = 60
 
+    # "redis": exact, one Redis round trip per request
+    # "local": per-worker token buckets synced to Redis in batches (approximate)
+    MODE = os.getenv('RATE_LIMIT_MODE', 'redis')
+    LOCAL_SYNC_INTERVAL = float(os.getenv('RATE_LIMIT_SYNC_INTERVAL', '0.25'))  # seconds
+    # Client keys tracked per worker and limit; the oldest bucket is evicted beyond it
+    LOCAL_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_LOCAL_MAX_BUCKETS', '100000'))
+
 
 class DatabaseConfig:
     """Database connection constants"""
@@ -55,6 +121,13 @@ class DatabaseConfig:
     DEFAULT_POOL_TIMEOUT = 10  # seconds (fail fast for high concurrency)
     DEFAULT_POOL_RECYCLE = 3600  # 1 hour
 
+    # Write transactions (services.unit_of_work)
+    TX_MAX_RETRIES = int(os.getenv('DB_TX_MAX_RETRIES', '3'))  # retries after the first attempt
+    TX_RETRY_BASE_DELAY = float(os.getenv('DB_TX_RETRY_BASE_DELAY', '0.05'))  # seconds
+    TX_RETRY_MAX_DELAY = float(os.getenv('DB_TX_RETRY_MAX_DELAY', '1.0'))  # seconds
+    TX_LOCK_TIMEOUT_MS = int(os.getenv('DB_TX_LOCK_TIMEOUT_MS', '2000'))
+    TX_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_TX_STATEMENT_TIMEOUT_MS', '10000'))
+
 
 class ValidationConfig:
     """Validation-related constants"""
@@ -78,6 +151,9 @@ class ValidationConfig:
     # Price comparison precision
     PRICE_EPSILON = 0.01  # For float comparison
 
+    # Checkout: maximum distinct lines in one cart
+    MAX_CHECKOUT_ITEMS = 100
+
 
 class ErrorMessages:
     """Centralized error message templates"""
@@ -14,6 +14,7 @@ from models.client import ClientModel  # noqa
 from models.order import OrderModel  # noqa
 from models.order_detail import OrderDetailModel  # noqa
 from models.product import ProductModel  # noqa
+from models.product_rating_stats import ProductRatingStatsModel  # noqa
 from models.review import ReviewModel  # noqa
 from models.user import UserModel  # noqa
 from models.payment_method import PaymentMethodModel  # noqa
@@ -2,11 +2,31 @@
 Centralized Logging Configuration
 
 Provides consistent logging configuration across the entire application.
+
+Handlers never run on request threads: each configured handler is fed by a
+bounded queue and drained by a QueueListener thread, so a slow disk or
+stdout pipe cannot add request latency. When a queue is full, records are
+dropped (LogConfig.DROP_POLICY) and counted instead of blocking, in the
+log_records_dropped_total metric.
+
+Every record carries the request id, route and user id of the request that
+logged it (RequestIDFilter). LOG_FORMAT=json writes one JSON object per
+line (JsonFormatter) for log aggregation.
 """
+import json
 import os
 import logging
 import logging.config
+import logging.handlers
+import queue
+import threading
+from collections import Counter
 from pathlib import Path
+from typing import Dict, List
+
+from config.constants import LogConfig
+from middleware.request_id_middleware import RequestIDFilter
+from utils.metrics import LOG_RECORDS_DROPPED
 
 
 # Create logs directory if it doesn't exist
@@ -14,30 +34,72 @@ LOGS_DIR = Path("logs")
 LOGS_DIR.mkdir(exist_ok=True)
 
 
+class JsonFormatter(logging.Formatter):
+    """Formats records as one-line JSON objects, with request context and access log fields"""
+
+    FIELDS = ('request_id', 'trace_id', 'route', 'user_id', 'status', 'latency_ms')
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in self.FIELDS:
+            value = getattr(record, field, None)
+            if value is not None and value != '-':
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str, separators=(',', ':'))
+
+
+_TEXT_FORMATTERS = {'console': 'default', 'file': 'detailed'}
+
+
+def _formatter(handler_kind: str) -> str:
+    """Formatter name of a handler kind for the configured LOG_FORMAT"""
+    return 'json' if LogConfig.FORMAT == 'json' else _TEXT_FORMATTERS[handler_kind]
+
+
 LOGGING_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
         'default': {
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            'format': '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s',
             'datefmt': '%Y-%m-%d %H:%M:%S',
         },
         'detailed': {
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
+            'format': '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - [%(request_id)s] %(message)s',
             'datefmt': '%Y-%m-%d %H:%M:%S',
         },
+        'json': {
+            '()': JsonFormatter,
+            'datefmt': '%Y-%m-%dT%H:%M:%S%z',
+        },
+    },
+    'filters': {
+        'request_context': {
+            '()': RequestIDFilter,
+        },
     },
     'handlers': {
         'console': {
             'class': 'logging.StreamHandler',
             'level': 'INFO',
-            'formatter': 'default',
+            'formatter': _formatter('console'),
+            'filters': ['request_context'],
             'stream': 'ext://sys.stdout',
         },
         'file': {
             'class': 'logging.handlers.RotatingFileHandler',
             'level': 'INFO',
-            'formatter': 'detailed',
+            'formatter': _formatter('file'),
+            'filters': ['request_context'],
             'filename': 'logs/app.log',
             'maxBytes': 10485760,  # 10MB
             'backupCount': 5,
@@ -46,7 +108,8 @@ LOGGING_CONFIG = {
         'error_file': {
             'class': 'logging.handlers.RotatingFileHandler',
             'level': 'ERROR',
-            'formatter': 'detailed',
+            'formatter': _formatter('file'),
+            'filters': ['request_context'],
             'filename': 'logs/error.log',
             'maxBytes': 10485760,  # 10MB
             'backupCount': 5,
@@ -82,13 +145,138 @@ LOGGING_CONFIG = {
 }
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the logging thread
+
+    Applies the drop policy when its queue is full and counts dropped
+    records per level, here and in log_records_dropped_total.
+    """
+
+    DROP_NEW = "drop_new"
+    DROP_OLDEST = "drop_oldest"
+
+    def __init__(self, log_queue: queue.Queue, drop_policy: str = DROP_NEW):
+        """
+        Initialize the handler
+
+        Args:
+            log_queue: Bounded queue drained by a QueueListener
+            drop_policy: "drop_new" or "drop_oldest"
+
+        Raises:
+            ValueError: If the drop policy is unknown
+        """
+        if drop_policy not in (self.DROP_NEW, self.DROP_OLDEST):
+            raise ValueError(f"Unknown log drop policy: {drop_policy}")
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.dropped: Counter = Counter()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue a record, dropping one if the queue is full (called under the handler lock)"""
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.drop_policy == self.DROP_OLDEST:
+            try:
+                evicted = self.queue.get_nowait()
+                self.queue.put_nowait(record)
+                record = evicted
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped[record.levelname] += 1
+        LOG_RECORDS_DROPPED.labels(self.get_name() or "unnamed", record.levelname).inc()
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose stop() waits for room in a full queue instead of raising"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """Moves configured handlers behind bounded queues and background listeners"""
+
+    def __init__(self):
+        self._handlers: List[BoundedQueueHandler] = []
+        self._listeners: List[DrainingQueueListener] = []
+        self._lock = threading.Lock()
+
+    def install(self, queue_size: int = LogConfig.QUEUE_SIZE, drop_policy: str = LogConfig.DROP_POLICY) -> None:
+        """
+        Replace the handlers of the root and configured loggers with queue handlers
+
+        Each distinct handler gets its own queue and listener thread, so a
+        stalled file handler does not hold back console output. Loggers
+        sharing a handler share its queue. Handler filters move to the queue
+        side: they read the request context, which only exists on the thread
+        that logged the record, and filtered records never take a queue slot.
+
+        Args:
+            queue_size: Maximum queued records per handler
+            drop_policy: "drop_new" or "drop_oldest" (see BoundedQueueHandler)
+        """
+        with self._lock:
+            self._stop()
+            loggers = [logging.getLogger()] + [logging.getLogger(name) for name in LOGGING_CONFIG['loggers']]
+            proxies: Dict[logging.Handler, BoundedQueueHandler] = {}
+
+            for configured_logger in loggers:
+                for i, handler in enumerate(configured_logger.handlers):
+                    if isinstance(handler, BoundedQueueHandler):
+                        continue
+                    if handler not in proxies:
+                        proxy = BoundedQueueHandler(queue.Queue(maxsize=queue_size), drop_policy)
+                        proxy.set_name(handler.get_name())
+                        proxy.setLevel(handler.level)
+                        proxy.filters, handler.filters = handler.filters, []
+                        listener = DrainingQueueListener(proxy.queue, handler, respect_handler_level=True)
+                        listener.start()
+                        proxies[handler] = proxy
+                        self._handlers.append(proxy)
+                        self._listeners.append(listener)
+                    configured_logger.handlers[i] = proxies[handler]
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener threads"""
+        with self._lock:
+            self._stop()
+
+    def dropped(self) -> Dict[str, Dict[str, int]]:
+        """
+        Records dropped because a queue was full
+
+        Returns:
+            Handler name -> level name -> count
+        """
+        return {handler.get_name(): dict(handler.dropped) for handler in self._handlers}
+
+    def _stop(self) -> None:
+        for listener in self._listeners:
+            listener.stop()
+        self._handlers, self._listeners = [], []
+
+
+# Global log pipeline instance
+log_pipeline = LogPipeline()
+
+
 def setup_logging():
     """
     Setup centralized logging configuration
 
-    Call this function once at application startup in main.py
+    Call this function once at application startup in main.py, and
+    log_pipeline.stop() at shutdown to flush queued records.
     """
+    log_pipeline.stop()
     logging.config.dictConfig(LOGGING_CONFIG)
+    if LogConfig.ASYNC:
+        log_pipeline.install()
     logger = logging.getLogger(__name__)
     logger.info("✅ Logging configured successfully")
 
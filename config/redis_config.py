@@ -8,6 +8,7 @@ import os
 import logging
 from typing import Optional
 import redis
+import redis.asyncio as aioredis
 from redis.connection import ConnectionPool
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,8 @@ class RedisConfig:
     _instance: Optional['RedisConfig'] = None
     _client: Optional[redis.Redis] = None
     _pool: Optional[ConnectionPool] = None
+    _async_client: Optional[aioredis.Redis] = None
+    _settings: dict = {}
 
     def __new__(cls):
         if cls._instance is None:
@@ -42,19 +45,21 @@ class RedisConfig:
         redis_password = os.getenv('REDIS_PASSWORD', None)
         max_connections = int(os.getenv('REDIS_MAX_CONNECTIONS', '50'))
 
+        self._settings = dict(
+            host=redis_host,
+            port=redis_port,
+            db=redis_db,
+            password=redis_password,
+            max_connections=max_connections,
+            decode_responses=True,  # Auto-decode bytes to str
+            socket_timeout=5,
+            socket_connect_timeout=5,
+            retry_on_timeout=True
+        )
+
         try:
             # Create connection pool
-            self._pool = ConnectionPool(
-                host=redis_host,
-                port=redis_port,
-                db=redis_db,
-                password=redis_password,
-                max_connections=max_connections,
-                decode_responses=True,  # Auto-decode bytes to str
-                socket_timeout=5,
-                socket_connect_timeout=5,
-                retry_on_timeout=True
-            )
+            self._pool = ConnectionPool(**self._settings)
 
             # Create Redis client
             self._client = redis.Redis(connection_pool=self._pool)
@@ -80,6 +85,21 @@ class RedisConfig:
         """
         return self._client
 
+    def get_async_client(self) -> Optional[aioredis.Redis]:
+        """
+        Get the asyncio Redis client for use from async code (middleware)
+
+        Shares the server settings of the sync client and connects lazily.
+
+        Returns:
+            Async Redis client or None if Redis was unavailable at startup
+        """
+        if self._client is None:
+            return None
+        if self._async_client is None:
+            self._async_client = aioredis.Redis(**self._settings)
+        return self._async_client
+
     def is_available(self) -> bool:
         """
         Check if Redis is available
@@ -93,7 +113,7 @@ class RedisConfig:
         try:
             return self._client.ping()
         except (redis.ConnectionError, redis.TimeoutError, Exception) as e:
-            logger.debug(f"Redis ping failed: {e}")
+            logger.debug("Redis ping failed: %s", e)
             return False
 
     def close(self):
@@ -106,6 +126,13 @@ class RedisConfig:
             self._pool.disconnect()
             logger.info("Redis connection pool disconnected")
 
+    async def aclose(self):
+        """Close the asyncio Redis client and its pool"""
+        if self._async_client:
+            await self._async_client.aclose()
+            self._async_client = None
+            logger.info("Async Redis connection closed")
+
 
 # Global Redis instance
 redis_config = RedisConfig()
@@ -121,6 +148,16 @@ def get_redis_client() -> Optional[redis.Redis]:
     return redis_config.get_client()
 
 
+def get_async_redis_client() -> Optional[aioredis.Redis]:
+    """
+    Get the asyncio Redis client
+
+    Returns:
+        Async Redis client instance or None
+    """
+    return redis_config.get_async_client()
+
+
 def check_redis_connection() -> bool:
     """
     Check if Redis is available
@@ -1,31 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Header
 from sqlalchemy.orm import Session
 
 from config.database import get_db
+from middleware.request_id_middleware import set_request_user
 from models.user import UserModel
 from repositories.user_repository import UserRepository
 from schemas.auth_schema import UserCreate, UserLogin, UserPublic, Token, UserUpdate
-from utils.security import hash_password, verify_password, create_access_token, decode_access_token
+from services.password_hasher import password_hasher
+from services.principal_cache import principal_cache
+from utils.security import create_access_token, decode_request_token
 
 router = APIRouter(tags=["Auth"])
 
 
+def _check_password(repo: UserRepository, user: UserModel | None, password: str) -> bool:
+    """Verify a login in the hashing pool, storing an upgraded hash if the bcrypt cost changed"""
+    if not user:
+        return False
+    valid, new_hash = password_hasher.verify_and_update(password, user.password_hash)
+    if valid and new_hash:
+        repo.update(user.id_key, {"password_hash": new_hash})
+    return valid
+
+
 def get_current_user(
+    request: Request,
     authorization: str | None = Header(default=None),
     db: Session = Depends(get_db),
 ) -> UserPublic:
     if not authorization or not authorization.lower().startswith("bearer "):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token requerido.")
     token = authorization.split(" ", 1)[1].strip()
-    payload = decode_access_token(token)
+    payload = decode_request_token(request, token)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalido.")
 
+    # The token is verified above; the user row is cached per (user, token)
+    user_id = int(payload["sub"])
+    set_request_user(user_id)
+    principal = principal_cache.get(user_id, token)
+    if principal is not None:
+        return principal
+
     repo = UserRepository(db)
-    user = repo.get_by_id(int(payload["sub"]))
+    user = repo.get_by_id(user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no encontrado.")
-    return UserPublic.model_validate(user)
+    principal = UserPublic.model_validate(user)
+    principal_cache.set(user_id, token, principal, expires_at=payload.get("exp"))
+    return principal
 
 
 def get_current_admin(
@@ -49,7 +72,7 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
     user = UserModel(
         email=payload.email,
         name=payload.name,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hasher.hash(payload.password),
         is_active=True,
         is_admin=False,
     )
@@ -61,7 +84,7 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
 def login(payload: UserLogin, db: Session = Depends(get_db)):
     repo = UserRepository(db)
     user = repo.get_by_email(payload.email)
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not _check_password(repo, user, payload.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales invalidas.",
@@ -81,7 +104,7 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
 def admin_login(payload: UserLogin, db: Session = Depends(get_db)):
     repo = UserRepository(db)
     user = repo.get_by_email(payload.email)
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not _check_password(repo, user, payload.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales invalidas.",
@@ -129,4 +152,5 @@ def update_me(
             )
 
     updated = repo.update(current_user.id_key, changes)
+    principal_cache.invalidate(current_user.id_key)
     return updated
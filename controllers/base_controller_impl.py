@@ -1,11 +1,27 @@
 """Base controller implementation module with FastAPI dependency injection."""
-from typing import Type, List, Callable
-from fastapi import APIRouter, Depends, status
+from typing import Dict, Type, List, Callable, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from controllers.base_controller import BaseController
-from schemas.base_schema import BaseSchema
+from schemas.base_schema import BaseSchema, get_list_adapter
+from config.constants import PaginationConfig
 from config.database import get_db
+from middleware.endpoint_rate_limiter import RateLimitPolicy, limit_routes
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated column names to return (e.g. id_key,name,price). "
+    "id_key is always included."
+)
+INCLUDE_TOTAL_DESCRIPTION = (
+    "Return the total number of records in the X-Total-Count header "
+    "(X-Total-Count-Exact tells whether it is an estimate)."
+)
+IDS_DESCRIPTION = (
+    "Comma-separated ids to fetch in one request (e.g. 1,2,3), "
+    f"at most {PaginationConfig.MAX_BATCH_IDS}. skip/limit are ignored; "
+    "ids that do not exist are left out."
+)
 
 
 class BaseControllerImpl(BaseController):
@@ -13,6 +29,9 @@ class BaseControllerImpl(BaseController):
     Base controller implementation using FastAPI dependency injection.
 
     This class creates standard CRUD endpoints and properly manages database sessions.
+    Routes are plain functions: services and sessions are synchronous (and
+    transactional writes may back off before a retry), so FastAPI runs them
+    in its threadpool instead of on the event loop.
     """
 
     def __init__(
@@ -21,6 +40,7 @@ class BaseControllerImpl(BaseController):
         service_factory: Callable[[Session], 'BaseService'],
         tags: List[str] = None,
         write_dependency: Callable | None = None,
+        rate_limits: Optional[Dict[str, RateLimitPolicy]] = None,
     ):
         """
         Initialize the controller with dependency injection support.
@@ -29,6 +49,8 @@ class BaseControllerImpl(BaseController):
             schema: The Pydantic schema class for validation
             service_factory: A callable that creates a service instance given a DB session
             tags: Optional list of tags for API documentation
+            rate_limits: Optional route name (get_all, get_one, create, update,
+                delete) -> RateLimitPolicy, enforced by RateLimiterMiddleware
         """
         self.schema = schema
         self.service_factory = service_factory
@@ -37,31 +59,101 @@ class BaseControllerImpl(BaseController):
 
         # Register all CRUD endpoints with proper dependency injection
         self._register_routes()
+        if rate_limits:
+            limit_routes(self.router, rate_limits)
+
+    @staticmethod
+    def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """Split a comma-separated `fields` query parameter."""
+        if not fields:
+            return None
+        return tuple(name.strip() for name in fields.split(",") if name.strip()) or None
+
+    @staticmethod
+    def _parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+        """
+        Split a comma-separated `ids` query parameter
+
+        Raises:
+            ValueError: If an id is not an integer or there are too many ids
+        """
+        if ids is None:
+            return None
+        parts = [part.strip() for part in ids.split(",") if part.strip()]
+        if len(parts) > PaginationConfig.MAX_BATCH_IDS:
+            raise ValueError(
+                f"Too many ids: {len(parts)} (maximum {PaginationConfig.MAX_BATCH_IDS})"
+            )
+        try:
+            return [int(part) for part in parts]
+        except ValueError:
+            raise ValueError("ids must be a comma-separated list of integers")
+
+    def _render_list(self, items: List[BaseSchema]) -> Response:
+        """
+        Serialize already-validated schemas straight to JSON.
+
+        Returning a Response makes FastAPI skip response_model validation, which
+        would otherwise validate every item a second time. response_model is
+        still declared on the route for the OpenAPI documentation. Items may be
+        partial schemas (sparse fieldsets), so the adapter follows their type.
+        """
+        schema = type(items[0]) if items else self.schema
+        return Response(
+            content=get_list_adapter(schema).dump_json(items),
+            media_type="application/json",
+        )
+
+    def _render_one(self, item: BaseSchema) -> Response:
+        """Serialize a single already-validated schema straight to JSON."""
+        return Response(content=item.model_dump_json(), media_type="application/json")
 
     def _register_routes(self):
         """Register all CRUD routes with proper dependency injection."""
 
         @self.router.get("/", response_model=List[self.schema], status_code=status.HTTP_200_OK)
-        async def get_all(
+        def get_all(
             skip: int = 0,
             limit: int = 100,
+            fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+            include_total: bool = Query(False, description=INCLUDE_TOTAL_DESCRIPTION),
+            ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
             db: Session = Depends(get_db)
         ):
-            """Get all records with pagination."""
+            """Get all records with pagination, or a batch by `ids`, with an optional sparse fieldset."""
             service = self.service_factory(db)
-            return service.get_all(skip=skip, limit=limit)
+            try:
+                id_list = self._parse_ids(ids)
+                if id_list is not None:
+                    items = service.get_many(id_list, fields=self._parse_fields(fields))
+                else:
+                    items = service.get_all(skip=skip, limit=limit, fields=self._parse_fields(fields))
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+            response = self._render_list(items)
+            if include_total and id_list is None:
+                total, exact = service.count()
+                response.headers["X-Total-Count"] = str(total)
+                response.headers["X-Total-Count-Exact"] = "true" if exact else "false"
+            return response
 
         @self.router.get("/{id_key}", response_model=self.schema, status_code=status.HTTP_200_OK)
-        async def get_one(
+        def get_one(
             id_key: int,
+            fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
             db: Session = Depends(get_db)
         ):
-            """Get a single record by ID."""
+            """Get a single record by ID with an optional sparse fieldset."""
             service = self.service_factory(db)
-            return service.get_one(id_key)
+            try:
+                item = service.get_one(id_key, fields=self._parse_fields(fields))
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            return self._render_one(item)
 
         @self.router.post("/", response_model=self.schema, status_code=status.HTTP_201_CREATED)
-        async def create(
+        def create(
             schema_in: self.schema,
             _auth=Depends(self.write_dependency) if self.write_dependency else None,
             db: Session = Depends(get_db)
@@ -71,7 +163,7 @@ class BaseControllerImpl(BaseController):
             return service.save(schema_in)
 
         @self.router.put("/{id_key}", response_model=self.schema, status_code=status.HTTP_200_OK)
-        async def update(
+        def update(
             id_key: int,
             schema_in: self.schema,
             _auth=Depends(self.write_dependency) if self.write_dependency else None,
@@ -82,7 +174,7 @@ class BaseControllerImpl(BaseController):
             return service.update(id_key, schema_in)
 
         @self.router.delete("/{id_key}", status_code=status.HTTP_204_NO_CONTENT)
-        async def delete(
+        def delete(
             id_key: int,
             _auth=Depends(self.write_dependency) if self.write_dependency else None,
             db: Session = Depends(get_db)
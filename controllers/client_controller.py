@@ -1,11 +1,16 @@
 """Client controller with proper dependency injection."""
 from controllers.base_controller_impl import BaseControllerImpl
+from middleware.endpoint_rate_limiter import client_rate_limit
 from schemas.client_schema import ClientSchema
 from services.client_service import ClientService
 
 
 class ClientController(BaseControllerImpl):
-    """Controller for Client entity with CRUD operations."""
+    """
+    Controller for Client entity with CRUD operations.
+
+    POST /clients is limited to 5 requests per minute per IP.
+    """
 
     def __init__(self):
         """
@@ -16,5 +21,6 @@ class ClientController(BaseControllerImpl):
         super().__init__(
             schema=ClientSchema,
             service_factory=lambda db: ClientService(db),
-            tags=["Clients"]
+            tags=["Clients"],
+            rate_limits={"create": client_rate_limit},
         )
@@ -0,0 +1,32 @@
+"""
+Metrics Controller
+
+Exposes request, rate limiting, cache and connection pool metrics in the
+Prometheus text format (see utils.metrics), aggregated over all workers
+when PROMETHEUS_MULTIPROC_DIR is set.
+
+Scrape config:
+    scrape_configs:
+      - job_name: ecommerce-api
+        metrics_path: /metrics
+        static_configs:
+          - targets: ["api:8000"]
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from utils.metrics import render_metrics
+
+router = APIRouter()
+
+
+@router.get("", include_in_schema=False)
+def metrics() -> Response:
+    """
+    Prometheus scrape endpoint
+
+    Returns:
+        Metrics in the Prometheus text exposition format
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,15 +1,48 @@
 """Order controller with proper dependency injection."""
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from config.database import get_db
 from controllers.base_controller_impl import BaseControllerImpl
+from middleware.endpoint_rate_limiter import order_rate_limit
+from schemas.checkout_schema import CheckoutRequest, CheckoutResponse
 from schemas.order_schema import OrderSchema
 from services.order_service import OrderService
 
 
 class OrderController(BaseControllerImpl):
-    """Controller for Order entity with CRUD operations."""
+    """
+    Controller for Order entity with CRUD operations.
+
+    Also exposes POST /orders/checkout, which creates an order with all its
+    lines in one transaction (rate limited like POST /order_details).
+    """
 
     def __init__(self):
         super().__init__(
             schema=OrderSchema,
             service_factory=lambda db: OrderService(db),
             tags=["Orders"]
-        )
\ No newline at end of file
+        )
+
+        @self.router.post(
+            "/checkout",
+            response_model=CheckoutResponse,
+            status_code=status.HTTP_201_CREATED,
+            summary="Checkout a whole cart",
+            description=(
+                "Create an order and all its details in one transaction. "
+                "Prices and the order total are computed server-side."
+            )
+        )
+        @order_rate_limit
+        def checkout(
+            checkout_in: CheckoutRequest,
+            db: Session = Depends(get_db)
+        ):
+            """Create an order from a whole cart with rate limiting."""
+            service = self.service_factory(db)
+            try:
+                return service.checkout(checkout_in)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
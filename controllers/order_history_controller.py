@@ -1,53 +1,45 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
+from config.constants import PaginationConfig
 from config.database import get_db
 from controllers.auth_controller import get_current_user
-from models.client import ClientModel
-from models.order import OrderModel
-from models.order_detail import OrderDetailModel
-from models.product import ProductModel
 from schemas.auth_schema import UserPublic
-from schemas.order_history_schema import OrderPublic, OrderItemPublic
+from schemas.order_history_schema import OrderPublic
+from services.order_history_service import OrderHistoryService
 
 router = APIRouter(tags=["Orders"])
 
 
 @router.get("/me", response_model=List[OrderPublic])
 def my_orders(
+    response: Response,
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from the X-Next-Cursor header of the previous page",
+    ),
+    limit: int = Query(
+        PaginationConfig.HISTORY_DEFAULT_LIMIT,
+        ge=PaginationConfig.MIN_LIMIT,
+        le=PaginationConfig.HISTORY_MAX_LIMIT,
+        description="Maximum number of orders to return",
+    ),
     db: Session = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
-    stmt = (
-        select(OrderModel, OrderDetailModel, ProductModel)
-        .join(ClientModel, OrderModel.client_id == ClientModel.id_key)
-        .join(OrderDetailModel, OrderDetailModel.order_id == OrderModel.id_key)
-        .join(ProductModel, ProductModel.id_key == OrderDetailModel.product_id)
-        .where(ClientModel.email == current_user.email)
-        .order_by(OrderModel.date.desc())
-    )
-    rows = db.execute(stmt).all()
+    """
+    Get the current user's orders, newest first
 
-    by_order: dict[int, OrderPublic] = {}
-    for order, detail, product in rows:
-        if order.id_key not in by_order:
-            by_order[order.id_key] = OrderPublic(
-                id_key=order.id_key,
-                date=order.date,
-                total=order.total,
-                status=str(order.status) if order.status else None,
-                items=[],
-            )
-        by_order[order.id_key].items.append(
-            OrderItemPublic(
-                product_id=detail.product_id,
-                name=product.name,
-                quantity=int(detail.quantity or 0),
-                unit_price=float(detail.price or 0),
-            )
-        )
+    The next page's cursor is returned in the X-Next-Cursor header
+    (absent on the last page).
+    """
+    try:
+        orders, next_cursor = OrderHistoryService(db).get_page(current_user.email, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return list(by_order.values())
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return orders
@@ -1,19 +1,24 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from config.constants import PaginationConfig
 from config.database import get_db
 from controllers.auth_controller import get_current_user, get_current_admin
+from middleware.endpoint_rate_limiter import review_rate_limit
 from models.order_detail import OrderDetailModel
 from models.order import OrderModel
 from models.client import ClientModel
+from models.enums import ReviewSort
 from models.review import ReviewModel
 from models.user import UserModel
 from repositories.user_repository import UserRepository
 from schemas.auth_schema import UserPublic
-from schemas.review_schema import ReviewCreate, ReviewPublic, ReviewSummary, ReviewUpdate
+from schemas.review_schema import RatingStats, ReviewCreate, ReviewPublic, ReviewSummary, ReviewUpdate
+from services.rating_stats_service import RatingStatsService
+from services.review_listing_service import ReviewListingService
 
 router = APIRouter(tags=["Reviews"])
 
@@ -33,46 +38,52 @@ def _user_purchased_product(db: Session, user_email: str, product_id: int) -> bo
 
 
 @router.get("/product/{product_id}", response_model=List[ReviewPublic])
-def list_by_product(product_id: int, db: Session = Depends(get_db)):
-    stmt = (
-        select(ReviewModel, UserModel)
-        .join(UserModel, ReviewModel.user_id == UserModel.id_key)
-        .where(ReviewModel.product_id == product_id)
-    )
-    rows = db.execute(stmt).all()
-    result: List[ReviewPublic] = []
-    for review, user in rows:
-        name = (user.name or "").strip()
-        lastname = (user.lastname or "").strip()
-        label = " ".join([n for n in [name, lastname] if n]).strip() or user.email
-        data = ReviewPublic.model_validate(review)
-        data.user_name = label
-        result.append(data)
-    return result
+def list_by_product(
+    product_id: int,
+    response: Response,
+    sort: ReviewSort = Query(ReviewSort.NEWEST, description="newest, highest or lowest rating first"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from the X-Next-Cursor header of the previous page",
+    ),
+    limit: int = Query(
+        PaginationConfig.REVIEWS_DEFAULT_LIMIT,
+        ge=PaginationConfig.MIN_LIMIT,
+        le=PaginationConfig.REVIEWS_MAX_LIMIT,
+        description="Maximum number of reviews to return",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a product's reviews, one page at a time
+
+    The next page's cursor is returned in the X-Next-Cursor header
+    (absent on the last page); it is only valid with the same sort.
+    """
+    try:
+        reviews, next_cursor = ReviewListingService(db).get_page(product_id, sort, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return reviews
 
 
 @router.get("/summary", response_model=List[ReviewSummary])
 def summary(db: Session = Depends(get_db)):
-    stmt = (
-        select(
-            ReviewModel.product_id,
-            func.avg(ReviewModel.rating).label("avg_rating"),
-            func.count(ReviewModel.id_key).label("count"),
-        )
-        .group_by(ReviewModel.product_id)
-    )
-    rows = db.execute(stmt).all()
-    return [
-        ReviewSummary(
-            product_id=product_id,
-            avg_rating=float(avg_rating or 0),
-            count=int(count or 0),
-        )
-        for product_id, avg_rating, count in rows
-    ]
+    """Average rating and review count of every reviewed product (cached)."""
+    return RatingStatsService(db).get_summary()
+
+
+@router.get("/summary/{product_id}", response_model=RatingStats)
+def product_summary(product_id: int, db: Session = Depends(get_db)):
+    """Average rating, review count and star histogram of one product (cached)."""
+    return RatingStatsService(db).get_product_stats(product_id)
 
 
 @router.post("/", response_model=ReviewPublic, status_code=status.HTTP_201_CREATED)
+@review_rate_limit
 def create_review(
     payload: ReviewCreate,
     db: Session = Depends(get_db),
@@ -105,7 +116,11 @@ def create_review(
         user_id=user.id_key,
     )
     db.add(review)
+    stats = RatingStatsService(db)
+    stats.record_created(review.product_id, review.rating)
     db.commit()
+    stats.invalidate(review.product_id)
+    ReviewListingService(db).invalidate(review.product_id)
     db.refresh(review)
     data = ReviewPublic.model_validate(review)
     name = (user.name or "").strip()
@@ -151,10 +166,15 @@ def update_review(
     if "comment" in changes and not changes["comment"]:
         changes["comment"] = None
 
+    old_rating = review.rating
     for key, value in changes.items():
         setattr(review, key, value)
 
+    stats = RatingStatsService(db)
+    stats.record_updated(review.product_id, old_rating, review.rating)
     db.commit()
+    stats.invalidate(review.product_id)
+    ReviewListingService(db).invalidate(review.product_id)
     db.refresh(review)
     return ReviewPublic.model_validate(review)
 
@@ -169,8 +189,13 @@ def delete_review(
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review no encontrada.")
 
+    product_id = review.product_id
+    stats = RatingStatsService(db)
+    stats.record_deleted(product_id, review.rating)
     db.delete(review)
     db.commit()
+    stats.invalidate(product_id)
+    ReviewListingService(db).invalidate(product_id)
     return None
 @router.get("/", response_model=List[ReviewPublic])
 def list_all(
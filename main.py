@@ -13,11 +13,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette import status
 from starlette.responses import JSONResponse
 
-from config.logging_config import setup_logging
+from config.logging_config import log_pipeline, setup_logging
 from config.database import create_tables, engine
 from config.redis_config import redis_config, check_redis_connection
-from middleware.rate_limiter import RateLimiterMiddleware
-from middleware.request_id_middleware import RequestIDMiddleware
+from middleware.request_pipeline import RequestPipelineMiddleware
 
 # Setup centralized logging FIRST
 setup_logging()
@@ -36,7 +35,13 @@ from controllers.payment_method_controller import router as payment_method_contr
 from controllers.order_history_controller import router as order_history_controller
 from controllers.address_me_controller import router as address_me_controller
 from controllers.health_check import router as health_check_controller
+from controllers.metrics import router as metrics_controller
 from repositories.base_repository_impl import InstanceNotFoundError
+from services.inventory_service import HotInventoryUnavailableError
+from services.password_hasher import PasswordHasherBusyError, password_hasher
+from services.unit_of_work import TransientDatabaseError
+from utils.metrics import instrument_engine, mark_worker_dead
+from utils.tracing import setup_tracing, shutdown_tracing, trace_engine
 
 
 def create_fastapi_app() -> FastAPI:
@@ -64,6 +69,33 @@ def create_fastapi_app() -> FastAPI:
             content={"message": str(exc)},
         )
 
+    @fastapi_app.exception_handler(TransientDatabaseError)
+    async def transient_database_exception_handler(request, exc):
+        """Handle exhausted deadlock/lock-timeout retries with 503 response."""
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": str(exc)},
+            headers={"Retry-After": "1"},
+        )
+
+    @fastapi_app.exception_handler(HotInventoryUnavailableError)
+    async def hot_inventory_unavailable_exception_handler(request, exc):
+        """Handle hot-product sales while Redis is down with 503 response."""
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": str(exc)},
+            headers={"Retry-After": "5"},
+        )
+
+    @fastapi_app.exception_handler(PasswordHasherBusyError)
+    async def password_hasher_busy_exception_handler(request, exc):
+        """Handle a saturated password hashing pool with 503 response."""
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": str(exc)},
+            headers={"Retry-After": "2"},
+        )
+
     uploads_dir = os.path.join(os.path.dirname(__file__), "uploads")
     os.makedirs(uploads_dir, exist_ok=True)
     fastapi_app.mount("/uploads", StaticFiles(directory=uploads_dir), name="uploads")
@@ -98,13 +130,20 @@ def create_fastapi_app() -> FastAPI:
     fastapi_app.include_router(payment_method_controller, prefix="/billing_methods")
 
     fastapi_app.include_router(health_check_controller, prefix="/health_check")
+    fastapi_app.include_router(metrics_controller, prefix="/metrics")
+    instrument_engine(engine)
+
+    # Tracing (TRACING_ENABLED): server, service, SQL and Redis spans, exported over OTLP
+    if setup_tracing():
+        trace_engine(engine)
 
     # Add middleware (LIFO order - last added runs first)
-    # Request ID middleware runs FIRST (innermost) to capture all logs
-    fastapi_app.add_middleware(RequestIDMiddleware)
-    logger.info("✅ Request ID middleware enabled (distributed tracing)")
+    # Request id, timing headers, rate limiting and access log in one pure ASGI pass.
+    # Rate limiting: 100 requests per 60 seconds per IP (configurable via env)
+    fastapi_app.add_middleware(RequestPipelineMiddleware, calls=100, period=60)
+    logger.info("✅ Request pipeline enabled: request ID, timing, rate limiting, access log")
 
-    # CORS Configuration
+    # CORS Configuration (outermost, so 429 responses carry CORS headers too)
     cors_origins = os.getenv("CORS_ORIGINS", "*").split(",")
     fastapi_app.add_middleware(
         CORSMiddleware,
@@ -112,13 +151,15 @@ def create_fastapi_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Pagination metadata travels in headers so payload shapes stay unchanged
+        expose_headers=[
+            "X-Total-Count", "X-Total-Count-Exact", "X-Next-Cursor",
+            "X-Request-ID", "X-Response-Time",
+            "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset",
+        ],
     )
     logger.info(f"✅ CORS enabled for origins: {cors_origins}")
 
-    # Rate limiting: 100 requests per 60 seconds per IP (configurable via env)
-    fastapi_app.add_middleware(RateLimiterMiddleware, calls=100, period=60)
-    logger.info("✅ Rate limiting enabled: 100 requests/60s per IP")
-
     # Startup event: Check Redis connection
     @fastapi_app.on_event("startup")
     async def startup_event():
@@ -140,10 +181,17 @@ def create_fastapi_app() -> FastAPI:
         # Close Redis connection
         try:
             redis_config.close()
+            await redis_config.aclose()
             logger.info("✅ Redis connection closed")
         except Exception as e:
             logger.error(f"❌ Error closing Redis: {e}")
 
+        # Stop password hashing workers
+        password_hasher.shutdown()
+
+        # Drop this worker's live gauges from the aggregated metrics
+        mark_worker_dead()
+
         # Close database engine
         try:
             engine.dispose()
@@ -151,8 +199,14 @@ def create_fastapi_app() -> FastAPI:
         except Exception as e:
             logger.error(f"❌ Error disposing database engine: {e}")
 
+        # Export pending spans
+        shutdown_tracing()
+
         logger.info("✅ Shutdown complete")
 
+        # Flush queued log records
+        log_pipeline.stop()
+
     return fastapi_app
 
 
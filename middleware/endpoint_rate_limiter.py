@@ -1,176 +1,132 @@
 """
 Endpoint-Specific Rate Limiter
 
-Provides decorators for applying custom rate limits to specific endpoints.
-While global rate limiting protects the entire API, endpoint-specific limits
-protect expensive or abuse-prone operations.
+Per-route rate-limit policies. While global rate limiting protects the
+entire API, endpoint-specific limits protect expensive or abuse-prone
+operations (checkout, order and review creation).
+
+Policies are declarations, not wrappers: they are attached to route
+endpoints and evaluated by RateLimiterMiddleware in the same pass, and the
+same atomic Redis script call, as the global limit. The middleware compiles
+the app's routes once into a RoutePolicyTable, so requests to methods with
+no limited routes (catalog GETs) cost a single dict lookup.
+
+Usage:
+    @router.post("/checkout")
+    @order_rate_limit
+    def checkout(checkout_in: CheckoutRequest, ...):
+        ...
+
+    # Routes generated by BaseControllerImpl, by route name
+    super().__init__(..., rate_limits={"create": client_rate_limit})
 """
-import logging
-import functools
-from typing import Callable
-from fastapi import Request, HTTPException, status
-from config.redis_config import get_redis_client
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
-logger = logging.getLogger(__name__)
+from fastapi import APIRouter
+from starlette.routing import BaseRoute, Route
 
+from config.constants import RateLimitConfig
 
-class EndpointRateLimiter:
+POLICY_ATTRIBUTE = "__rate_limit_policy__"
+
+
+class RateLimitPolicy(NamedTuple):
+    """
+    Rate limit of a group of routes, per client IP
+
+    Routes declaring the same policy share its budget (e.g. checkout and
+    order detail creation both count against "orders").
     """
-    Decorator for endpoint-specific rate limiting
+    name: str
+    calls: int
+    period: int  # seconds
+
+    def __call__(self, func: Callable) -> Callable:
+        """Declare this policy on an endpoint function (returned unchanged)"""
+        setattr(func, POLICY_ATTRIBUTE, self)
+        return func
 
-    Usage:
-        @app.post("/order_details")
-        @EndpointRateLimiter(calls=10, period=60)
-        async def create_order(data: OrderSchema):
-            ...
 
-    This allows 10 order creations per 60 seconds per IP address.
+def limit_routes(router: APIRouter, policies: Dict[str, RateLimitPolicy]) -> None:
     """
+    Declare policies on already registered routes, by route name
 
-    def __init__(self, calls: int, period: int):
+    Args:
+        router: Router holding the routes
+        policies: Route name (endpoint function name, e.g. "create") -> policy
+
+    Raises:
+        ValueError: If a route name does not exist on the router
+    """
+    routes = {route.name: route for route in router.routes if isinstance(route, Route)}
+    for name, policy in policies.items():
+        if name not in routes:
+            raise ValueError(f"Unknown route for rate limit policy: {name}")
+        policy(routes[name].endpoint)
+
+
+class RoutePolicyTable:
+    """Route -> policy lookup compiled once from an app's routes"""
+
+    def __init__(self, routes: List[BaseRoute]):
         """
-        Initialize rate limiter
+        Compile the table
+
+        Routes are kept in registration order per method, so the first
+        route matching a request is the one Starlette will dispatch to.
+        Routes after the last limited one are dropped: they can only
+        resolve to "no policy".
 
         Args:
-            calls: Maximum number of calls allowed
-            period: Time period in seconds
+            routes: The app's routes (included routers are already flattened)
         """
-        self.calls = calls
-        self.period = period
-        self.redis_client = get_redis_client()
-
-    def __call__(self, func: Callable) -> Callable:
+        table: Dict[str, List[Tuple[re.Pattern, Optional[RateLimitPolicy]]]] = {}
+        for route in routes:
+            if not isinstance(route, Route):
+                continue
+            policy = getattr(route.endpoint, POLICY_ATTRIBUTE, None)
+            for method in route.methods or ():
+                table.setdefault(method, []).append((route.path_regex, policy))
+
+        self._table: Dict[str, List[Tuple[re.Pattern, Optional[RateLimitPolicy]]]] = {}
+        for method, entries in table.items():
+            limited = [i for i, (_, policy) in enumerate(entries) if policy is not None]
+            if limited:
+                self._table[method] = entries[:limited[-1] + 1]
+
+    def match(self, method: str, path: str) -> Optional[RateLimitPolicy]:
         """
-        Decorator implementation
+        Policy of the route a request will be dispatched to
 
         Args:
-            func: The function to rate limit
+            method: HTTP method
+            path: Request path
 
         Returns:
-            Wrapped function with rate limiting
+            The route's policy, or None if it has none
         """
-        @functools.wraps(func)
-        async def wrapper(request: Request, *args, **kwargs):
-            # Get client IP
-            client_ip = request.client.host if request.client else "unknown"
-
-            # Build rate limit key for this endpoint
-            endpoint_path = request.url.path
-            key = f"rate_limit:endpoint:{endpoint_path}:{client_ip}"
-
-            # Check if Redis is available
-            if self.redis_client is None:
-                logger.warning("Redis not available - endpoint rate limiting disabled")
-                return await func(request, *args, **kwargs)
-
-            try:
-                # Get current request count
-                current = self.redis_client.get(key)
-
-                if current is None:
-                    # First request in this period
-                    pipe = self.redis_client.pipeline()
-                    pipe.set(key, 1)
-                    pipe.expire(key, self.period)
-                    pipe.execute()
-                    remaining = self.calls - 1
-                else:
-                    current = int(current)
-
-                    if current >= self.calls:
-                        # Rate limit exceeded
-                        ttl = self.redis_client.ttl(key)
-                        logger.warning(
-                            f"Endpoint rate limit exceeded for {client_ip} "
-                            f"on {endpoint_path}: {current}/{self.calls}"
-                        )
-                        raise HTTPException(
-                            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                            detail=f"Rate limit exceeded for this endpoint. "
-                                   f"Maximum {self.calls} requests per {self.period} seconds. "
-                                   f"Try again in {ttl} seconds.",
-                            headers={
-                                "X-RateLimit-Limit": str(self.calls),
-                                "X-RateLimit-Remaining": "0",
-                                "X-RateLimit-Reset": str(ttl),
-                                "Retry-After": str(ttl),
-                            }
-                        )
-
-                    # Increment counter
-                    self.redis_client.incr(key)
-                    remaining = self.calls - current - 1
-
-                # Execute the endpoint
-                logger.debug(
-                    f"Endpoint rate limit check passed for {client_ip} "
-                    f"on {endpoint_path}: {remaining} remaining"
-                )
-                return await func(request, *args, **kwargs)
-
-            except HTTPException:
-                raise
-            except Exception as e:
-                logger.error(f"Error in endpoint rate limiting: {e}")
-                # Fail open - allow request if rate limiting fails
-                return await func(request, *args, **kwargs)
-
-        return wrapper
+        for path_regex, policy in self._table.get(method, ()):
+            if path_regex.match(path):
+                return policy
+        return None
 
 
 # =============================================================================
-# PRESET RATE LIMITERS FOR COMMON USE CASES
+# PRESET POLICIES FOR COMMON USE CASES
 # =============================================================================
 
-# Strict limit for order creation (prevents spam orders)
-order_rate_limit = EndpointRateLimiter(calls=10, period=60)  # 10 orders/min
+# Strict limit for order creation: checkout and order details (prevents spam orders)
+order_rate_limit = RateLimitPolicy(
+    "orders", RateLimitConfig.ORDER_CREATE_CALLS, RateLimitConfig.ORDER_CREATE_PERIOD
+)
 
 # Moderate limit for client creation (prevents account spam)
-client_rate_limit = EndpointRateLimiter(calls=5, period=60)  # 5 clients/min
+client_rate_limit = RateLimitPolicy(
+    "clients", RateLimitConfig.CLIENT_CREATE_CALLS, RateLimitConfig.CLIENT_CREATE_PERIOD
+)
 
 # Strict limit for reviews (prevents review bombing)
-review_rate_limit = EndpointRateLimiter(calls=3, period=60)  # 3 reviews/min
-
-# Generous limit for searches (allow frequent searches)
-search_rate_limit = EndpointRateLimiter(calls=30, period=60)  # 30 searches/min
-
-
-# =============================================================================
-# USAGE EXAMPLES
-# =============================================================================
-"""
-# Example 1: Protect order creation endpoint
-from middleware.endpoint_rate_limiter import order_rate_limit
-
-@router.post("/")
-@order_rate_limit
-async def create_order(
-    request: Request,
-    order: OrderSchema,
-    db: Session = Depends(get_db)
-):
-    service = OrderService(db)
-    return service.save(order)
-
-
-# Example 2: Custom rate limit
-from middleware.endpoint_rate_limiter import EndpointRateLimiter
-
-custom_limiter = EndpointRateLimiter(calls=20, period=300)  # 20 per 5 minutes
-
-@router.post("/expensive-operation")
-@custom_limiter
-async def expensive_operation(request: Request):
-    # Expensive computation here
-    return result
-
-
-# Example 3: Multiple rate limiters
-# Apply both global (via middleware) and endpoint-specific limits
-
-# Global: 100 requests/min to entire API
-# Endpoint: 10 order creations/min
-
-# If user hits 100 requests/min globally → 429 from middleware
-# If user hits 10 order creations/min → 429 from endpoint limiter
-"""
\ No newline at end of file
+review_rate_limit = RateLimitPolicy(
+    "reviews", RateLimitConfig.REVIEW_CREATE_CALLS, RateLimitConfig.REVIEW_CREATE_PERIOD
+)
@@ -3,108 +3,431 @@ Rate Limiting Middleware
 
 Protects the API from abuse by limiting the number of requests
 per client IP address using Redis.
+
+Pure ASGI middleware (no BaseHTTPMiddleware task/queue wrapping, responses
+stream through untouched). Each request costs a single async Redis round
+trip: one Lua script implements GCRA (generic cell rate algorithm), a
+sliding window that admits `calls` requests per `period` seconds at a
+steady rate with bursts up to `calls`, and returns allowed / remaining /
+reset in the same call. State is one integer key per client (the
+theoretical arrival time) that expires once the client is idle.
+
+Route policies declared with middleware.endpoint_rate_limiter are checked
+in the same script call as the global limit.
+
+RATE_LIMIT_MODE=local swaps the script for LocalRateLimiter: per-worker
+token buckets synced to Redis in batches, approximate but with no
+per-request network hop.
 """
+import asyncio
+import math
 import os
 import logging
-from typing import Callable
-from fastapi import Request, HTTPException, status
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import Request, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from config.redis_config import get_redis_client
-from utils.security import decode_access_token
+from config.constants import RateLimitConfig
+from config.redis_config import get_async_redis_client
+from middleware.endpoint_rate_limiter import RoutePolicyTable
+from utils.metrics import RATE_LIMIT_REJECTIONS
+from utils.security import decode_request_token
 
 logger = logging.getLogger(__name__)
 
+# KEYS: one per limit (global, then the route's policy)
+# ARGV: limit, period (ms), emission interval (ms) for each key, in order
+# Returns {allowed (1/0), remaining, reset ms, retry after ms, binding limit}
+# where the binding limit is the 1-based index of the denying (or, when
+# allowed, the tightest) limit. A request is admitted only if every limit
+# admits it, and nothing is recorded otherwise. The clock is Redis' own
+# TIME, so app servers with skewed clocks share one timeline.
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local new_tats = {}
+local remaining, reset, binding = -1, 0, 1
+
+for i = 1, #KEYS do
+    local period = tonumber(ARGV[i * 3 - 1])
+    local interval = tonumber(ARGV[i * 3])
+
+    local tat = tonumber(redis.call('GET', KEYS[i]))
+    if not tat or tat < now then
+        tat = now
+    end
+
+    local new_tat = tat + interval
+    local allow_at = new_tat - period
+    if allow_at > now then
+        return {0, 0, tat - now, allow_at - now, i}
+    end
+
+    new_tats[i] = new_tat
+    local left = math.floor((now - allow_at) / interval)
+    if remaining < 0 or left < remaining then
+        remaining, reset, binding = left, new_tat - now, i
+    end
+end
+
+for i = 1, #KEYS do
+    redis.call('SET', KEYS[i], string.format('%d', new_tats[i]), 'PX', new_tats[i] - now)
+end
+return {1, remaining, reset, 0, binding}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of one limiter check"""
+    allowed: bool
+    remaining: int
+    reset_ms: int  # until the full quota is available again
+    retry_after_ms: int  # until the next request would be admitted (0 when allowed)
+    index: int = 0  # which of the checked limits decided the outcome
+
+
+class _Limit(NamedTuple):
+    """One limit applied to a request: "global" or a route policy name"""
+    name: str
+    calls: int
+    period: int
+
+
+class _Bucket:
+    """Local token bucket of one client key for one window"""
+    __slots__ = ("window", "tokens", "pending")
+
+    def __init__(self, window: int, tokens: int):
+        self.window = window
+        self.tokens = tokens
+        self.pending = 0  # admitted locally, not yet pushed to Redis
+
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
+class LocalRateLimiter:
     """
-    Rate limiting middleware using Redis
+    Per-worker token buckets with batched Redis synchronization
+
+    Requests are admitted against an in-process bucket per client key, with
+    no network hop. Buckets hold `calls` tokens at the start of each window.
+    Every sync_interval seconds a background task pushes the counts consumed
+    since the last sync to Redis (one pipelined INCRBY per active key into a
+    shared per-window counter) and lowers each bucket to what is left
+    globally: tokens = calls - consumed by all workers.
+
+    Limits are therefore approximate: between two syncs every other worker
+    may admit what it still holds locally, so a window admits at most
+    calls + (workers - 1) x (requests one worker admits per sync interval),
+    and never more than workers x calls. Without Redis each worker enforces
+    the limit on its own traffic.
+
+    Memory is bounded with or without Redis: buckets of past windows are
+    dropped when a new window starts, and at most max_buckets client keys
+    are tracked (the oldest bucket is evicted, so a flood of spoofed keys
+    can only reset the counts of the least recently created ones).
+    """
+
+    def __init__(
+        self,
+        calls: int,
+        period: int,
+        prefix: str = "rate_limit:local",
+        redis_client=None,
+        sync_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        max_buckets: Optional[int] = None,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            calls: Maximum number of requests per window (all workers)
+            period: Window length in seconds
+            prefix: Redis key prefix of the shared counters
+            redis_client: Async Redis client (default: the shared one)
+            sync_interval: Seconds between syncs (default RateLimitConfig.LOCAL_SYNC_INTERVAL)
+            clock: Wall clock, so windows line up across workers
+            max_buckets: Client keys tracked at once (default RateLimitConfig.LOCAL_MAX_BUCKETS)
+        """
+        self.calls = calls
+        self.period = period
+        self.prefix = prefix
+        self.redis_client = redis_client or get_async_redis_client()
+        self.sync_interval = sync_interval or RateLimitConfig.LOCAL_SYNC_INTERVAL
+        self.clock = clock
+        self.max_buckets = max_buckets or RateLimitConfig.LOCAL_MAX_BUCKETS
+        self._buckets: Dict[str, _Bucket] = {}
+        self._window: Optional[int] = None
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def acquire(self, key: str) -> RateLimitResult:
+        """
+        Take one token for a client key (no I/O)
+
+        Args:
+            key: Client key, e.g. the client IP
 
-    Limits requests per IP address within a time window.
+        Returns:
+            The limiter result
+        """
+        now = self.clock()
+        window = int(now // self.period)
+        reset_ms = int(((window + 1) * self.period - now) * 1000)
+
+        if window != self._window:
+            # Unsynced counts of past windows are of no use any more
+            self._window = window
+            self._buckets = {k: b for k, b in self._buckets.items() if b.window == window}
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_buckets:
+                evicted = next(iter(self._buckets))
+                logger.debug("Rate limit buckets full, evicting %s", evicted)
+                del self._buckets[evicted]
+            bucket = self._buckets[key] = _Bucket(window, self.calls)
+
+        self._ensure_sync_task()
+
+        if bucket.tokens <= 0:
+            return RateLimitResult(False, 0, reset_ms, reset_ms)
+        bucket.tokens -= 1
+        bucket.pending += 1
+        return RateLimitResult(True, bucket.tokens, reset_ms, 0)
+
+    async def sync(self) -> None:
+        """Push locally consumed counts to Redis and refill buckets from the global totals"""
+        if not self.redis_client:
+            return
+
+        window = int(self.clock() // self.period)
+        # Drop buckets of past windows; only the current window is shared
+        self._buckets = {k: b for k, b in self._buckets.items() if b.window == window}
+        batch = [(key, bucket, bucket.pending) for key, bucket in self._buckets.items()]
+        if not batch:
+            return
+
+        for _, bucket, pending in batch:
+            bucket.pending -= pending
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, _, pending in batch:
+                    redis_key = f"{self.prefix}:{key}:{window}"
+                    pipe.incrby(redis_key, pending)
+                    pipe.expire(redis_key, self.period * 2)
+                results = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Rate limit sync failed, retrying next interval: {e}")
+            for _, bucket, pending in batch:
+                bucket.pending += pending
+            return
+
+        for (_, bucket, _), total in zip(batch, results[::2]):
+            # Hits admitted since the snapshot are not in total yet
+            bucket.tokens = min(bucket.tokens, max(0, self.calls - int(total) - bucket.pending))
+
+    def _ensure_sync_task(self) -> None:
+        if not self.redis_client:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._sync_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._sync_task = loop.create_task(self._sync_forever())
+
+    async def _sync_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self.sync()
+
+
+class RateLimitDecision(NamedTuple):
+    """What a checked request gets: limit headers, and a 429 response if denied"""
+    headers: Dict[str, str]
+    response: Optional[Response] = None
+
+
+class RateLimiter:
     """
+    Rate limiter using Redis
 
-    def __init__(self, app, calls: int = 100, period: int = 60):
+    Limits requests per IP address within a sliding time window, plus the
+    RateLimitPolicy declared on the matched route (see
+    middleware.endpoint_rate_limiter), both in one check. Used by
+    RateLimiterMiddleware and by the fused RequestPipelineMiddleware.
+    """
+
+    def __init__(
+        self,
+        calls: int = 100,
+        period: int = 60,
+        redis_client=None,
+        mode: Optional[str] = None,
+    ):
         """
         Initialize rate limiter
 
         Args:
-            app: FastAPI application
             calls: Maximum number of requests allowed
             period: Time window in seconds
+            redis_client: Async Redis client (default: the shared one)
+            mode: "redis" (exact, GCRA script) or "local" (LocalRateLimiter);
+                default RateLimitConfig.MODE
         """
-        super().__init__(app)
         self.calls = int(os.getenv('RATE_LIMIT_CALLS', str(calls)))
         self.period = int(os.getenv('RATE_LIMIT_PERIOD', str(period)))
         self.enabled = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
-        self.redis_client = get_redis_client()
-
-        if self.enabled and self.redis_client:
+        self.mode = mode or RateLimitConfig.MODE
+        self.redis_client = redis_client or get_async_redis_client()
+        self._script = None
+        self._local = None
+        self._local_policies: Dict[str, LocalRateLimiter] = {}
+        self._policies: Optional[RoutePolicyTable] = None
+        if self.mode == "local":
+            self._local = LocalRateLimiter(self.calls, self.period, redis_client=self.redis_client)
+        elif self.redis_client:
+            self._script = self.redis_client.register_script(GCRA_SCRIPT)
+
+        self.active = self.enabled and bool(self._script or self._local)
+        if self.active:
             logger.info(
-                f"✅ Rate limiting enabled: {self.calls} requests per "
+                f"✅ Rate limiting enabled ({self.mode}): {self.calls} requests per "
                 f"{self.period} seconds per IP"
             )
         else:
             logger.warning("⚠️  Rate limiting disabled (Redis not available)")
 
-    async def dispatch(self, request: Request, call_next: Callable):
+    async def check(self, scope: Scope) -> Optional[RateLimitDecision]:
         """
-        Process request with rate limiting
+        Check an HTTP request against its limits
 
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/handler
+            scope: ASGI HTTP scope
 
         Returns:
-            HTTP response
+            The decision, or None when the request is not limited (disabled,
+            exempt, or Redis failed and the limiter fails open)
         """
-        # Skip if disabled or Redis unavailable
-        if not self.enabled or not self.redis_client:
-            return await call_next(request)
-
-        # Skip rate limiting for CORS preflight
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        if not self.active:
+            return None
 
-        # Skip rate limiting for health check endpoint
-        if request.url.path == "/health_check":
-            return await call_next(request)
+        request = Request(scope)
 
-        # Skip rate limiting for admin requests
-        if self._is_admin_request(request):
-            return await call_next(request)
+        # Skip rate limiting for CORS preflight, the health check and admins
+        if (request.method == "OPTIONS"
+                or request.url.path == "/health_check"
+                or self._is_admin_request(request)):
+            return None
 
-        # Get client IP
         client_ip = self._get_client_ip(request)
+        limits = [_Limit("global", self.calls, self.period)]
+        policy = self._route_policy(scope)
+        if policy:
+            limits.append(_Limit(policy.name, policy.calls, policy.period))
+        result = await self._check(client_ip, limits)
+
+        # Fail open when Redis errors
+        if result is None:
+            return None
+
+        binding = limits[result.index]
+        headers = self._limit_headers(result, binding)
+        if result.allowed:
+            return RateLimitDecision(headers)
+
+        logger.warning(f"⚠️  Rate limit exceeded for IP: {client_ip} ({binding.name})")
+        RATE_LIMIT_REJECTIONS.labels(binding.name).inc()
+        retry_after = self._seconds(result.retry_after_ms)
+        return RateLimitDecision(headers, JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={
+                "detail": f"Rate limit exceeded. Maximum {binding.calls} requests "
+                          f"per {binding.period} seconds.",
+                "retry_after": retry_after
+            },
+            headers={"Retry-After": str(retry_after), **headers}
+        ))
+
+    def _route_policy(self, scope: Scope):
+        """Policy of the route the request will be dispatched to, if any"""
+        if self._policies is None:
+            # Compiled on the first request, once every router is included
+            self._policies = RoutePolicyTable(getattr(scope.get("app"), "routes", []))
+        return self._policies.match(scope["method"], scope["path"])
+
+    async def _check(self, client_ip: str, limits: List[_Limit]) -> Optional[RateLimitResult]:
+        """
+        Check every limit of a request atomically with the GCRA script (one
+        Redis round trip), or take local tokens in "local" mode
 
-        # Check rate limit
-        if not self._is_allowed(client_ip):
-            logger.warning(f"⚠️  Rate limit exceeded for IP: {client_ip}")
-            return JSONResponse(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content={
-                    "detail": f"Rate limit exceeded. Maximum {self.calls} requests "
-                              f"per {self.period} seconds.",
-                    "retry_after": self.period
-                },
-                headers={
-                    "Retry-After": str(self.period),
-                    "X-RateLimit-Limit": str(self.calls),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(self.period)
-                }
-            )
-
-        # Process request
-        response = await call_next(request)
-
-        # Add rate limit headers to response
-        remaining = self._get_remaining(client_ip)
-        response.headers["X-RateLimit-Limit"] = str(self.calls)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(self.period)
+        Args:
+            client_ip: Client IP address
+            limits: The global limit, then the route policy if any
 
-        return response
+        Returns:
+            The limiter result, or None if Redis failed (caller fails open)
+        """
+        if self._local:
+            return self._check_local(client_ip, limits)
+
+        keys, args = [], []
+        for limit in limits:
+            period_ms = limit.period * 1000
+            keys.append(self._key(limit, client_ip))
+            args.extend([limit.calls, period_ms, max(1, period_ms // max(limit.calls, 1))])
+        try:
+            allowed, remaining, reset_ms, retry_after_ms, *binding = await self._script(keys=keys, args=args)
+        except Exception as e:
+            logger.error(f"Rate limiting error for {client_ip}: {e}")
+            return None
+
+        index = int(binding[0]) - 1 if binding else 0
+        if limits[index].calls <= 0:
+            allowed = 0
+        return RateLimitResult(bool(allowed), max(0, int(remaining)), int(reset_ms), int(retry_after_ms), index)
+
+    def _check_local(self, client_ip: str, limits: List[_Limit]) -> RateLimitResult:
+        tightest = None
+        for index, limit in enumerate(limits):
+            if index == 0:
+                limiter = self._local
+            else:
+                limiter = self._local_policies.get(limit.name)
+                if limiter is None:
+                    limiter = self._local_policies[limit.name] = LocalRateLimiter(
+                        limit.calls, limit.period,
+                        prefix=f"rate_limit:local:route:{limit.name}",
+                        redis_client=self.redis_client,
+                    )
+            result = limiter.acquire(client_ip)._replace(index=index)
+            if not result.allowed:
+                return result
+            if tightest is None or result.remaining < tightest.remaining:
+                tightest = result
+        return tightest
+
+    @staticmethod
+    def _key(limit: _Limit, client_ip: str) -> str:
+        if limit.name == "global":
+            return f"rate_limit:{client_ip}"
+        return f"rate_limit:route:{limit.name}:{client_ip}"
+
+    def _limit_headers(self, result: RateLimitResult, limit: _Limit) -> dict:
+        return {
+            "X-RateLimit-Limit": str(limit.calls),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(self._seconds(result.reset_ms)),
+        }
+
+    @staticmethod
+    def _seconds(ms: int) -> int:
+        return max(0, math.ceil(ms / 1000))
 
     def _get_client_ip(self, request: Request) -> str:
         """
@@ -129,147 +452,57 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         # Fallback to direct client
         return request.client.host if request.client else "unknown"
 
-    def _is_allowed(self, client_ip: str) -> bool:
-        """
-        Check if client is allowed to make request with atomic Redis operations
-
-        Args:
-            client_ip: Client IP address
-
-        Returns:
-            True if allowed, False if rate limit exceeded
-        """
-        try:
-            key = f"rate_limit:{client_ip}"
-
-            # Use pipeline to avoid race condition between incr and expire
-            pipe = self.redis_client.pipeline()
-            pipe.incr(key)
-            pipe.expire(key, self.period)
-            results = pipe.execute()
-
-            # ✅ Verify both operations succeeded
-            if len(results) < 2:
-                logger.error(
-                    f"Pipeline returned incomplete results for {client_ip}: "
-                    f"expected 2, got {len(results)}"
-                )
-                return True  # Fail open on error
-
-            current = results[0]  # New counter value
-            expire_set = results[1]  # 1 if success, 0 if key doesn't exist
-
-            # ✅ If expire failed, force set expiration
-            if not expire_set:
-                logger.warning(
-                    f"Failed to set expiration for rate limit key: {key}, "
-                    f"forcing expiration"
-                )
-                try:
-                    self.redis_client.expire(key, self.period)
-                except Exception as exp_error:
-                    logger.error(f"Failed to force expiration for {key}: {exp_error}")
-                    # Delete key to prevent permanent block
-                    try:
-                        self.redis_client.delete(key)
-                    except Exception:
-                        pass
-
-            # Check if limit exceeded
-            return current <= self.calls
-
-        except Exception as e:
-            logger.error(f"Rate limiting error for {client_ip}: {e}")
-            # On error, allow request (fail open)
-            return True
-
-    def _get_remaining(self, client_ip: str) -> int:
-        """
-        Get remaining requests for client
-
-        Args:
-            client_ip: Client IP address
-
-        Returns:
-            Number of remaining requests
-        """
-        try:
-            key = f"rate_limit:{client_ip}"
-            current = self.redis_client.get(key)
-
-            if current is None:
-                return self.calls
-
-            remaining = self.calls - int(current)
-            return max(0, remaining)
-
-        except Exception as e:
-            logger.error(f"Error getting remaining requests for {client_ip}: {e}")
-            return self.calls
-
     def _is_admin_request(self, request: Request) -> bool:
         auth_header = request.headers.get("Authorization") or request.headers.get("authorization")
         if not auth_header or not auth_header.lower().startswith("bearer "):
             return False
 
         token = auth_header.split(" ", 1)[1].strip()
-        payload = decode_access_token(token)
+        payload = decode_request_token(request, token)
         return bool(payload and payload.get("is_admin"))
 
 
-# Alternative: Decorator-based rate limiter for specific endpoints
-class EndpointRateLimiter:
+class RateLimiterMiddleware:
     """
-    Decorator for endpoint-specific rate limiting
-
-    Usage:
-        rate_limiter = EndpointRateLimiter(calls=10, period=60)
+    Rate limiting middleware using Redis
 
-        @app.get("/expensive-endpoint")
-        @rate_limiter
-        async def expensive_endpoint():
-            return {"message": "success"}
+    Pure ASGI wrapper around RateLimiter for apps that do not use the fused
+    RequestPipelineMiddleware.
     """
 
-    def __init__(self, calls: int = 10, period: int = 60):
-        self.calls = calls
-        self.period = period
-        self.redis_client = get_redis_client()
-
-    def __call__(self, func):
-        async def wrapper(*args, **kwargs):
-            # Get request from kwargs or args
-            request = kwargs.get('request') or next(
-                (arg for arg in args if isinstance(arg, Request)), None
-            )
-
-            if not request or not self.redis_client:
-                return await func(*args, **kwargs)
-
-            client_ip = self._get_client_ip(request)
-            key = f"endpoint_rate_limit:{func.__name__}:{client_ip}"
-
-            # Check rate limit using pipeline to avoid race condition
-            pipe = self.redis_client.pipeline()
-            pipe.incr(key)
-            pipe.expire(key, self.period)
-            results = pipe.execute()
-            current = results[0]
-
-            if current > self.calls:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail=f"Endpoint rate limit exceeded. Maximum {self.calls} "
-                           f"requests per {self.period} seconds."
-                )
+    def __init__(self, app: ASGIApp, **kwargs):
+        """
+        Initialize rate limiter
 
-            return await func(*args, **kwargs)
+        Args:
+            app: ASGI application
+            **kwargs: RateLimiter arguments (calls, period, redis_client, mode)
+        """
+        self.app = app
+        self.limiter = RateLimiter(**kwargs)
 
-        return wrapper
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Process request with rate limiting
 
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request"""
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        return request.client.host if request.client else "unknown"
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        decision = await self.limiter.check(scope) if scope["type"] == "http" else None
+        if decision is None:
+            await self.app(scope, receive, send)
+            return
+        if decision.response is not None:
+            await decision.response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in decision.headers.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -7,18 +7,64 @@ Each request gets a unique identifier that can be tracked across all logs.
 import uuid
 import logging
 import time
+from contextvars import ContextVar
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
-from typing import Callable
+from starlette.types import Scope
+from typing import Callable, Optional
+
+from opentelemetry import trace
 
 logger = logging.getLogger(__name__)
 
 
+class RequestContext:
+    """
+    Values of the request being handled, for log records
+
+    Holds the ASGI scope so the route template is available once routing
+    has matched. Mutable: the auth dependency sets user_id.
+    """
+
+    __slots__ = ('request_id', 'scope', 'user_id')
+
+    def __init__(self, request_id: str, scope: Scope):
+        self.request_id = request_id
+        self.scope = scope
+        self.user_id: Optional[int] = None
+
+    @property
+    def route(self) -> Optional[str]:
+        """Matched route template (e.g. /products/{id_key}), None before routing"""
+        route = self.scope.get('route')
+        return getattr(route, 'path', None)
+
+
+# Context of the request being handled (set by RequestPipelineMiddleware)
+request_context: ContextVar[Optional[RequestContext]] = ContextVar('request_context', default=None)
+
+
+def set_request_user(user_id: int) -> None:
+    """
+    Record the authenticated user on the current request context
+
+    Args:
+        user_id: Authenticated user id
+    """
+    context = request_context.get()
+    if context is not None:
+        context.user_id = user_id
+
+
 class RequestIDMiddleware(BaseHTTPMiddleware):
     """
     Middleware that adds a unique request ID to every HTTP request.
 
+    Superseded in main.py by the pure ASGI RequestPipelineMiddleware, which
+    also does rate limiting and avoids BaseHTTPMiddleware's per-request task
+    and queue wrapping.
+
     The request ID can be:
     1. Provided by client via X-Request-ID header
     2. Auto-generated if not provided
@@ -101,8 +147,11 @@ class RequestIDFilter(logging.Filter):
     """
     Logging filter that adds request ID to log records
 
-    This filter extracts the request ID from the current request context
-    and adds it to all log messages automatically.
+    This filter extracts the request ID, route and user id from the current
+    request context, and the trace id of the current span, and adds them to
+    all log records automatically. It must
+    run on the thread that logged the record (config.logging_config moves it
+    in front of the log queues).
 
     Usage:
         Add to logging configuration in config/logging_config.py:
@@ -124,7 +173,7 @@ class RequestIDFilter(logging.Filter):
 
     def filter(self, record: logging.LogRecord) -> bool:
         """
-        Add request_id to log record
+        Add request_id, route, user_id and trace_id to log record
 
         Args:
             record: The log record to modify
@@ -132,14 +181,19 @@ class RequestIDFilter(logging.Filter):
         Returns:
             True (always allow the log record)
         """
-        # Try to get request ID from current context
-        # This works with async/await context
-        try:
-            from contextvars import ContextVar
-            request_id_var: ContextVar = ContextVar('request_id', default=None)
-            record.request_id = request_id_var.get() or '-'
-        except Exception:
+        # Set per request by RequestPipelineMiddleware; works with async/await context
+        context = request_context.get()
+        if context is None:
             record.request_id = '-'
+            record.route = None
+            record.user_id = None
+        else:
+            record.request_id = context.request_id
+            record.route = context.route
+            record.user_id = context.user_id
+
+        span_context = trace.get_current_span().get_span_context()
+        record.trace_id = format(span_context.trace_id, '032x') if span_context.is_valid else None
 
         return True
 
@@ -172,10 +226,10 @@ def get_request_id(request: Request) -> str:
 # =============================================================================
 """
 # main.py
-from middleware.request_id_middleware import RequestIDMiddleware
+from middleware.request_pipeline import RequestPipelineMiddleware
 
 app = FastAPI()
-app.add_middleware(RequestIDMiddleware)
+app.add_middleware(RequestPipelineMiddleware, calls=100, period=60)
 
 # Now all logs will include request ID:
 # [abc-123] GET /products
@@ -0,0 +1,141 @@
+"""
+Request Pipeline Middleware
+
+One pure ASGI middleware doing, in a single pass, what used to take a
+BaseHTTPMiddleware (request id, timing, access log) plus a separate rate
+limiting layer:
+
+1. Request id: taken from X-Request-ID or generated, stored in
+   request.state.request_id and the request_context contextvar (request id,
+   route and user id of every log record, see RequestIDFilter)
+2. Rate limiting: RateLimiter (global limit + route policy, one Redis call)
+3. Headers: X-Request-ID, X-Response-Time (time to the response start) and
+   the X-RateLimit-* headers, added to http.response.start
+4. Access log: one line per request once the response is sent, with status
+   and latency_ms as record fields; successful requests are sampled at
+   LogConfig.ACCESS_LOG_SAMPLE_RATE
+5. Metrics: count, latency and in-flight requests by route template
+   (utils.metrics, served by /metrics)
+6. Tracing: a server span per request, named after the route template
+   (utils.tracing); without an X-Request-ID header the trace id becomes
+   the request id
+
+Bodies are never buffered: messages are forwarded as they come and only the
+response start message is touched.
+
+Example usage:
+    app.add_middleware(RequestPipelineMiddleware, calls=100, period=60)
+
+Example log output:
+    [abc123] GET /products 200 (45.12ms)
+"""
+import logging
+import random
+import time
+import uuid
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.constants import LogConfig
+from middleware.rate_limiter import RateLimiter
+from middleware.request_id_middleware import RequestContext, request_context
+from utils.metrics import UNMATCHED_ROUTE, request_metrics
+from utils.tracing import end_server_span, start_server_span, trace_id_of
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPipelineMiddleware:
+    """Request id, timing headers, rate limiting and access logging in one ASGI layer"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Optional[RateLimiter] = None,
+        access_log_sample_rate: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            app: ASGI application
+            rate_limiter: Limiter to use (default: RateLimiter(**kwargs))
+            access_log_sample_rate: Share of successful requests logged, 0.0-1.0
+                (default: LogConfig.ACCESS_LOG_SAMPLE_RATE); 4xx/5xx are always logged
+            **kwargs: RateLimiter arguments (calls, period, redis_client, mode)
+        """
+        self.app = app
+        self.rate_limiter = rate_limiter or RateLimiter(**kwargs)
+        self.access_log_sample_rate = (
+            LogConfig.ACCESS_LOG_SAMPLE_RATE if access_log_sample_rate is None else access_log_sample_rate
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Process a request
+
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        request_headers = Headers(scope=scope)
+        span, span_token = start_server_span(scope, request_headers)
+        request_id = request_headers.get("x-request-id") or trace_id_of(span) or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        context = RequestContext(request_id, scope)
+        token = request_context.set(context)
+        status_code = 500
+        error: Optional[Exception] = None
+        request_metrics.start()
+
+        try:
+            decision = await self.rate_limiter.check(scope)
+            limit_headers = decision.headers if decision else {}
+
+            async def send_with_headers(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers["X-Request-ID"] = request_id
+                    headers["X-Response-Time"] = f"{(time.perf_counter() - start) * 1000:.2f}ms"
+                    for name, value in limit_headers.items():
+                        headers[name] = value
+                await send(message)
+
+            if decision is not None and decision.response is not None:
+                await decision.response(scope, receive, send_with_headers)
+            else:
+                await self.app(scope, receive, send_with_headers)
+        except Exception as e:
+            error = e
+            latency_ms = round((time.perf_counter() - start) * 1000, 2)
+            logger.error(
+                "✗ %s %s - ERROR: %s (%.2fms)", scope['method'], scope['path'], e, latency_ms,
+                extra={'status': 500, 'latency_ms': latency_ms},
+            )
+            raise
+        else:
+            if status_code >= 400 or random.random() < self.access_log_sample_rate:
+                latency_ms = round((time.perf_counter() - start) * 1000, 2)
+                logger.info(
+                    "%s %s %s (%.2fms)", scope['method'], scope['path'], status_code, latency_ms,
+                    extra={'status': status_code, 'latency_ms': latency_ms},
+                )
+        finally:
+            request_context.reset(token)
+            route = scope.get("route")
+            request_metrics.finish(
+                scope["method"], getattr(route, "path", UNMATCHED_ROUTE), status_code, time.perf_counter() - start
+            )
+            if span is not None:
+                end_server_span(span, span_token, scope, status_code, request_id, context.user_id, error)
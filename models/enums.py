@@ -28,3 +28,10 @@ class PaymentType(Enum):
     DEBIT = 3
     CREDIT = 4
     BANK_TRANSFER = 5
+
+
+class ReviewSort(str, Enum):
+    """Review listing sort orders"""
+    NEWEST = "newest"
+    HIGHEST = "highest"
+    LOWEST = "lowest"
@@ -0,0 +1,38 @@
+"""
+SqlAlchemy model for per-product review aggregates.
+
+This module defines the ProductRatingStatsModel class, one row per reviewed
+product, kept in step with the reviews table by the review write endpoints.
+"""
+
+from sqlalchemy import Column, Float, ForeignKey, Integer
+
+from models.base_model import BaseModel
+
+RATING_BUCKETS = (1, 2, 3, 4, 5)
+
+
+def rating_bucket(rating: float) -> int:
+    """Histogram bucket (1..5) of a rating, rounding half up"""
+    return min(5, max(1, int(rating + 0.5)))
+
+
+class ProductRatingStatsModel(BaseModel):
+    """
+    Class representing the review aggregates of one product.
+
+    Stores the rating sum and count (the average is sum / count) and a
+    histogram of ratings rounded to whole stars, so summaries never scan
+    the reviews table. Rebuilt from reviews by RatingStatsService.rebuild.
+    """
+
+    __tablename__ = 'product_rating_stats'
+
+    product_id = Column(Integer, ForeignKey('products.id_key'), unique=True, nullable=False)
+    rating_sum = Column(Float, default=0.0, nullable=False)
+    rating_count = Column(Integer, default=0, nullable=False)
+    rating_1 = Column(Integer, default=0, nullable=False)
+    rating_2 = Column(Integer, default=0, nullable=False)
+    rating_3 = Column(Integer, default=0, nullable=False)
+    rating_4 = Column(Integer, default=0, nullable=False)
+    rating_5 = Column(Integer, default=0, nullable=False)
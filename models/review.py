@@ -1,6 +1,6 @@
 """Module for the ReviewModel class."""
 
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 
 from models.base_model import BaseModel
@@ -13,6 +13,9 @@ class ReviewModel(BaseModel):
 
     __table_args__ = (
         CheckConstraint('rating >= 1.0 AND rating <= 5.0', name='check_rating_range'),
+        # Keyset pagination of a product's reviews (newest = highest id_key first)
+        Index('ix_reviews_product_id_id_key', 'product_id', 'id_key'),
+        Index('ix_reviews_product_id_rating', 'product_id', 'rating', 'id_key'),
     )
 
     rating = Column(Float, nullable=False)
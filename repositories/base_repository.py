@@ -2,7 +2,7 @@
 BaseRepository is an abstract class that defines the methods
 """
 from abc import abstractmethod, ABC
-from typing import List, Type
+from typing import Iterable, List, Optional, Tuple, Type
 from sqlalchemy.orm import Session
 
 from models.base_model import BaseModel
@@ -36,20 +36,40 @@ class BaseRepository(ABC):
         """
 
     @abstractmethod
-    def find(self, id_key: int) -> BaseSchema:
+    def find(self, id_key: int, fields: Optional[Iterable[str]] = None) -> BaseSchema:
         """
         Find a record by id_key
         :param id_key: int
+        :param fields: optional sparse fieldset
         :return: BaseSchema
         """
 
     @abstractmethod
-    def find_all(self) -> List[BaseSchema]:
+    def find_all(self, skip: int = 0, limit: int = 100,
+                 fields: Optional[Iterable[str]] = None) -> List[BaseSchema]:
         """
         Find all records
+        :param fields: optional sparse fieldset
         :return: List[BaseSchema]
         """
 
+    @abstractmethod
+    def find_many(self, ids: Iterable[int],
+                  fields: Optional[Iterable[str]] = None) -> List[BaseSchema]:
+        """
+        Find several records by id_key in one query
+        :param ids: ids to fetch (missing ids are skipped)
+        :param fields: optional sparse fieldset
+        :return: List[BaseSchema] in requested id order
+        """
+
+    @abstractmethod
+    def count(self) -> Tuple[int, bool]:
+        """
+        Count records (exact or estimated)
+        :return: Tuple[int, bool] total and whether it is exact
+        """
+
     @abstractmethod
     def save(self, model: BaseModel) -> BaseSchema:
         """
@@ -2,13 +2,14 @@
 BaseRepository implementation with best practices and sanitized logging
 """
 import logging
-from typing import Type, List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from functools import lru_cache
+from typing import Type, List, Optional, Tuple, Iterable
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import Select, select, func, text
 
 from models.base_model import BaseModel
 from repositories.base_repository import BaseRepository
-from schemas.base_schema import BaseSchema
+from schemas.base_schema import BaseSchema, get_list_adapter, get_partial_schema
 from utils.logging_utils import log_repository_error, create_user_safe_error, get_sanitized_logger
 
 
@@ -19,11 +20,30 @@ class InstanceNotFoundError(Exception):
     pass
 
 
+@lru_cache(maxsize=None)
+def _selectable_fields(model: Type[BaseModel], schema: Type[BaseSchema]) -> Tuple[str, ...]:
+    """
+    Get the schema fields that map to model columns, in schema order
+
+    Only these fields can be read with a column-projected SELECT. Schemas
+    that also serialize relationships (e.g. ClientSchema with
+    addresses/orders) need full ORM entities for a complete read.
+    """
+    column_names = {attr.key for attr in model.__mapper__.column_attrs}
+    return tuple(field for field in schema.model_fields if field in column_names)
+
+
 class BaseRepositoryImpl(BaseRepository):
     """
     Base Repository Implementation with proper error handling and SQLAlchemy 2.0 patterns
+
+    delete_profile names the loading profile remove() reads the entity
+    with, so the relationships session.delete() walks (cascades, foreign
+    keys to clear) are loaded up front instead of lazily.
     """
 
+    delete_profile: Optional[str] = None
+
     def __init__(self, model: Type[BaseModel], schema: Type[BaseSchema], db: Session):
         self._model = model
         self._schema = schema
@@ -45,52 +65,172 @@ class BaseRepositoryImpl(BaseRepository):
         """Get the Pydantic schema class"""
         return self._schema
 
-    def find(self, id_key: int) -> BaseSchema:
+    def resolve_fields(self, fields: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+        """
+        Validate a sparse fieldset against the schema's column-backed fields
+
+        Args:
+            fields: Requested field names (None or empty for all fields)
+
+        Returns:
+            Normalized field tuple in schema order (always including id_key),
+            or None when no fieldset was requested
+
+        Raises:
+            ValueError: If a field is unknown or not a plain column
+        """
+        if not fields:
+            return None
+
+        requested = set(fields)
+        selectable = _selectable_fields(self.model, self.schema)
+        invalid = requested.difference(selectable)
+        if invalid:
+            raise ValueError(
+                f"Invalid fields for {self.model.__name__}: {', '.join(sorted(invalid))}"
+            )
+
+        requested.add('id_key')
+        return tuple(field for field in selectable if field in requested)
+
+    def schema_for(self, fields: Optional[Iterable[str]] = None) -> Type[BaseSchema]:
+        """Get the schema used to validate a read with the given fieldset"""
+        fields = self.resolve_fields(fields)
+        if fields is None:
+            return self.schema
+        return get_partial_schema(self.schema, fields)
+
+    def load_options(self, profile: Optional[str] = None) -> tuple:
+        """
+        Get loader options for an ORM read
+
+        Args:
+            profile: Named loading profile (see repositories.loading_profiles);
+                None eager-loads what the repository schema serializes
+
+        Returns:
+            Tuple of loader options, ending with raiseload("*") when
+            ORM_RAISELOAD_DEFAULT is enabled
+
+        Raises:
+            ValueError: If the profile is unknown or targets another model
+        """
+        from repositories.loading_profiles import get_loading_profile, raiseload_enabled, schema_load_options
+
+        strict = raiseload_enabled()
+        if profile is None:
+            return schema_load_options(self.model, self.schema, strict)
+
+        options = get_loading_profile(self.model, profile)
+        return options + (raiseload("*"),) if strict else options
+
+    def select_loaded(self, profile: Optional[str] = None) -> Select:
+        """
+        Build a SELECT of full entities with explicit relationship loading
+
+        Services compose it (where, order_by, with_for_update...) instead of
+        relying on lazy='select' relationships, e.g.
+        ``repo.select_loaded("order_with_details_and_products").where(...)``
+        """
+        return select(self.model).options(*self.load_options(profile))
+
+    def get_entity(self, id_key: int, profile: Optional[str] = None) -> BaseModel:
+        """
+        Get a single ORM entity loaded with a profile
+
+        Raises:
+            InstanceNotFoundError: If the record is not found
+            ValueError: If the profile is invalid
+        """
+        stmt = self.select_loaded(profile).where(self.model.id_key == id_key)
+        instance = self.session.scalars(stmt).unique().first()
+        if instance is None:
+            raise InstanceNotFoundError(
+                f"{self.model.__name__} with id {id_key} not found"
+            )
+        return instance
+
+    def _projection(self, fields: Optional[Iterable[str]] = None) -> Optional[Tuple[list, Type[BaseSchema]]]:
+        """
+        Get (columns, schema) for a column-projected read
+
+        Returns None when the full schema needs ORM entities (relationship
+        fields) and no sparse fieldset was requested.
+        """
+        resolved = self.resolve_fields(fields)
+        if resolved is None:
+            resolved = _selectable_fields(self.model, self.schema)
+            if len(resolved) != len(self.schema.model_fields):
+                return None
+        columns = [getattr(self.model, field) for field in resolved]
+        return columns, self.schema_for(fields)
+
+    def find(self, id_key: int, fields: Optional[Iterable[str]] = None) -> BaseSchema:
         """
         Find a single record by ID
 
+        Flat schemas and sparse fieldsets are read with a column-projected
+        SELECT, skipping ORM entity construction and identity-map bookkeeping.
+
         Args:
             id_key: The primary key value
+            fields: Optional sparse fieldset (see resolve_fields)
 
         Returns:
-            The schema instance
+            The schema instance (a partial schema when fields are given)
 
         Raises:
             InstanceNotFoundError: If the record is not found
         """
         try:
-            # Use SQLAlchemy 2.0 style query
-            stmt = select(self.model).where(self.model.id_key == id_key)
-            model = self.session.scalars(stmt).first()
-
-            if model is None:
+            schema = self.schema
+            projection = self._projection(fields)
+            if projection is not None:
+                columns, schema = projection
+                stmt = select(*columns).where(self.model.id_key == id_key)
+                row = self.session.execute(stmt).first()
+                data = row._asdict() if row is not None else None
+            else:
+                # Full entities: eager-load the relationships the schema serializes
+                stmt = self.select_loaded().where(self.model.id_key == id_key)
+                data = self.session.scalars(stmt).unique().first()
+
+            if data is None:
                 raise InstanceNotFoundError(
                     f"{self.model.__name__} with id {id_key} not found"
                 )
 
-            return self.schema.model_validate(model)
-        except InstanceNotFoundError:
+            return schema.model_validate(data)
+        except (InstanceNotFoundError, ValueError):
             raise
         except Exception as e:
             self.logger.error(f"Error finding {self.model.__name__} with id {id_key}: {e}")
             raise
 
-    def find_all(self, skip: int = 0, limit: int = 100) -> List[BaseSchema]:
+    def find_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[BaseSchema]:
         """
         Find all records with pagination and input validation
 
         This method validates pagination parameters to prevent DoS attacks
-        and ensure reasonable query performance.
+        and ensure reasonable query performance. Flat schemas are read as
+        projected row tuples and validated in bulk through a cached
+        TypeAdapter instead of one model_validate call per ORM entity.
 
         Args:
             skip: Number of records to skip (must be >= 0)
             limit: Maximum number of records to return (must be 1-1000)
+            fields: Optional sparse fieldset (see resolve_fields)
 
         Returns:
-            List of schema instances
+            List of schema instances (partial schemas when fields are given)
 
         Raises:
-            ValueError: If pagination parameters are invalid
+            ValueError: If pagination parameters or fields are invalid
         """
         from config.constants import PaginationConfig, ErrorMessages
 
@@ -113,8 +253,16 @@ class BaseRepositoryImpl(BaseRepository):
                 )
                 limit = PaginationConfig.MAX_LIMIT
 
-            stmt = select(self.model).offset(skip).limit(limit)
-            models = self.session.scalars(stmt).all()
+            projection = self._projection(fields)
+            if projection is not None:
+                columns, schema = projection
+                stmt = select(*columns).offset(skip).limit(limit)
+                rows = self.session.execute(stmt).all()
+                # Row._asdict() + dict validation is much cheaper than from_attributes
+                return get_list_adapter(schema).validate_python([row._asdict() for row in rows])
+
+            stmt = self.select_loaded().offset(skip).limit(limit)
+            models = self.session.scalars(stmt).unique().all()
             return [self.schema.model_validate(model) for model in models]
 
         except ValueError:
@@ -123,6 +271,84 @@ class BaseRepositoryImpl(BaseRepository):
             self.logger.error(f"Error finding all {self.model.__name__}: {e}")
             raise
 
+    def find_many(self, ids: Iterable[int], fields: Optional[Iterable[str]] = None) -> List[BaseSchema]:
+        """
+        Find several records by ID with a single WHERE id_key IN (...) query
+
+        Args:
+            ids: Primary key values (duplicates are ignored)
+            fields: Optional sparse fieldset (see resolve_fields)
+
+        Returns:
+            Schema instances in the order the ids were requested; ids that
+            do not exist are skipped
+
+        Raises:
+            ValueError: If more than MAX_BATCH_IDS ids are requested or fields are invalid
+        """
+        from config.constants import PaginationConfig
+
+        try:
+            ids = list(dict.fromkeys(ids))
+            if len(ids) > PaginationConfig.MAX_BATCH_IDS:
+                raise ValueError(
+                    f"Too many ids: {len(ids)} (maximum {PaginationConfig.MAX_BATCH_IDS})"
+                )
+            if not ids:
+                return []
+
+            projection = self._projection(fields)
+            if projection is not None:
+                columns, schema = projection
+                stmt = select(*columns).where(self.model.id_key.in_(ids))
+                items = get_list_adapter(schema).validate_python(
+                    [row._asdict() for row in self.session.execute(stmt)]
+                )
+            else:
+                stmt = self.select_loaded().where(self.model.id_key.in_(ids))
+                items = [self.schema.model_validate(model) for model in self.session.scalars(stmt).unique()]
+
+            by_id = {item.id_key: item for item in items}
+            return [by_id[id_key] for id_key in ids if id_key in by_id]
+
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error finding {len(ids)} {self.model.__name__} by id: {e}")
+            raise
+
+    def count(self) -> Tuple[int, bool]:
+        """
+        Count records for pagination totals without full-table scans
+
+        Tables on PostgreSQL use the planner statistics in
+        pg_class.reltuples; small tables (below EXACT_COUNT_THRESHOLD) and
+        other databases get an exact COUNT(*).
+
+        Returns:
+            Tuple of (total, is_exact)
+        """
+        from config.constants import PaginationConfig
+
+        threshold = PaginationConfig.EXACT_COUNT_THRESHOLD
+
+        try:
+            if self.session.get_bind().dialect.name == 'postgresql':
+                estimate = self.session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                    {"table": self.model.__tablename__},
+                ).scalar()
+                # reltuples is -1 (or 0) for tables never vacuumed/analyzed
+                if estimate is not None and estimate >= threshold:
+                    return int(estimate), False
+
+            stmt = select(func.count()).select_from(self.model)
+            return int(self.session.execute(stmt).scalar_one()), True
+
+        except Exception as e:
+            self.logger.error(f"Error counting {self.model.__name__}: {e}")
+            raise
+
     def save(self, model: BaseModel) -> BaseSchema:
         """
         Save a new record to the database
@@ -248,8 +474,8 @@ class BaseRepositoryImpl(BaseRepository):
             InstanceNotFoundError: If the record is not found
         """
         try:
-            stmt = select(self.model).where(self.model.id_key == id_key)
-            model = self.session.scalars(stmt).first()
+            stmt = select(self.model) if self.delete_profile is None else self.select_loaded(self.delete_profile)
+            model = self.session.scalars(stmt.where(self.model.id_key == id_key)).first()
 
             if model is None:
                 raise InstanceNotFoundError(
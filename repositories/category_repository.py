@@ -9,5 +9,7 @@ from schemas.category_schema import CategorySchema
 class CategoryRepository(BaseRepositoryImpl):
     """Repository for Category entity database operations."""
 
+    delete_profile = "category_with_products"
+
     def __init__(self, db: Session):
         super().__init__(CategoryModel, CategorySchema, db)
\ No newline at end of file
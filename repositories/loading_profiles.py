@@ -0,0 +1,168 @@
+"""
+Relationship loading profiles
+
+Every relationship in models/ is declared lazy='select', so touching one
+inside a loop issues one query per row (N+1). Repositories never rely on
+that default for reads: they pass explicit loader options instead.
+
+- Named profiles: services request a loading shape per call, e.g.
+  ``repository.select_loaded("order_with_details_and_products")``.
+- Schema-derived options: ORM reads validated into a schema eager-load
+  exactly the relationships that schema serializes (ClientSchema ->
+  addresses, orders; BillSchema -> order, client -> ...).
+- ORM_RAISELOAD_DEFAULT=true appends raiseload("*") to repository reads, so
+  any relationship not covered by the options raises instead of lazy
+  loading. The test suite enables it so new N+1s fail CI.
+"""
+import os
+import typing
+from functools import lru_cache
+from typing import Callable, Dict, Tuple, Type
+
+from pydantic import BaseModel as PydanticModel
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from models.base_model import BaseModel
+from models.bill import BillModel
+from models.category import CategoryModel
+from models.client import ClientModel
+from models.order import OrderModel
+from models.order_detail import OrderDetailModel
+from models.product import ProductModel
+from models.review import ReviewModel
+
+
+# name -> (model, loader options factory). Options are built on first use:
+# creating them configures the mappers, which needs every model imported.
+LOADING_PROFILES: Dict[str, Tuple[Type[BaseModel], Callable[[], tuple]]] = {
+    "order_with_details": (OrderModel, lambda: (
+        selectinload(OrderModel.order_details),
+    )),
+    "order_with_details_and_products": (OrderModel, lambda: (
+        selectinload(OrderModel.order_details).joinedload(OrderDetailModel.product),
+    )),
+    "order_with_client_and_bill": (OrderModel, lambda: (
+        joinedload(OrderModel.client),
+        joinedload(OrderModel.bill),
+    )),
+    "order_detail_with_product": (OrderDetailModel, lambda: (
+        joinedload(OrderDetailModel.product),
+    )),
+    "order_detail_with_owner_and_product": (OrderDetailModel, lambda: (
+        joinedload(OrderDetailModel.order).joinedload(OrderModel.client),
+        joinedload(OrderDetailModel.product),
+    )),
+    "client_with_addresses": (ClientModel, lambda: (
+        selectinload(ClientModel.addresses),
+    )),
+    "client_with_orders_and_details": (ClientModel, lambda: (
+        selectinload(ClientModel.orders).selectinload(OrderModel.order_details),
+    )),
+    "product_with_category": (ProductModel, lambda: (
+        joinedload(ProductModel.category),
+    )),
+    "product_with_reviews": (ProductModel, lambda: (
+        selectinload(ProductModel.reviews),
+    )),
+    "product_with_dependents": (ProductModel, lambda: (
+        selectinload(ProductModel.reviews),
+        selectinload(ProductModel.order_details),
+    )),
+    "category_with_products": (CategoryModel, lambda: (
+        selectinload(CategoryModel.products),
+    )),
+    "review_with_product": (ReviewModel, lambda: (
+        joinedload(ReviewModel.product),
+    )),
+    "bill_with_client": (BillModel, lambda: (
+        joinedload(BillModel.client),
+    )),
+    "bill_with_order_and_client": (BillModel, lambda: (
+        joinedload(BillModel.order),
+        joinedload(BillModel.client),
+    )),
+}
+
+
+def raiseload_enabled() -> bool:
+    """Check whether repository reads forbid lazy loading (ORM_RAISELOAD_DEFAULT)"""
+    return os.getenv('ORM_RAISELOAD_DEFAULT', 'false').lower() == 'true'
+
+
+@lru_cache(maxsize=None)
+def get_loading_profile(model: Type[BaseModel], name: str) -> tuple:
+    """
+    Get the loader options of a named profile
+
+    Args:
+        model: Model the profile is applied to
+        name: Profile name (see LOADING_PROFILES)
+
+    Returns:
+        Tuple of loader options
+
+    Raises:
+        ValueError: If the profile is unknown or targets another model
+    """
+    try:
+        profile_model, build_options = LOADING_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown loading profile: {name}")
+
+    if profile_model is not model:
+        raise ValueError(
+            f"Loading profile {name} is for {profile_model.__name__}, not {model.__name__}"
+        )
+    return build_options()
+
+
+def _nested_schema(annotation) -> Type[PydanticModel] | None:
+    """Find the pydantic model inside Optional[...] / List[...] annotations"""
+    if isinstance(annotation, type) and issubclass(annotation, PydanticModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        nested = _nested_schema(arg)
+        if nested is not None:
+            return nested
+    return None
+
+
+def _schema_options(model: Type[BaseModel], schema: Type[PydanticModel],
+                    path: frozenset, strict: bool) -> list:
+    relationships = model.__mapper__.relationships
+    options = []
+    for field_name, field in schema.model_fields.items():
+        if field_name not in relationships:
+            continue
+
+        relationship = relationships[field_name]
+        target = relationship.mapper.class_
+        loader = selectinload if relationship.uselist else joinedload
+        option = loader(getattr(model, field_name))
+
+        nested = _nested_schema(field.annotation)
+        if nested is not None and target not in path:
+            nested_options = _schema_options(target, nested, path | {target}, strict)
+            if strict:
+                nested_options.append(raiseload("*"))
+            if nested_options:
+                option = option.options(*nested_options)
+        options.append(option)
+    return options
+
+
+@lru_cache(maxsize=None)
+def schema_load_options(model: Type[BaseModel], schema: Type[PydanticModel],
+                        strict: bool = False) -> tuple:
+    """
+    Get eager-loading options for every relationship a schema serializes
+
+    Collections use selectinload (one extra IN query per relationship),
+    many-to-one/one-to-one use joinedload. Nested schemas are followed
+    recursively, stopping at models already on the path. With strict=True
+    every loaded level also gets raiseload("*").
+    """
+    options = _schema_options(model, schema, frozenset({model}), strict)
+    if strict:
+        options.append(raiseload("*"))
+    return tuple(options)
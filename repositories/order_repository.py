@@ -1,13 +1,122 @@
 """Order repository for database operations."""
+from typing import Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.orm import Session
 
+from models.client import ClientModel
 from models.order import OrderModel
-from repositories.base_repository_impl import BaseRepositoryImpl
+from models.order_detail import OrderDetailModel
+from repositories.base_repository_impl import BaseRepositoryImpl, InstanceNotFoundError
 from schemas.order_schema import OrderSchema
 
+# Totals closer than this to the sum of their details are not rewritten
+TOTAL_EPSILON = 0.005
+
 
 class OrderRepository(BaseRepositoryImpl):
     """Repository for Order entity database operations."""
 
     def __init__(self, db: Session):
-        super().__init__(OrderModel, OrderSchema, db)
\ No newline at end of file
+        super().__init__(OrderModel, OrderSchema, db)
+
+    def owner_email(self, order_id: int) -> Optional[str]:
+        """
+        Check an order exists and read its client's email in one query
+
+        Lets order detail writes validate the order and learn whose cached
+        order history to drop without a separate lookup.
+
+        Args:
+            order_id: Order to look up
+
+        Returns:
+            The owning client's email (None if the order has no client or email)
+
+        Raises:
+            InstanceNotFoundError: If the order does not exist
+        """
+        stmt = (
+            select(OrderModel.id_key, ClientModel.email)
+            .outerjoin(ClientModel, ClientModel.id_key == OrderModel.client_id)
+            .where(OrderModel.id_key == order_id)
+        )
+        row = self.session.execute(stmt).first()
+        if row is None:
+            raise InstanceNotFoundError(f"Order with id {order_id} not found")
+        return row.email
+
+    def adjust_total(self, order_id: int, delta: float) -> float:
+        """
+        Atomically add a delta to an order's total (UPDATE ... RETURNING total)
+
+        Called by order detail writes in their own transaction so the total
+        always equals the sum of quantity * price over the order's details.
+        Does not commit.
+
+        Args:
+            order_id: Order to adjust
+            delta: Amount to add (negative to subtract)
+
+        Returns:
+            The new order total
+
+        Raises:
+            InstanceNotFoundError: If the order does not exist
+        """
+        stmt = (
+            update(OrderModel)
+            .where(OrderModel.id_key == order_id)
+            .values(total=func.coalesce(OrderModel.total, 0.0) + delta)
+            .returning(OrderModel.total)
+            .execution_options(synchronize_session=False)
+        )
+        total = self.session.execute(stmt).scalar_one_or_none()
+        if total is None:
+            raise InstanceNotFoundError(f"Order with id {order_id} not found")
+        return total
+
+    def recompute_totals(self, after_id: int = 0, limit: int = 1000) -> Tuple[int, Optional[int]]:
+        """
+        Reset the totals of the next batch of orders to the sum of their details
+
+        Batches are walked by primary key (keyset) so each UPDATE touches at
+        most `limit` rows; only totals that drifted are rewritten. Does not
+        commit.
+
+        Args:
+            after_id: Last order id of the previous batch (0 to start)
+            limit: Orders per batch
+
+        Returns:
+            Tuple of (totals corrected, last order id of this batch or None when done)
+        """
+        ids = self.session.execute(
+            select(OrderModel.id_key)
+            .where(OrderModel.id_key > after_id)
+            .order_by(OrderModel.id_key)
+            .limit(limit)
+        ).scalars().all()
+        if not ids:
+            return 0, None
+
+        details_total = (
+            select(func.coalesce(func.sum(OrderDetailModel.quantity * OrderDetailModel.price), 0.0))
+            .where(OrderDetailModel.order_id == OrderModel.id_key)
+            .correlate(OrderModel)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(OrderModel)
+            .where(
+                OrderModel.id_key.in_(ids),
+                or_(
+                    OrderModel.total.is_(None),
+                    func.abs(OrderModel.total - details_total) > TOTAL_EPSILON,
+                ),
+            )
+            .values(total=details_total)
+            .execution_options(synchronize_session=False)
+        )
+        corrected = self.session.execute(stmt).rowcount
+        return corrected, ids[-1]
@@ -0,0 +1,129 @@
+"""Product rating stats repository for database operations."""
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.product_rating_stats import RATING_BUCKETS, ProductRatingStatsModel
+from models.review import ReviewModel
+from repositories.base_repository_impl import BaseRepositoryImpl
+from schemas.review_schema import ProductRatingStatsSchema
+
+
+class ProductRatingStatsRepository(BaseRepositoryImpl):
+    """Repository for per-product review aggregates."""
+
+    def __init__(self, db: Session):
+        super().__init__(ProductRatingStatsModel, ProductRatingStatsSchema, db)
+
+    def apply_delta(self, product_id: int, rating_delta: float, count_delta: int,
+                    bucket_deltas: Dict[int, int]) -> None:
+        """
+        Atomically add a review change to a product's aggregates
+
+        UPDATE ... SET col = col + :delta, so concurrent review writes never
+        overwrite each other; the row is inserted on the product's first
+        review (a concurrent first insert falls back to the UPDATE).
+        Does not commit: callers commit it with the review itself.
+
+        Args:
+            product_id: Reviewed product
+            rating_delta: Change of the rating sum
+            count_delta: Change of the review count
+            bucket_deltas: Change per histogram bucket (1..5)
+        """
+        values = {
+            "rating_sum": ProductRatingStatsModel.rating_sum + rating_delta,
+            "rating_count": ProductRatingStatsModel.rating_count + count_delta,
+        }
+        for bucket, delta in bucket_deltas.items():
+            column = getattr(ProductRatingStatsModel, f"rating_{bucket}")
+            values[f"rating_{bucket}"] = column + delta
+
+        stmt = (
+            update(ProductRatingStatsModel)
+            .where(ProductRatingStatsModel.product_id == product_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if self.session.execute(stmt).rowcount:
+            return
+
+        row = {"product_id": product_id, "rating_sum": rating_delta, "rating_count": count_delta}
+        row.update({f"rating_{bucket}": bucket_deltas.get(bucket, 0) for bucket in RATING_BUCKETS})
+        try:
+            with self.session.begin_nested():
+                self.session.execute(insert(ProductRatingStatsModel).values(**row))
+        except IntegrityError:
+            # Another transaction created the row first
+            self.session.execute(stmt)
+
+    def find_by_product(self, product_id: int) -> Optional[ProductRatingStatsSchema]:
+        """Get a product's aggregates (None if it has no reviews)"""
+        row = self.session.execute(
+            select(*self._columns()).where(ProductRatingStatsModel.product_id == product_id)
+        ).first()
+        return ProductRatingStatsSchema.model_validate(row._asdict()) if row else None
+
+    def find_reviewed(self) -> list:
+        """Get the aggregates of every product with at least one review"""
+        rows = self.session.execute(
+            select(*self._columns())
+            .where(ProductRatingStatsModel.rating_count > 0)
+            .order_by(ProductRatingStatsModel.product_id)
+        ).all()
+        return [ProductRatingStatsSchema.model_validate(row._asdict()) for row in rows]
+
+    def rebuild(self, product_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recompute aggregates from the reviews table (backfill / repair)
+
+        Deletes the current rows (all, or only the given products) and
+        inserts fresh ones with a single INSERT ... SELECT ... GROUP BY.
+        Does not commit.
+
+        Args:
+            product_ids: Products to rebuild (None for all)
+
+        Returns:
+            Number of products with reviews after the rebuild
+        """
+        product_ids = list(product_ids) if product_ids is not None else None
+
+        clear = delete(ProductRatingStatsModel)
+        aggregates = select(
+            ReviewModel.product_id,
+            func.sum(ReviewModel.rating),
+            func.count(ReviewModel.id_key),
+            *(
+                func.sum(case(
+                    (self._bucket_condition(bucket), 1),
+                    else_=0,
+                ))
+                for bucket in RATING_BUCKETS
+            ),
+        ).where(ReviewModel.product_id.is_not(None)).group_by(ReviewModel.product_id)
+
+        if product_ids is not None:
+            clear = clear.where(ProductRatingStatsModel.product_id.in_(product_ids))
+            aggregates = aggregates.where(ReviewModel.product_id.in_(product_ids))
+
+        self.session.execute(clear)
+        columns = ["product_id", "rating_sum", "rating_count"] + [f"rating_{b}" for b in RATING_BUCKETS]
+        return self.session.execute(
+            insert(ProductRatingStatsModel).from_select(columns, aggregates)
+        ).rowcount
+
+    @staticmethod
+    def _bucket_condition(bucket: int):
+        """SQL condition matching rating_bucket() for one bucket"""
+        rating = ReviewModel.rating
+        if bucket == RATING_BUCKETS[0]:
+            return rating < bucket + 0.5
+        if bucket == RATING_BUCKETS[-1]:
+            return rating >= bucket - 0.5
+        return (rating >= bucket - 0.5) & (rating < bucket + 0.5)
+
+    def _columns(self) -> list:
+        return [getattr(ProductRatingStatsModel, field) for field in ProductRatingStatsSchema.model_fields]
@@ -1,13 +1,91 @@
 """Product repository for database operations."""
+from typing import Tuple
+
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from models.product import ProductModel
-from repositories.base_repository_impl import BaseRepositoryImpl
+from repositories.base_repository_impl import BaseRepositoryImpl, InstanceNotFoundError
 from schemas.product_schema import ProductSchema
 
 
 class ProductRepository(BaseRepositoryImpl):
     """Repository for Product entity database operations."""
 
+    delete_profile = "product_with_dependents"
+
     def __init__(self, db: Session):
-        super().__init__(ProductModel, ProductSchema, db)
\ No newline at end of file
+        super().__init__(ProductModel, ProductSchema, db)
+
+    def decrement_stock(self, product_id: int, quantity: int) -> Tuple[float, int]:
+        """
+        Atomically reserve stock with a single conditional UPDATE
+
+        UPDATE products SET stock = stock - :q
+        WHERE id_key = :id AND stock >= :q
+        RETURNING price, stock
+
+        The row lock is taken by the UPDATE itself and held only until the
+        caller commits, so concurrent checkouts on a hot product never wait
+        behind SELECT ... FOR UPDATE round trips. Does not commit.
+
+        Args:
+            product_id: Product to decrement
+            quantity: Units to take (must be positive)
+
+        Returns:
+            Tuple of (unit price, remaining stock)
+
+        Raises:
+            InstanceNotFoundError: If the product does not exist
+            ValueError: If the stock is insufficient
+        """
+        stmt = (
+            update(ProductModel)
+            .where(ProductModel.id_key == product_id, ProductModel.stock >= quantity)
+            .values(stock=ProductModel.stock - quantity)
+            .returning(ProductModel.price, ProductModel.stock)
+            .execution_options(synchronize_session=False)
+        )
+        row = self.session.execute(stmt).first()
+        if row is not None:
+            return row.price, row.stock
+
+        # No row updated: tell a missing product from insufficient stock
+        available = self.session.execute(
+            select(ProductModel.stock).where(ProductModel.id_key == product_id)
+        ).scalar_one_or_none()
+        if available is None:
+            raise InstanceNotFoundError(f"Product with id {product_id} not found")
+        raise ValueError(
+            f"Insufficient stock for product {product_id}. "
+            f"Requested: {quantity}, Available: {available}"
+        )
+
+    def increment_stock(self, product_id: int, quantity: int) -> int:
+        """
+        Atomically return units to stock (UPDATE ... RETURNING stock)
+
+        Does not commit.
+
+        Args:
+            product_id: Product to increment
+            quantity: Units to give back
+
+        Returns:
+            The new stock level
+
+        Raises:
+            InstanceNotFoundError: If the product does not exist
+        """
+        stmt = (
+            update(ProductModel)
+            .where(ProductModel.id_key == product_id)
+            .values(stock=ProductModel.stock + quantity)
+            .returning(ProductModel.stock)
+            .execution_options(synchronize_session=False)
+        )
+        stock = self.session.execute(stmt).scalar_one_or_none()
+        if stock is None:
+            raise InstanceNotFoundError(f"Product with id {product_id} not found")
+        return stock
@@ -5,6 +5,8 @@ This script runs Uvicorn with multiple workers to handle 400+ concurrent request
 """
 import multiprocessing
 import os
+import shutil
+import tempfile
 
 import uvicorn
 from config.database import create_tables
@@ -27,6 +29,12 @@ TIMEOUT_KEEP_ALIVE = int(os.getenv('TIMEOUT_KEEP_ALIVE', '5'))
 LIMIT_CONCURRENCY = int(os.getenv('LIMIT_CONCURRENCY', '1000'))
 LIMIT_MAX_REQUESTS = int(os.getenv('LIMIT_MAX_REQUESTS', '10000'))
 
+# Metrics: every worker writes its values under this directory and /metrics
+# aggregates them (must be set before the workers import prometheus_client)
+METRICS_DIR = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'ecommerce-api-metrics')
+)
+
 if __name__ == "__main__":
     # Create database tables before starting server
     print("📦 Creating database tables...")
@@ -36,6 +44,10 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"⚠️  Database tables may already exist or error occurred: {e}\n")
 
+    # Start metrics from zero: files of a previous run's workers would be aggregated too
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
     print(f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║  🚀 FastAPI E-commerce - High Performance Production Mode  ║
@@ -48,6 +60,7 @@ if __name__ == "__main__":
   • Backlog: {BACKLOG} pending connections
   • Max concurrency: {LIMIT_CONCURRENCY} requests
   • Keep-alive timeout: {TIMEOUT_KEEP_ALIVE}s
+  • Metrics: /metrics (all workers, {METRICS_DIR})
 
 🔥 Optimized for ~400 concurrent requests
 💾 Database pool: 50 connections + 100 overflow per worker
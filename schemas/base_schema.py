@@ -1,6 +1,7 @@
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model, field_validator
 
 
 class BaseSchema(BaseModel):
@@ -9,3 +10,45 @@ class BaseSchema(BaseModel):
         arbitrary_types_allowed = True
 
     id_key: Optional[int] = None
+
+
+@lru_cache(maxsize=None)
+def get_list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """
+    Get a cached TypeAdapter for List[schema]
+
+    Building a TypeAdapter compiles a pydantic-core validator/serializer,
+    so it is done once per schema and reused for bulk validation of
+    repository rows and for serializing list responses.
+    """
+    return TypeAdapter(List[schema])
+
+
+@lru_cache(maxsize=None)
+def get_partial_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Get a cached schema exposing only a subset of `schema` fields
+
+    Used for sparse fieldsets (`?fields=id_key,name,price`): the projected
+    rows are validated and serialized against this model, so only the
+    requested columns travel from the database to the client.
+
+    Field constraints and the field validators of the selected fields are
+    kept; model validators are not (they may read fields left out).
+    """
+    definitions = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name])
+        for name in fields
+    }
+    validators = {}
+    for name, decorator in schema.__pydantic_decorators__.field_validators.items():
+        selected = [field for field in decorator.info.fields if field in fields]
+        if selected:
+            func = getattr(decorator.func, "__func__", decorator.func)
+            validators[name] = field_validator(*selected, mode=decorator.info.mode)(classmethod(func))
+    return create_model(
+        f"{schema.__name__}Partial",
+        __config__=ConfigDict(from_attributes=True),
+        __validators__=validators,
+        **definitions,
+    )
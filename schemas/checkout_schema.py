@@ -0,0 +1,45 @@
+"""Checkout schemas: whole-cart order creation in one request."""
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from config.constants import ValidationConfig
+from models.enums import DeliveryMethod
+from schemas.order_schema import OrderSchema
+
+
+class CheckoutItem(BaseModel):
+    """One cart line. Prices are never taken from the client."""
+
+    product_id: int = Field(..., description="Product ID reference (required)")
+    quantity: int = Field(..., gt=0, description="Quantity (required, must be positive)")
+
+
+class CheckoutRequest(BaseModel):
+    """Whole cart: the order and all its lines are created in one transaction."""
+
+    client_id: int = Field(..., description="Client ID reference (required)")
+    bill_id: int = Field(..., description="Bill ID reference (required)")
+    delivery_method: DeliveryMethod = Field(..., description="Delivery method (required)")
+    items: List[CheckoutItem] = Field(
+        ...,
+        min_length=1,
+        max_length=ValidationConfig.MAX_CHECKOUT_ITEMS,
+        description="Cart lines (repeated products are merged)",
+    )
+
+
+class CheckoutLine(BaseModel):
+    """Created order detail with the server-side unit price."""
+
+    id_key: int
+    product_id: int
+    quantity: int
+    price: float
+
+
+class CheckoutResponse(BaseModel):
+    """Created order (total computed server-side) and its lines."""
+
+    order: OrderSchema
+    items: List[CheckoutLine]
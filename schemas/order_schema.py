@@ -11,7 +11,7 @@ class OrderSchema(BaseSchema):
     """Schema for Order entity with validations."""
 
     date: Optional[datetime] = Field(default_factory=datetime.utcnow, description="Order date")
-    total: float = Field(..., ge=0, description="Total amount (must be >= 0, required)")
+    total: float = Field(default=0.0, ge=0, description="Total amount, maintained from the order details (ignored on writes)")
     delivery_method: DeliveryMethod = Field(..., description="Delivery method (required)")
     status: Status = Field(default=Status.PENDING, description="Order status")
     client_id: int = Field(..., description="Client ID reference (required)")
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, Field
 
 from schemas.base_schema import BaseSchema
@@ -27,3 +27,21 @@ class ReviewSummary(BaseModel):
     product_id: int
     avg_rating: float
     count: int
+
+
+class RatingStats(BaseModel):
+    product_id: int
+    avg_rating: float
+    count: int
+    histogram: Dict[int, int] = Field(..., description="Reviews per whole-star rating (1..5)")
+
+
+class ProductRatingStatsSchema(BaseSchema):
+    product_id: int
+    rating_sum: float = 0.0
+    rating_count: int = 0
+    rating_1: int = 0
+    rating_2: int = 0
+    rating_3: int = 0
+    rating_4: int = 0
+    rating_5: int = 0
@@ -0,0 +1,102 @@
+"""
+Benchmark: rows/sec for find_all(limit=1000), before vs after the fast read path
+
+"before" reproduces the previous behaviour: full ORM entities, one
+model_validate call per row, then FastAPI's response_model pass which
+validates and serializes the same objects again.
+
+"after" is the current path: column-projected SELECT, bulk validation through
+the cached TypeAdapter and a direct JSON dump (no response_model re-validation).
+
+Runs against an in-memory SQLite database so it needs no running services:
+    python scripts/benchmark_find_all.py --rows 1000 --iterations 50
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import config.database  # noqa: F401  (registers every model on the metadata)
+from models.base_model import base
+from models.category import CategoryModel
+from models.product import ProductModel
+from repositories.product_repository import ProductRepository
+from schemas.base_schema import get_list_adapter
+from schemas.product_schema import ProductSchema
+
+
+def seed(session, rows: int):
+    category = CategoryModel(name="Benchmark")
+    session.add(category)
+    session.flush()
+    session.add_all(
+        ProductModel(
+            name=f"Product {i}",
+            price=10.0 + i,
+            stock=i % 50,
+            image_url=f"/uploads/{i}.webp",
+            category_id=category.id_key,
+        )
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def legacy_find_all(session, limit: int) -> bytes:
+    models = session.scalars(select(ProductModel).offset(0).limit(limit)).all()
+    items = [ProductSchema.model_validate(model) for model in models]
+    # FastAPI response_model handling: dump, validate again, serialize
+    adapter = get_list_adapter(ProductSchema)
+    revalidated = adapter.validate_python([item.model_dump() for item in items])
+    return adapter.dump_json(revalidated)
+
+
+def fast_find_all(session, limit: int) -> bytes:
+    items = ProductRepository(session).find_all(skip=0, limit=limit)
+    return get_list_adapter(ProductSchema).dump_json(items)
+
+
+def measure(label: str, func, session_factory, limit: int, iterations: int) -> float:
+    # Warm-up (compiles statements and pydantic validators)
+    with session_factory() as session:
+        func(session, limit)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        # Fresh session per iteration, like one request per iteration
+        with session_factory() as session:
+            func(session, limit)
+    elapsed = time.perf_counter() - start
+
+    rows_per_sec = (limit * iterations) / elapsed
+    print(f"{label:<8} {rows_per_sec:>12,.0f} rows/sec  ({elapsed * 1000 / iterations:.2f} ms/page)")
+    return rows_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        seed(session, args.rows)
+
+    print(f"find_all(limit={args.rows}) x {args.iterations}")
+    before = measure("before", legacy_find_all, session_factory, args.rows, args.iterations)
+    after = measure("after", fast_find_all, session_factory, args.rows, args.iterations)
+    print(f"speedup  {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: verified tokens/sec, before vs after the JWT payload LRU
+
+"before" verifies the signature on every call (python-jose jwt.decode), as
+decode_access_token did for both the rate limiter and get_current_user.
+
+"after" is the current decode_access_token: the first call per token
+verifies it, later calls are a SHA-256 digest plus an LRU lookup. The
+working set is --tokens distinct tokens (distinct users), cycled through.
+
+Needs no running services:
+    python scripts/benchmark_jwt_decode.py --tokens 100 --iterations 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from jose import jwt
+
+from utils.security import (
+    JWT_ALGORITHM,
+    JWT_SECRET_KEY,
+    create_access_token,
+    decode_access_token,
+    token_payload_cache,
+)
+
+
+def legacy_decode(token: str) -> dict:
+    return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+
+
+def measure(label: str, func, tokens, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(tokens[i % len(tokens)])
+    elapsed = time.perf_counter() - start
+
+    tokens_per_sec = iterations / elapsed
+    print(f"{label:<8} {tokens_per_sec:>12,.0f} tokens/sec  ({elapsed * 1e6 / iterations:.1f} us/token)")
+    return tokens_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    tokens = [create_access_token(subject=str(i), extra={"is_admin": i == 0}) for i in range(args.tokens)]
+    token_payload_cache.clear()
+
+    print(f"decode x {args.iterations} over {args.tokens} distinct tokens")
+    before = measure("before", legacy_decode, tokens, args.iterations)
+    after = measure("after", decode_access_token, tokens, args.iterations)
+    print(f"speedup  {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: requests/sec through the middleware stack, before vs after fusing it
+
+"before" is the old stack: CORS -> RateLimiterMiddleware -> RequestIDMiddleware
+(a BaseHTTPMiddleware, which runs call_next in a task and streams the
+response back through a memory channel).
+
+"after" is CORS -> RequestPipelineMiddleware, one pure ASGI layer doing
+request ID, timing headers, rate limiting and the access log.
+
+Both stacks serve the same trivial endpoint and rate limit in local mode,
+so no Redis is needed; the ASGI app is driven directly (no HTTP server):
+    python scripts/benchmark_middleware.py --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from middleware.rate_limiter import RateLimiterMiddleware
+from middleware.request_id_middleware import RequestIDMiddleware
+from middleware.request_pipeline import RequestPipelineMiddleware
+
+LIMITER = {"calls": 10 ** 9, "period": 60, "redis_client": None, "mode": "local"}
+
+
+def build_app(fused: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if fused:
+        app.add_middleware(RequestPipelineMiddleware, **LIMITER)
+    else:
+        app.add_middleware(RequestIDMiddleware)
+        app.add_middleware(RateLimiterMiddleware, **LIMITER)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"])
+    return app
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/ping", "raw_path": b"/ping",
+        "root_path": "", "query_string": b"", "server": ("bench", 80), "client": ("127.0.0.1", 5000),
+        "headers": [(b"host", b"bench"), (b"origin", b"http://example.com")],
+    }
+
+    async def send(message):
+        pass
+
+    async def worker(count: int):
+        for _ in range(count):
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                # Like a server: nothing more until the client disconnects
+                await asyncio.Event().wait()
+
+            await app(dict(scope), receive, send)
+
+    await worker(10)  # builds the middleware stack
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def measure(label: str, fused: bool, requests: int, concurrency: int) -> float:
+    elapsed = asyncio.run(run(build_app(fused), requests, concurrency))
+    requests_per_sec = requests / elapsed
+    print(f"{label:<8} {requests_per_sec:>10,.0f} req/s  ({elapsed * 1e6 / requests:.1f} us/request)")
+    return requests_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    # Measure the middleware, not the log handlers
+    logging.disable(logging.INFO)
+
+    print(f"GET /ping x {args.requests}, {args.concurrency} concurrent")
+    before = measure("before", False, args.requests, args.concurrency)
+    after = measure("after", True, args.requests, args.concurrency)
+    print(f"speedup  {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Rebuild product_rating_stats from the reviews table
+
+Review aggregates are maintained by the review endpoints; run this to
+backfill them (e.g. after importing reviews) or to repair drift:
+    python scripts/rebuild_rating_stats.py                  # every product
+    python scripts/rebuild_rating_stats.py --product-id 3 --product-id 7
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config.database import SessionLocal
+from services.rating_stats_service import RatingStatsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--product-id", type=int, action="append", dest="product_ids",
+                        help="rebuild only this product (repeatable)")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        rebuilt = RatingStatsService(session).rebuild(args.product_ids)
+    print(f"Rebuilt review aggregates for {rebuilt} products")
+
+
+if __name__ == "__main__":
+    main()
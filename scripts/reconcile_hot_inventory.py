@@ -0,0 +1,58 @@
+"""
+Reconcile hot-inventory sales from Redis into ProductModel.stock
+
+Each pass releases expired reservations, then applies the units sold in
+Redis since the last pass to the products table in one batched UPDATE.
+Run it next to the API whenever HOT_INVENTORY_PRODUCT_IDS is set:
+    python scripts/reconcile_hot_inventory.py            # loop every RECONCILE_INTERVAL s
+    python scripts/reconcile_hot_inventory.py --once     # single pass (cron)
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config.constants import InventoryConfig
+from config.database import SessionLocal
+from services.inventory_service import hot_inventory
+from utils.logging_utils import get_sanitized_logger
+
+logger = get_sanitized_logger(__name__)
+
+
+def run_once() -> int:
+    """Run one expire + reconcile pass, returning the number of products updated"""
+    hot_inventory.expire_reservations()
+    with SessionLocal() as session:
+        return len(hot_inventory.reconcile(session))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interval", type=float, default=InventoryConfig.RECONCILE_INTERVAL)
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    args = parser.parse_args()
+
+    if hot_inventory.redis_client is None:
+        print("Redis is unavailable, nothing to reconcile")
+        sys.exit(1)
+
+    if args.once:
+        print(f"Reconciled {run_once()} products")
+        return
+
+    while True:
+        try:
+            run_once()
+        except Exception as e:
+            # Pending units stay in Redis and are retried on the next pass
+            logger.error(f"Hot inventory reconciliation pass failed: {e}")
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
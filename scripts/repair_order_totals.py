@@ -0,0 +1,31 @@
+"""
+Recompute order totals from their details
+
+Order totals are maintained incrementally by order detail writes; run this
+once to fix orders created before that, or after manual data changes:
+    python scripts/repair_order_totals.py --batch-size 1000
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from config.database import SessionLocal
+from services.order_service import OrderService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        corrected = OrderService(session).repair_totals(args.batch_size)
+    print(f"Corrected {corrected} order totals")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,22 @@ Module for Base Service
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 
 from models.base_model import BaseModel
 from schemas.base_schema import BaseSchema
 from repositories.base_repository import BaseRepository
+from utils.tracing import traced_service
 
 
 class BaseService(ABC):
     """Base Service"""
 
+    def __init_subclass__(cls, **kwargs):
+        """Trace the public methods of every service implementation"""
+        super().__init_subclass__(**kwargs)
+        traced_service(cls)
+
     @property
     @abstractmethod
     def repository(self) -> BaseRepository:
@@ -42,6 +48,14 @@ class BaseService(ABC):
     def get_one(self, id_key: int) -> BaseSchema:
         """Get by id"""
 
+    @abstractmethod
+    def get_many(self, ids: List[int]) -> List[BaseSchema]:
+        """Get several by id"""
+
+    @abstractmethod
+    def count(self) -> Tuple[int, bool]:
+        """Count (total, is_exact)"""
+
     @abstractmethod
     def save(self, schema: BaseSchema) -> BaseSchema:
         """Save"""
@@ -1,12 +1,14 @@
 """
 Module for Base Service Implementation
 """
-from typing import List, Type
+from typing import Iterable, List, Optional, Tuple, Type
 from sqlalchemy.orm import Session
 from models.base_model import BaseModel
 from services.base_service import BaseService
 from repositories.base_repository import BaseRepository
 from schemas.base_schema import BaseSchema
+from services.cache_service import cache_service
+from config.constants import CacheConfig
 
 
 class BaseServiceImpl(BaseService):
@@ -36,17 +38,43 @@ class BaseServiceImpl(BaseService):
         """SQLAlchemy Model"""
         return self._model
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[BaseSchema]:
-        """Get all data with pagination"""
-        return self.repository.find_all(skip=skip, limit=limit)
+    def get_all(self, skip: int = 0, limit: int = 100,
+                fields: Optional[Iterable[str]] = None) -> List[BaseSchema]:
+        """Get all data with pagination and an optional sparse fieldset"""
+        return self.repository.find_all(skip=skip, limit=limit, fields=fields)
 
-    def get_one(self, id_key: int) -> BaseSchema:
-        """Get one data"""
-        return self.repository.find(id_key)
+    def get_one(self, id_key: int, fields: Optional[Iterable[str]] = None) -> BaseSchema:
+        """Get one data with an optional sparse fieldset"""
+        return self.repository.find(id_key, fields=fields)
+
+    def get_many(self, ids: List[int], fields: Optional[Iterable[str]] = None) -> List[BaseSchema]:
+        """Get several records by id in one query (missing ids are skipped)"""
+        return self.repository.find_many(ids, fields=fields)
+
+    def count(self) -> Tuple[int, bool]:
+        """
+        Count records for pagination totals, cached
+
+        Cache key: {table}:list:count (see _count_key)
+        TTL: CacheConfig.LIST_COUNT_TTL
+        save and delete drop the cached total; rows written any other way
+        (e.g. OrderService.checkout) show up once the TTL expires.
+        """
+        cache_key = self._count_key()
+
+        cached = cache_service.get(cache_key)
+        if cached is not None:
+            return cached["total"], cached["exact"]
+
+        total, exact = self.repository.count()
+        cache_service.set(cache_key, {"total": total, "exact": exact}, ttl=CacheConfig.LIST_COUNT_TTL)
+        return total, exact
 
     def save(self, schema: BaseSchema) -> BaseSchema:
         """Save data"""
-        return self.repository.save(self.to_model(schema))
+        result = self.repository.save(self.to_model(schema))
+        cache_service.delete(self._count_key())
+        return result
 
     def update(self, id_key: int, schema: BaseSchema) -> BaseSchema:
         """Update data"""
@@ -55,6 +83,10 @@ class BaseServiceImpl(BaseService):
     def delete(self, id_key: int) -> None:
         """Delete data"""
         self.repository.remove(id_key)
+        cache_service.delete(self._count_key())
+
+    def _count_key(self) -> str:
+        return cache_service.build_key(self.model.__tablename__, "list", "count")
 
     def to_model(self, schema: BaseSchema) -> BaseModel:
         """Convert schema to model"""
@@ -7,12 +7,13 @@ serialization, TTL management, error handling, and distributed cache stampede pr
 import json
 import logging
 import time
-from typing import Optional, Any, List, Callable
+from typing import Optional, Any, Dict, List, Callable, Tuple
 from datetime import timedelta
 import os
 
 from config.redis_config import get_redis_client
 from utils.logging_utils import get_sanitized_logger
+from utils.metrics import CACHE_ERRORS, CACHE_HITS, CACHE_MISSES
 
 logger = get_sanitized_logger(__name__)
 
@@ -54,8 +55,10 @@ class CacheService:
         try:
             value = self.redis_client.get(key)
             if value is None:
+                CACHE_MISSES.inc()
                 return None
 
+            CACHE_HITS.inc()
             # Try to deserialize JSON
             try:
                 return json.loads(value)
@@ -64,6 +67,7 @@ class CacheService:
                 return value
 
         except Exception as e:
+            CACHE_ERRORS.inc()
             logger.error(f"Cache GET error for key '{key}': {e}")
             return None
 
@@ -100,6 +104,198 @@ class CacheService:
             logger.error(f"Cache SET error for key '{key}': {e}")
             return False
 
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several values from cache in one round trip (MGET)
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values in key order, None for misses (all None if cache unavailable)
+        """
+        if not keys or not self.is_available():
+            return [None] * len(keys)
+
+        try:
+            values = self.redis_client.mget(keys)
+        except Exception as e:
+            CACHE_ERRORS.inc(len(keys))
+            logger.error(f"Cache MGET error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+
+        misses = values.count(None)
+        CACHE_HITS.inc(len(values) - misses)
+        CACHE_MISSES.inc(misses)
+
+        results = []
+        for value in values:
+            if value is None:
+                results.append(None)
+                continue
+            try:
+                results.append(json.loads(value))
+            except (json.JSONDecodeError, TypeError):
+                results.append(value)
+        return results
+
+    def set_many(self, items: dict, ttl: Optional[int] = None) -> bool:
+        """
+        Set several values in cache in one round trip (pipelined SETEX)
+
+        Args:
+            items: Mapping of cache key -> value (JSON serialized if not a string)
+            ttl: Time to live in seconds (default: REDIS_CACHE_TTL)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not items or not self.is_available():
+            return False
+
+        try:
+            ttl = ttl or self.default_ttl
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items.items():
+                if not isinstance(value, str):
+                    value = json.dumps(value)
+                pipe.setex(key, ttl, value)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache SET MANY error for {len(items)} keys: {e}")
+            return False
+
+    def get_field(self, key: str, field: str) -> Optional[Any]:
+        """
+        Get one field of a cached hash (HGET)
+
+        Args:
+            key: Hash key
+            field: Field name
+
+        Returns:
+            Cached value or None if not found or cache unavailable
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            value = self.redis_client.hget(key, field)
+        except Exception as e:
+            CACHE_ERRORS.inc()
+            logger.error(f"Cache HGET error for key '{key}': {e}")
+            return None
+
+        if value is None:
+            CACHE_MISSES.inc()
+            return None
+
+        CACHE_HITS.inc()
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value
+
+    def set_field(self, key: str, field: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """
+        Set one field of a cached hash (pipelined HSET + EXPIRE)
+
+        Related entries (e.g. the pages of one user's history) live in one
+        hash so they can be dropped together with a single DEL. The TTL
+        applies to the whole hash and is renewed on every write.
+
+        Args:
+            key: Hash key
+            field: Field name
+            value: Value to cache (JSON serialized if not a string)
+            ttl: Time to live of the hash in seconds (default: REDIS_CACHE_TTL)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_available():
+            return False
+
+        try:
+            if not isinstance(value, str):
+                value = json.dumps(value)
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hset(key, field, value)
+            pipe.expire(key, ttl or self.default_ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache HSET error for key '{key}': {e}")
+            return False
+
+    def get_field_many(self, key_fields: List[Tuple[str, str]]) -> List[Optional[Any]]:
+        """
+        Get one field of several cached hashes in one round trip (pipelined HGET)
+
+        Args:
+            key_fields: (hash key, field name) pairs
+
+        Returns:
+            Values in pair order, None for misses (all None if cache unavailable)
+        """
+        if not key_fields or not self.is_available():
+            return [None] * len(key_fields)
+
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, field in key_fields:
+                pipe.hget(key, field)
+            values = pipe.execute()
+        except Exception as e:
+            CACHE_ERRORS.inc(len(key_fields))
+            logger.error(f"Cache HGET MANY error for {len(key_fields)} keys: {e}")
+            return [None] * len(key_fields)
+
+        misses = values.count(None)
+        CACHE_HITS.inc(len(values) - misses)
+        CACHE_MISSES.inc(misses)
+
+        results = []
+        for value in values:
+            if value is None:
+                results.append(None)
+                continue
+            try:
+                results.append(json.loads(value))
+            except (json.JSONDecodeError, TypeError):
+                results.append(value)
+        return results
+
+    def set_field_many(self, items: Dict[Tuple[str, str], Any], ttl: Optional[int] = None) -> bool:
+        """
+        Set one field of several cached hashes in one round trip (pipelined HSET + EXPIRE)
+
+        Args:
+            items: Mapping of (hash key, field name) -> value (JSON serialized if not a string)
+            ttl: Time to live of each hash in seconds (default: REDIS_CACHE_TTL)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not items or not self.is_available():
+            return False
+
+        try:
+            ttl = ttl or self.default_ttl
+            pipe = self.redis_client.pipeline(transaction=False)
+            for (key, field), value in items.items():
+                if not isinstance(value, str):
+                    value = json.dumps(value)
+                pipe.hset(key, field, value)
+                pipe.expire(key, ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Cache HSET MANY error for {len(items)} keys: {e}")
+            return False
+
     def delete(self, key: str) -> bool:
         """
         Delete key from cache
@@ -120,10 +316,32 @@ class CacheService:
             logger.error(f"Cache DELETE error for key '{key}': {e}")
             return False
 
+    def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several keys in one round trip (DEL)
+
+        Args:
+            keys: Cache keys to delete
+
+        Returns:
+            Number of keys deleted
+        """
+        if not keys or not self.is_available():
+            return 0
+
+        try:
+            return self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Cache DELETE MANY error for {len(keys)} keys: {e}")
+            return 0
+
     def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching pattern
 
+        Uses KEYS, which scans the whole keyspace and blocks Redis while it
+        runs: keep it off request paths (admin and batch invalidation only).
+
         Args:
             pattern: Redis pattern (e.g., "products:*")
 
@@ -204,11 +422,11 @@ class CacheService:
         # Try to get from cache (fast path)
         cached_value = self.get(key)
         if cached_value is not None:
-            logger.debug(f"Cache HIT: {key}")
+            logger.debug("Cache HIT: %s", key)
             return cached_value
 
         # Cache miss - need to recompute with distributed stampede protection
-        logger.debug(f"Cache MISS: {key}")
+        logger.debug("Cache MISS: %s", key)
 
         # Build lock key
         lock_key = f"lock:{key}"
@@ -225,12 +443,12 @@ class CacheService:
 
             if lock_acquired:
                 # We got the lock! Compute and cache the value
-                logger.debug(f"Lock acquired for: {key}")
+                logger.debug("Lock acquired for: %s", key)
                 try:
                     # Double-check cache (another process may have filled it)
                     cached_value = self.get(key)
                     if cached_value is not None:
-                        logger.debug(f"Cache HIT after lock: {key}")
+                        logger.debug("Cache HIT after lock: %s", key)
                         return cached_value
 
                     # Compute value
@@ -250,7 +468,7 @@ class CacheService:
                     # Always release the lock
                     try:
                         self.redis_client.delete(lock_key)
-                        logger.debug(f"Lock released for: {key}")
+                        logger.debug("Lock released for: %s", key)
                     except Exception as e:
                         logger.error(f"Error releasing lock for '{key}': {e}")
 
@@ -266,7 +484,7 @@ class CacheService:
                 # Check if cache was filled while waiting
                 cached_value = self.get(key)
                 if cached_value is not None:
-                    logger.debug(f"Cache HIT after waiting: {key}")
+                    logger.debug("Cache HIT after waiting: %s", key)
                     return cached_value
 
         # Failed to acquire lock after all retries
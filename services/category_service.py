@@ -1,12 +1,13 @@
 """Category service with Redis caching integration."""
 import logging
-from typing import List
+from typing import Iterable, List, Optional
 from sqlalchemy.orm import Session
 
 from models.category import CategoryModel
 from repositories.category_repository import CategoryRepository
 from schemas.category_schema import CategorySchema
 from services.base_service_impl import BaseServiceImpl
+from schemas.base_schema import get_list_adapter
 from services.cache_service import cache_service
 from utils.logging_utils import get_sanitized_logger
 
@@ -28,61 +29,96 @@ class CategoryService(BaseServiceImpl):
         # Categories change rarely, so longer TTL (1 hour)
         self.cache_ttl = 3600
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[CategorySchema]:
+    def get_all(self, skip: int = 0, limit: int = 100,
+                fields: Optional[Iterable[str]] = None) -> List[CategorySchema]:
         """
         Get all categories with long-lived cache
 
-        Cache key pattern: categories:list:skip:{skip}:limit:{limit}
+        Cache: hash categories:list, one field per page and field set
+        (skip:{skip}:limit:{limit}:fields:{all or a,b}), dropped together
+        with a single DEL on any category write
         TTL: 1 hour (categories rarely change)
         """
-        cache_key = self.cache.build_key(
-            self.cache_prefix,
-            "list",
-            skip=skip,
-            limit=limit
-        )
+        fields = self.repository.resolve_fields(fields)
+        schema = self.repository.schema_for(fields)
+        cache_key = self._list_key()
+        page = f"skip:{skip}:limit:{limit}:fields:{self._variant(fields)}"
 
         # Try cache first
-        cached_categories = self.cache.get(cache_key)
+        cached_categories = self.cache.get_field(cache_key, page)
         if cached_categories is not None:
-            logger.debug(f"Cache HIT: {cache_key}")
-            return [CategorySchema(**c) for c in cached_categories]
+            logger.debug("Cache HIT: %s %s", cache_key, page)
+            return get_list_adapter(schema).validate_python(cached_categories)
 
         # Cache miss
-        logger.debug(f"Cache MISS: {cache_key}")
-        categories = super().get_all(skip, limit)
+        logger.debug("Cache MISS: %s %s", cache_key, page)
+        categories = super().get_all(skip, limit, fields=fields)
 
         # Cache with longer TTL
         categories_dict = [c.model_dump() for c in categories]
-        self.cache.set(cache_key, categories_dict, ttl=self.cache_ttl)
+        self.cache.set_field(cache_key, page, categories_dict, ttl=self.cache_ttl)
 
         return categories
 
-    def get_one(self, id_key: int) -> CategorySchema:
+    def get_one(self, id_key: int, fields: Optional[Iterable[str]] = None) -> CategorySchema:
         """
         Get single category by ID with caching
 
-        Cache key pattern: categories:id:{id_key}
+        Cache: hash categories:id:{id_key}, one field per field set
+        ("all", or the sparse fieldset "a,b"), dropped together on writes
         TTL: 1 hour
         """
-        cache_key = self.cache.build_key(self.cache_prefix, "id", id=id_key)
+        fields = self.repository.resolve_fields(fields)
+        schema = self.repository.schema_for(fields)
+        cache_key = self._item_key(id_key)
+        variant = self._variant(fields)
 
-        cached_category = self.cache.get(cache_key)
+        cached_category = self.cache.get_field(cache_key, variant)
         if cached_category is not None:
-            logger.debug(f"Cache HIT: {cache_key}")
-            return CategorySchema(**cached_category)
+            logger.debug("Cache HIT: %s %s", cache_key, variant)
+            return schema(**cached_category)
 
-        logger.debug(f"Cache MISS: {cache_key}")
-        category = super().get_one(id_key)
+        logger.debug("Cache MISS: %s %s", cache_key, variant)
+        category = super().get_one(id_key, fields=fields)
 
-        self.cache.set(cache_key, category.model_dump(), ttl=self.cache_ttl)
+        self.cache.set_field(cache_key, variant, category.model_dump(), ttl=self.cache_ttl)
 
         return category
 
+    def get_many(self, ids: List[int], fields: Optional[Iterable[str]] = None) -> List[CategorySchema]:
+        """
+        Get several categories by ID, reusing the per-category cache
+
+        One pipelined round trip over the get_one hashes and fields, then a
+        single IN (...) query for the misses, which are cached with the
+        category TTL.
+        """
+        fields = self.repository.resolve_fields(fields)
+        schema = self.repository.schema_for(fields)
+        ids = list(dict.fromkeys(ids))
+        variant = self._variant(fields)
+        key_fields = [(self._item_key(id_key), variant) for id_key in ids]
+
+        found = {}
+        for id_key, cached in zip(ids, self.cache.get_field_many(key_fields)):
+            if cached is not None:
+                found[id_key] = schema(**cached)
+
+        missing = [id_key for id_key in ids if id_key not in found]
+        if missing:
+            categories = super().get_many(missing, fields=fields)
+            found.update((c.id_key, c) for c in categories)
+            self.cache.set_field_many({
+                (self._item_key(c.id_key), variant): c.model_dump()
+                for c in categories
+            }, ttl=self.cache_ttl)
+
+        return [found[id_key] for id_key in ids if id_key in found]
+
     def save(self, schema: CategorySchema) -> CategorySchema:
-        """Create new category and invalidate cache"""
+        """Create new category and invalidate the list cache"""
         category = super().save(schema)
-        self._invalidate_all_cache()
+        self.cache.delete(self._list_key())
         return category
 
     def update(self, id_key: int, schema: CategorySchema) -> CategorySchema:
@@ -105,24 +141,34 @@ class CategoryService(BaseServiceImpl):
             category = super().update(id_key, schema)
 
             # Only invalidate cache AFTER successful DB commit
-            self._invalidate_all_cache()
+            self._invalidate_cache(id_key)
 
-            logger.info(f"Category {id_key} updated and cache invalidated successfully")
+            logger.info("Category %s updated and cache invalidated successfully", id_key)
             return category
 
         except Exception as e:
             # If update fails, cache remains consistent (no invalidation)
-            logger.error(f"Failed to update category {id_key}: {e}")
+            logger.error("Failed to update category %s: %s", id_key, e)
             raise
 
     def delete(self, id_key: int) -> None:
         """Delete category and invalidate cache"""
         super().delete(id_key)
-        self._invalidate_all_cache()
-
-    def _invalidate_all_cache(self):
-        """Invalidate all category caches"""
-        pattern = f"{self.cache_prefix}:*"
-        deleted_count = self.cache.delete_pattern(pattern)
-        if deleted_count > 0:
-            logger.info(f"Invalidated {deleted_count} category cache entries")
+        self._invalidate_cache(id_key)
+
+    def _item_key(self, id_key: int) -> str:
+        """Hash holding every cached field set of one category"""
+        return self.cache.build_key(self.cache_prefix, "id", id=id_key)
+
+    def _list_key(self) -> str:
+        """Hash holding every cached page of the category list"""
+        return self.cache.build_key(self.cache_prefix, "list")
+
+    @staticmethod
+    def _variant(fields: Optional[tuple]) -> str:
+        """Hash field of a field set ("all" for the full schema)"""
+        return ",".join(fields) if fields else "all"
+
+    def _invalidate_cache(self, id_key: int):
+        """Invalidate one category's hash and the list hash (one DEL)"""
+        self.cache.delete_many([self._item_key(id_key), self._list_key()])
@@ -0,0 +1,402 @@
+"""
+Hot Inventory Service Module
+
+Opt-in Redis reservation layer for flash-sale products. Stock for the
+products listed in HOT_INVENTORY_PRODUCT_IDS is mirrored into Redis
+counters and reserved with Lua scripts, so checkouts never queue on the
+product's PostgreSQL row lock. Units sold in Redis are accumulated per
+product and applied to ProductModel.stock in batches by reconcile().
+
+Redis keys:
+    inventory:stock:{product_id}      units available for new reservations
+    inventory:pending:{product_id}    units sold but not yet applied to the DB
+    inventory:dirty                   SET of product ids with pending units
+    inventory:reservations            ZSET reservation id -> expiry timestamp
+    inventory:reservation:{id}        HASH product_id, quantity
+
+Flow: reserve() -> DB commit of the order detail -> confirm(); on failure
+release(). Admin stock changes (ProductService.update) shift a seeded
+counter by the same delta. Reservations that are never confirmed
+(abandoned checkouts, crashed workers) expire after RESERVATION_TTL and
+their units return to the counter.
+"""
+import time
+import uuid
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from config.constants import InventoryConfig
+from config.redis_config import get_redis_client
+from models.product import ProductModel
+from repositories.base_repository_impl import InstanceNotFoundError
+from utils.logging_utils import get_sanitized_logger
+from utils.tracing import traced_service
+
+logger = get_sanitized_logger(__name__)
+
+KEY_PREFIX = "inventory"
+
+# KEYS: stock, reservations, reservation ; ARGV: quantity, reservation id, expires at, product id
+# Returns {1, remaining} | {-1, available} | {-2, 0} when the counter is not seeded
+RESERVE_SCRIPT = """
+local stock = redis.call('GET', KEYS[1])
+if not stock then
+    return {-2, 0}
+end
+stock = tonumber(stock)
+local quantity = tonumber(ARGV[1])
+if stock < quantity then
+    return {-1, stock}
+end
+local remaining = redis.call('DECRBY', KEYS[1], quantity)
+redis.call('HSET', KEYS[3], 'product_id', ARGV[4], 'quantity', quantity)
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[2])
+return {1, remaining}
+"""
+
+# KEYS: reservation, reservations, pending, dirty, stock ; ARGV: reservation id, product id, quantity
+# Returns the confirmed quantity, negated if the reservation had already expired
+CONFIRM_SCRIPT = """
+local quantity = redis.call('HGET', KEYS[1], 'quantity')
+local expired = 0
+if not quantity then
+    -- expired and released meanwhile: take the units again so accounting stays exact
+    quantity = ARGV[3]
+    expired = 1
+    if redis.call('EXISTS', KEYS[5]) == 1 then
+        redis.call('DECRBY', KEYS[5], quantity)
+    end
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('INCRBY', KEYS[3], quantity)
+redis.call('SADD', KEYS[4], ARGV[2])
+if expired == 1 then
+    return -tonumber(quantity)
+end
+return tonumber(quantity)
+"""
+
+# KEYS: reservation, reservations, stock ; ARGV: reservation id
+# Returns the released quantity (0 if already confirmed/released)
+RELEASE_SCRIPT = """
+local quantity = redis.call('HGET', KEYS[1], 'quantity')
+redis.call('ZREM', KEYS[2], ARGV[1])
+if not quantity then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('INCRBY', KEYS[3], quantity)
+end
+return tonumber(quantity)
+"""
+
+# KEYS: stock, pending, dirty ; ARGV: quantity, product id
+# Units given back after a sale (order detail deleted or reduced)
+RESTOCK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+redis.call('DECRBY', KEYS[2], ARGV[1])
+redis.call('SADD', KEYS[3], ARGV[2])
+return 1
+"""
+
+# KEYS: stock, pending ; ARGV: database stock
+# Seeds the counter once (NX) from the DB stock minus units not yet reconciled
+SEED_SCRIPT = """
+local pending = tonumber(redis.call('GET', KEYS[2]) or '0')
+redis.call('SET', KEYS[1], tonumber(ARGV[1]) - pending, 'NX')
+return tonumber(redis.call('GET', KEYS[1]))
+"""
+
+# KEYS: stock ; ARGV: delta
+# Shifts a seeded counter by an admin stock change; unseeded counters are left
+# to be seeded from the new DB stock
+ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+return redis.call('INCRBY', KEYS[1], ARGV[1])
+"""
+
+# KEYS: pending, dirty ; ARGV: product id
+# Atomically takes the units sold since the last reconciliation
+TAKE_PENDING_SCRIPT = """
+local pending = redis.call('GET', KEYS[1])
+redis.call('DEL', KEYS[1])
+redis.call('SREM', KEYS[2], ARGV[1])
+return tonumber(pending or '0')
+"""
+
+
+class HotInventoryUnavailableError(Exception):
+    """
+    HotInventoryUnavailableError is raised when a hot product is sold while
+    Redis is unavailable (selling from the DB stock could oversell, since
+    units sold in Redis may not be reconciled yet)
+    """
+    pass
+
+
+class Reservation(NamedTuple):
+    """Units held in Redis for one product until confirmed or released"""
+    reservation_id: str
+    product_id: int
+    quantity: int
+    remaining: int
+
+
+@traced_service
+class HotInventoryService:
+    """
+    Redis-backed stock reservations for flagged (hot) products
+
+    All counter updates run as Lua scripts, so each reserve/confirm/release
+    is atomic on the Redis server without any database lock.
+    """
+
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client if redis_client is not None else get_redis_client()
+        self._scripts = {}
+
+    def is_hot(self, product_id: int) -> bool:
+        """Check whether a product's stock is managed in Redis"""
+        return product_id in InventoryConfig.HOT_PRODUCT_IDS
+
+    def _key(self, *parts) -> str:
+        return ":".join([KEY_PREFIX, *(str(part) for part in parts)])
+
+    def _script(self, source: str):
+        """Get a registered (EVALSHA-cached) script"""
+        if self.redis_client is None:
+            raise HotInventoryUnavailableError("Hot inventory requires Redis, which is unavailable")
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = self.redis_client.register_script(source)
+        return script
+
+    def reserve(self, session: Session, product_id: int, quantity: int,
+                ttl: Optional[int] = None) -> Reservation:
+        """
+        Atomically take units from a hot product's Redis counter
+
+        Args:
+            session: Database session (only read to seed the counter)
+            product_id: Hot product ID
+            quantity: Units to reserve
+            ttl: Seconds before an unconfirmed reservation is released
+                (default InventoryConfig.RESERVATION_TTL)
+
+        Returns:
+            The reservation, to confirm after the DB commit or release on failure
+
+        Raises:
+            InstanceNotFoundError: If the product doesn't exist
+            ValueError: If the stock is insufficient
+            HotInventoryUnavailableError: If Redis is unavailable
+        """
+        reservation_id = uuid.uuid4().hex
+        expires_at = time.time() + (ttl or InventoryConfig.RESERVATION_TTL)
+        keys = [
+            self._key("stock", product_id),
+            self._key("reservations"),
+            self._key("reservation", reservation_id),
+        ]
+        args = [quantity, reservation_id, expires_at, product_id]
+
+        try:
+            status, value = self._script(RESERVE_SCRIPT)(keys=keys, args=args)
+            if status == -2:
+                self._seed(session, product_id)
+                status, value = self._script(RESERVE_SCRIPT)(keys=keys, args=args)
+        except (HotInventoryUnavailableError, InstanceNotFoundError):
+            raise
+        except Exception as e:
+            logger.error(f"Hot inventory reserve failed for product {product_id}: {e}")
+            raise HotInventoryUnavailableError(f"Hot inventory unavailable: {e}") from e
+
+        if status == -1:
+            raise ValueError(
+                f"Insufficient stock for product {product_id}. "
+                f"Requested: {quantity}, Available: {value}"
+            )
+        return Reservation(reservation_id, product_id, quantity, int(value))
+
+    def confirm(self, reservation: Reservation) -> None:
+        """
+        Turn a reservation into a sale, pending reconciliation to the DB
+
+        Called after the order detail is committed. Never raises: the sale is
+        already in the database, a failure here is logged for follow-up.
+        """
+        try:
+            confirmed = self._script(CONFIRM_SCRIPT)(
+                keys=[
+                    self._key("reservation", reservation.reservation_id),
+                    self._key("reservations"),
+                    self._key("pending", reservation.product_id),
+                    self._key("dirty"),
+                    self._key("stock", reservation.product_id),
+                ],
+                args=[reservation.reservation_id, reservation.product_id, reservation.quantity],
+            )
+            if confirmed < 0:
+                logger.warning(
+                    f"Reservation {reservation.reservation_id} expired before confirmation; "
+                    f"units for product {reservation.product_id} taken again"
+                )
+        except Exception as e:
+            logger.error(
+                f"Failed to confirm reservation {reservation.reservation_id} "
+                f"({reservation.quantity} x product {reservation.product_id}): {e}"
+            )
+
+    def release(self, reservation: Reservation) -> int:
+        """
+        Return a reservation's units to the counter (failed checkout)
+
+        Returns:
+            Units released (0 if already confirmed, released or expired)
+        """
+        try:
+            return self._script(RELEASE_SCRIPT)(
+                keys=[
+                    self._key("reservation", reservation.reservation_id),
+                    self._key("reservations"),
+                    self._key("stock", reservation.product_id),
+                ],
+                args=[reservation.reservation_id],
+            )
+        except Exception as e:
+            # The reservation TTL returns the units eventually
+            logger.error(f"Failed to release reservation {reservation.reservation_id}: {e}")
+            return 0
+
+    def restock(self, product_id: int, quantity: int) -> None:
+        """
+        Give sold units back (order detail deleted or its quantity reduced)
+
+        The counter is credited now; the DB stock on the next reconciliation.
+        """
+        try:
+            self._script(RESTOCK_SCRIPT)(
+                keys=[self._key("stock", product_id), self._key("pending", product_id), self._key("dirty")],
+                args=[quantity, product_id],
+            )
+        except Exception as e:
+            logger.error(f"Failed to restock {quantity} x product {product_id} in hot inventory: {e}")
+
+    def adjust(self, product_id: int, delta: int) -> None:
+        """
+        Apply an admin stock change (PUT /products) to the counter
+
+        The counter only ever moves by deltas once seeded, so reservations
+        and units pending reconciliation stay accounted for. Called after
+        the DB commit; a failure is logged and leaves the counter stale.
+        """
+        if not delta:
+            return
+        try:
+            stock = self._script(ADJUST_SCRIPT)(keys=[self._key("stock", product_id)], args=[delta])
+            if stock is not None:
+                logger.info(f"Hot inventory for product {product_id} adjusted by {delta}: {stock} units")
+        except Exception as e:
+            logger.error(
+                f"Failed to adjust hot inventory for product {product_id} by {delta}, "
+                f"counter is out of sync with the database: {e}"
+            )
+
+    def expire_reservations(self, limit: Optional[int] = None) -> int:
+        """
+        Release reservations past their TTL (abandoned checkouts)
+
+        Returns:
+            Number of reservations released
+        """
+        limit = limit or InventoryConfig.RECONCILE_BATCH_SIZE
+        expired_ids = self.redis_client.zrangebyscore(
+            self._key("reservations"), "-inf", time.time(), start=0, num=limit
+        )
+        released = 0
+        for reservation_id in expired_ids:
+            product_id = self.redis_client.hget(self._key("reservation", reservation_id), "product_id")
+            if product_id is None:
+                self.redis_client.zrem(self._key("reservations"), reservation_id)
+                continue
+            if self.release(Reservation(reservation_id, int(product_id), 0, 0)):
+                released += 1
+        if released:
+            logger.info(f"Released {released} expired hot-inventory reservations")
+        return released
+
+    def reconcile(self, session: Session, limit: Optional[int] = None) -> Dict[int, int]:
+        """
+        Apply units sold in Redis to ProductModel.stock in one batch
+
+        Pending units are taken atomically per product, then written with a
+        single executemany UPDATE and one commit. If the database write
+        fails, the units are put back so the next run applies them.
+
+        Returns:
+            Mapping of product id -> units applied (negative for restocks)
+        """
+        limit = limit or InventoryConfig.RECONCILE_BATCH_SIZE
+        product_ids = self.redis_client.srandmember(self._key("dirty"), limit) or []
+
+        deltas = {}
+        for product_id in product_ids:
+            sold = self._script(TAKE_PENDING_SCRIPT)(
+                keys=[self._key("pending", product_id), self._key("dirty")],
+                args=[product_id],
+            )
+            if sold:
+                deltas[int(product_id)] = int(sold)
+
+        if not deltas:
+            return {}
+
+        stmt = (
+            update(ProductModel)
+            .where(ProductModel.id_key == bindparam("product_id"))
+            .values(stock=ProductModel.stock - bindparam("sold"))
+        )
+        try:
+            session.connection().execute(
+                stmt, [{"product_id": pid, "sold": sold} for pid, sold in deltas.items()]
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            pipe = self.redis_client.pipeline()
+            for pid, sold in deltas.items():
+                pipe.incrby(self._key("pending", pid), sold)
+                pipe.sadd(self._key("dirty"), pid)
+            pipe.execute()
+            logger.error(f"Hot inventory reconciliation failed, {len(deltas)} products re-queued: {e}")
+            raise
+
+        logger.info(f"Reconciled hot inventory for {len(deltas)} products: {deltas}")
+        return deltas
+
+    def _seed(self, session: Session, product_id: int) -> int:
+        """Initialize a product's counter from the database stock"""
+        db_stock = session.execute(
+            select(ProductModel.stock).where(ProductModel.id_key == product_id)
+        ).scalar_one_or_none()
+        if db_stock is None:
+            raise InstanceNotFoundError(f"Product with id {product_id} not found")
+
+        stock = self._script(SEED_SCRIPT)(
+            keys=[self._key("stock", product_id), self._key("pending", product_id)],
+            args=[db_stock],
+        )
+        logger.info(f"Seeded hot inventory for product {product_id}: {stock} units")
+        return stock
+
+
+# Global hot inventory instance
+hot_inventory = HotInventoryService()
@@ -1,15 +1,19 @@
 """OrderDetail service with foreign key validation and stock management."""
 import logging
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
 from models.order_detail import OrderDetailModel
-from models.product import ProductModel
 from repositories.order_detail_repository import OrderDetailRepository
 from repositories.order_repository import OrderRepository
 from repositories.product_repository import ProductRepository
 from repositories.base_repository_impl import InstanceNotFoundError
 from schemas.order_detail_schema import OrderDetailSchema
 from services.base_service_impl import BaseServiceImpl
+from services.inventory_service import hot_inventory
+from services.order_history_service import OrderHistoryService
+from services.unit_of_work import transactional
 from utils.logging_utils import get_sanitized_logger
 
 logger = get_sanitized_logger(__name__)
@@ -27,14 +31,20 @@ class OrderDetailService(BaseServiceImpl):
         )
         self._order_repository = OrderRepository(db)
         self._product_repository = ProductRepository(db)
+        self._history = OrderHistoryService(db)
 
+    @transactional
     def save(self, schema: OrderDetailSchema) -> OrderDetailSchema:
         """
         Create a new order detail with validation and atomic stock management
 
-        This method uses pessimistic locking (SELECT FOR UPDATE) to prevent
-        race conditions when multiple requests try to purchase the same product
-        simultaneously.
+        Stock is reserved with a single conditional UPDATE ... RETURNING
+        (see ProductRepository.decrement_stock) instead of SELECT FOR UPDATE
+        plus Python-side checks, so the product row is locked only from that
+        statement to the commit of the new detail. Hot products (see
+        HotInventoryService) are reserved in Redis instead and confirmed
+        once the detail is committed. The order total is increased by
+        price * quantity in the same transaction.
 
         Args:
             schema: Order detail data to create
@@ -45,88 +55,80 @@ class OrderDetailService(BaseServiceImpl):
         Raises:
             InstanceNotFoundError: If order or product doesn't exist
             ValueError: If stock is insufficient or validation fails
+            HotInventoryUnavailableError: If the product is hot and Redis is down
         """
-        from sqlalchemy import select
-
-        # Validate order exists
+        # Validate order exists (before any product row is locked)
         try:
-            self._order_repository.find(schema.order_id)
+            owner_email = self._order_repository.owner_email(schema.order_id)
         except InstanceNotFoundError:
-            logger.error(f"Order with id {schema.order_id} not found")
+            logger.error("Order with id %s not found", schema.order_id)
             raise InstanceNotFoundError(f"Order with id {schema.order_id} not found")
 
-        # Use pessimistic locking to prevent race conditions
-        # SELECT FOR UPDATE locks the row until transaction completes
+        session = self._product_repository.session
+        reservation = None
         try:
-            stmt = select(ProductModel).where(
-                ProductModel.id_key == schema.product_id
-            ).with_for_update()
-
-            product_model = self._product_repository.session.execute(stmt).scalar_one_or_none()
-
-            if product_model is None:
-                logger.error(f"Product with id {schema.product_id} not found")
-                raise InstanceNotFoundError(f"Product with id {schema.product_id} not found")
-
-            # Validate stock availability (now with exclusive lock)
-            if product_model.stock < schema.quantity:
-                logger.error(
-                    f"Insufficient stock for product {schema.product_id}: "
-                    f"requested {schema.quantity}, available {product_model.stock}"
-                )
-                raise ValueError(
-                    f"Insufficient stock for product {schema.product_id}. "
-                    f"Requested: {schema.quantity}, Available: {product_model.stock}"
+            if hot_inventory.is_hot(schema.product_id):
+                price = self._product_repository.find(schema.product_id, fields=("price",)).price
+                reservation = hot_inventory.reserve(session, schema.product_id, schema.quantity)
+                remaining = reservation.remaining
+            else:
+                price, remaining = self._product_repository.decrement_stock(
+                    schema.product_id, schema.quantity
                 )
 
             # Set price from product if not provided
             if schema.price is None:
-                schema.price = product_model.price
-                logger.info(f"Using product price: {product_model.price}")
+                schema.price = price
+                logger.info("Using product price: %s", price)
 
             # Validate price matches product price (prevent price manipulation)
-            if abs(schema.price - product_model.price) > 0.01:
+            if abs(schema.price - price) > 0.01:
                 logger.warning(
-                    f"Price mismatch for product {schema.product_id}: "
-                    f"schema={schema.price}, product={product_model.price}"
+                    "Price mismatch for product %s: schema=%s, product=%s",
+                    schema.product_id, schema.price, price,
                 )
                 raise ValueError(
-                    f"Price mismatch. Expected {product_model.price}, got {schema.price}"
+                    f"Price mismatch. Expected {price}, got {schema.price}"
                 )
 
-            # Atomically deduct stock and create order detail in same transaction
-            product_model.stock -= schema.quantity
-            logger.info(
-                f"Stock deducted for product {schema.product_id}: "
-                f"new stock = {product_model.stock}"
-            )
-
-            # Create order detail (same transaction)
-            logger.info(f"Creating order detail for order {schema.order_id}")
-            result = super().save(schema)
+            logger.info("Stock deducted for product %s: new stock = %s", schema.product_id, remaining)
 
-            # Both operations commit together automatically
-            # If either fails, both rollback
-            logger.info(
-                f"Order detail created successfully with atomic stock update"
-            )
+            self._order_repository.adjust_total(schema.order_id, schema.price * schema.quantity)
 
-            return result
+            # Stock decrement, order total and order detail commit together
+            logger.info("Creating order detail for order %s", schema.order_id)
+            result = super().save(schema)
 
-        except InstanceNotFoundError:
-            raise
-        except ValueError:
+        except (InstanceNotFoundError, ValueError) as e:
+            session.rollback()
+            self._release(reservation)
+            logger.error("Order detail rejected for product %s: %s", schema.product_id, e)
             raise
         except Exception as e:
-            logger.error(f"Error creating order detail: {e}")
+            session.rollback()
+            self._release(reservation)
+            logger.error("Error creating order detail: %s", e)
             raise
 
+        if reservation is not None:
+            hot_inventory.confirm(reservation)
+        self._history.invalidate_emails([owner_email])
+        return result
+
+    @transactional
     def update(self, id_key: int, schema: OrderDetailSchema) -> OrderDetailSchema:
         """
         Update an order detail with validation and atomic stock management
 
-        This method uses pessimistic locking (SELECT FOR UPDATE) to prevent
-        race conditions when updating quantities concurrently.
+        The order detail row is locked (its current quantity must not change
+        underneath us); the product stock is adjusted by the quantity
+        difference with a single conditional UPDATE and the order total by
+        the line amount difference. Moving the line to another product
+        restores its units to the old product and takes the full quantity
+        from the new one, locking both rows in ascending product id order
+        (as in OrderService.checkout). A new price must match the product
+        price (as in save); a moved line without a price takes the new
+        product's price.
 
         Args:
             id_key: Order detail ID
@@ -139,74 +141,91 @@ class OrderDetailService(BaseServiceImpl):
             InstanceNotFoundError: If order detail, order, or product doesn't exist
             ValueError: If validation fails or insufficient stock
         """
-        from sqlalchemy import select
-
-        # Get existing order detail to restore stock if quantity changes
-        existing = self._repository.find(id_key)
-
         # Validate order exists if being updated
+        owner_email = None
         if schema.order_id is not None:
             try:
-                self._order_repository.find(schema.order_id)
+                owner_email = self._order_repository.owner_email(schema.order_id)
             except InstanceNotFoundError:
-                logger.error(f"Order with id {schema.order_id} not found")
+                logger.error("Order with id %s not found", schema.order_id)
                 raise InstanceNotFoundError(f"Order with id {schema.order_id} not found")
 
-        # Validate product and handle stock changes with pessimistic locking
-        if schema.product_id is not None or schema.quantity is not None:
+        session = self._repository.session
+        reservation = None
+        restocks = []
+        try:
+            existing = self._lock_detail(id_key)
+            previous_owner = self._owner_email(existing)
             product_id = schema.product_id if schema.product_id is not None else existing.product_id
-
-            # 🔒 Use SELECT FOR UPDATE to lock the product row
-            try:
-                stmt = select(ProductModel).where(
-                    ProductModel.id_key == product_id
-                ).with_for_update()
-
-                product_model = self._product_repository.session.execute(stmt).scalar_one_or_none()
-
-                if product_model is None:
-                    logger.error(f"Product with id {product_id} not found")
-                    raise InstanceNotFoundError(f"Product with id {product_id} not found")
-
-                # If quantity is changing, adjust stock atomically
-                if schema.quantity is not None and schema.quantity != existing.quantity:
-                    quantity_diff = schema.quantity - existing.quantity
-
-                    # Check if we have enough stock for increase (with exclusive lock)
-                    if quantity_diff > 0 and product_model.stock < quantity_diff:
-                        logger.error(
-                            f"Insufficient stock for product {product_id}: "
-                            f"requested additional {quantity_diff}, available {product_model.stock}"
-                        )
-                        raise ValueError(
-                            f"Insufficient stock for product {product_id}. "
-                            f"Requested additional: {quantity_diff}, Available: {product_model.stock}"
-                        )
-
-                    # Update stock atomically (same transaction with lock)
-                    product_model.stock -= quantity_diff
+            quantity = schema.quantity if schema.quantity is not None else existing.quantity
+
+            if schema.price is not None or product_id != existing.product_id:
+                self._check_price(product_id, schema)
+
+            # Units to take (> 0) or give back (< 0) per product: a line
+            # moved to another product returns all of its units to the old
+            # product and takes the full quantity from the new one
+            changes = {existing.product_id: -existing.quantity}
+            changes[product_id] = changes.get(product_id, 0) + quantity
+
+            # Lock products in ascending id order, as checkout does
+            for changed_id in sorted(changes):
+                change = changes[changed_id]
+                hot = hot_inventory.is_hot(changed_id)
+                if change > 0 and hot:
+                    reservation = hot_inventory.reserve(session, changed_id, change)
+                    remaining = reservation.remaining
+                elif change > 0:
+                    _, remaining = self._product_repository.decrement_stock(changed_id, change)
+                elif change < 0 and hot:
+                    # Units go back to the Redis counter once the update is committed
+                    self._product_repository.find(changed_id, fields=("id_key",))
+                    restocks.append((changed_id, -change))
+                    remaining = None
+                elif change < 0:
+                    remaining = self._product_repository.increment_stock(changed_id, -change)
+                else:
+                    # Quantity unchanged: only validate the product exists
+                    self._product_repository.find(changed_id, fields=("id_key",))
+                    remaining = None
+
+                if remaining is not None:
                     logger.info(
-                        f"Stock adjusted for product {product_id}: "
-                        f"change = {-quantity_diff}, new stock = {product_model.stock}"
+                        "Stock adjusted for product %s: change = %s, new stock = %s",
+                        changed_id, -change, remaining,
                     )
 
-            except InstanceNotFoundError:
-                raise
-            except ValueError:
-                raise
-            except Exception as e:
-                logger.error(f"Error updating stock for product {product_id}: {e}")
-                raise
+            self._adjust_order_totals(existing, schema)
 
-        logger.info(f"Updating order detail {id_key}")
-        return super().update(id_key, schema)
+            logger.info("Updating order detail %s", id_key)
+            result = super().update(id_key, schema)
 
+        except (InstanceNotFoundError, ValueError) as e:
+            session.rollback()
+            self._release(reservation)
+            logger.error("Order detail %s update rejected: %s", id_key, e)
+            raise
+        except Exception as e:
+            session.rollback()
+            self._release(reservation)
+            logger.error("Error updating stock for order detail %s: %s", id_key, e)
+            raise
+
+        if reservation is not None:
+            hot_inventory.confirm(reservation)
+        for restocked_id, units in restocks:
+            hot_inventory.restock(restocked_id, units)
+        self._history.invalidate_emails([previous_owner, owner_email])
+        return result
+
+    @transactional
     def delete(self, id_key: int) -> None:
         """
         Delete an order detail and restore stock atomically
 
-        This method uses pessimistic locking (SELECT FOR UPDATE) to prevent
-        race conditions when restoring stock during concurrent deletes.
+        The order detail row is locked so concurrent deletes cannot restore
+        its stock twice; stock is restored with UPDATE ... RETURNING and
+        the line amount is subtracted from the order total.
 
         Args:
             id_key: Order detail ID to delete
@@ -214,42 +233,108 @@ class OrderDetailService(BaseServiceImpl):
         Raises:
             InstanceNotFoundError: If order detail or product doesn't exist
         """
-        from sqlalchemy import select
-
-        # Get order detail to restore stock
-        order_detail = self._repository.find(id_key)
-
-        # 🔒 Use SELECT FOR UPDATE to lock the product row before restoring stock
+        session = self._repository.session
         try:
-            stmt = select(ProductModel).where(
-                ProductModel.id_key == order_detail.product_id
-            ).with_for_update()
-
-            product_model = self._product_repository.session.execute(stmt).scalar_one_or_none()
-
-            if product_model is None:
-                logger.error(f"Product with id {order_detail.product_id} not found")
-                raise InstanceNotFoundError(
-                    f"Product with id {order_detail.product_id} not found"
+            existing = self._lock_detail(id_key)
+            owner_email = self._owner_email(existing)
+            quantity, product_id = existing.quantity, existing.product_id
+            hot = hot_inventory.is_hot(product_id)
+
+            if not hot:
+                stock = self._product_repository.increment_stock(product_id, quantity)
+                logger.info(
+                    "Stock restored for product %s: restored %s, new stock = %s",
+                    product_id, quantity, stock,
                 )
 
-            # Restore stock atomically (same transaction with lock)
-            product_model.stock += order_detail.quantity
+            if existing.order_id is not None:
+                self._order_repository.adjust_total(existing.order_id, -self._line_total(existing))
 
-            logger.info(
-                f"Stock restored for product {order_detail.product_id}: "
-                f"restored {order_detail.quantity}, new stock = {product_model.stock}"
-            )
-
-            # Delete order detail (same transaction)
-            logger.info(f"Deleting order detail {id_key}")
+            # Stock restore, order total and delete commit together
+            logger.info("Deleting order detail %s", id_key)
             super().delete(id_key)
 
-            # Both operations commit together automatically
-            # If either fails, both rollback
-
         except InstanceNotFoundError:
+            session.rollback()
             raise
         except Exception as e:
-            logger.error(f"Error deleting order detail {id_key}: {e}")
-            raise
\ No newline at end of file
+            session.rollback()
+            logger.error("Error deleting order detail %s: %s", id_key, e)
+            raise
+
+        if hot:
+            # Units go back to the Redis counter (and the DB on reconciliation)
+            hot_inventory.restock(product_id, quantity)
+        self._history.invalidate_emails([owner_email])
+
+    @staticmethod
+    def _release(reservation) -> None:
+        """Release a hot-inventory reservation after a failed write (if any)"""
+        if reservation is not None:
+            hot_inventory.release(reservation)
+
+    def _check_price(self, product_id: int, schema: OrderDetailSchema) -> None:
+        """
+        Default a missing price to the product price, reject a mismatching one
+
+        Raises:
+            InstanceNotFoundError: If the product doesn't exist
+            ValueError: If the price differs from the product price
+        """
+        price = self._product_repository.find(product_id, fields=("price",)).price
+        if schema.price is None:
+            schema.price = price
+        elif abs(schema.price - price) > 0.01:
+            logger.warning(
+                "Price mismatch for product %s: schema=%s, product=%s",
+                product_id, schema.price, price,
+            )
+            raise ValueError(f"Price mismatch. Expected {price}, got {schema.price}")
+
+    def _adjust_order_totals(self, existing: OrderDetailModel, schema: OrderDetailSchema) -> None:
+        """Apply an order detail update's line amount change to the order total(s)"""
+        quantity = schema.quantity if schema.quantity is not None else existing.quantity
+        price = schema.price if schema.price is not None else existing.price
+        order_id = schema.order_id if schema.order_id is not None else existing.order_id
+        new_total = (quantity or 0) * (price or 0)
+
+        if order_id == existing.order_id:
+            delta = new_total - self._line_total(existing)
+            if delta and order_id is not None:
+                self._order_repository.adjust_total(order_id, delta)
+            return
+
+        # Line moved to another order
+        if existing.order_id is not None:
+            self._order_repository.adjust_total(existing.order_id, -self._line_total(existing))
+        self._order_repository.adjust_total(order_id, new_total)
+
+    @staticmethod
+    def _line_total(detail: OrderDetailModel) -> float:
+        return (detail.quantity or 0) * (detail.price or 0)
+
+    def _lock_detail(self, id_key: int) -> OrderDetailModel:
+        """
+        Lock an order detail row, loaded with the "order_detail_with_owner_and_product"
+        profile (its order's client gives the owner's email, see _owner_email)
+
+        Raises:
+            InstanceNotFoundError: If the order detail doesn't exist
+        """
+        stmt = (
+            self._repository.select_loaded("order_detail_with_owner_and_product")
+            .where(OrderDetailModel.id_key == id_key)
+            .with_for_update(of=OrderDetailModel)
+        )
+        detail = self._repository.session.scalars(stmt).first()
+        if detail is None:
+            raise InstanceNotFoundError(f"OrderDetailModel with id {id_key} not found")
+        return detail
+
+    @staticmethod
+    def _owner_email(detail: OrderDetailModel) -> Optional[str]:
+        """Email of the client owning a detail loaded by _lock_detail"""
+        order = detail.order
+        if order is None or order.client is None:
+            return None
+        return order.client.email
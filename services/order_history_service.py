@@ -0,0 +1,163 @@
+"""Order history (/orders/me) with cursor pagination and per-user caching."""
+import hashlib
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from config.constants import CacheConfig, PaginationConfig
+from models.client import ClientModel
+from models.order import OrderModel
+from repositories.order_repository import OrderRepository
+from schemas.base_schema import get_list_adapter
+from schemas.order_history_schema import OrderItemPublic, OrderPublic
+from services.cache_service import cache_service
+from utils.cursor import decode_cursor, encode_cursor
+from utils.logging_utils import get_sanitized_logger
+from utils.tracing import traced_service
+
+logger = get_sanitized_logger(__name__)
+
+
+@traced_service
+class OrderHistoryService:
+    """
+    Read a user's orders newest first, one page at a time
+
+    Pages are fetched with the "order_with_details_and_products" loading
+    profile: the page of orders (keyset on (date, id_key) descending),
+    then all their lines and products in one IN query.
+    Pages are cached in one hash per user and dropped with a single DEL
+    whenever one of the user's orders or order details is written. Writers
+    pass the owner's email, read by queries they run anyway (see
+    OrderRepository.owner_email), so invalidation adds no query.
+    """
+
+    cache_prefix = "order_history"
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.cache = cache_service
+        self._orders = OrderRepository(db)
+
+    def get_page(self, email: str, cursor: Optional[str] = None,
+                 limit: int = PaginationConfig.HISTORY_DEFAULT_LIMIT) -> Tuple[List[OrderPublic], Optional[str]]:
+        """
+        Get one page of a user's order history
+
+        Cache: hash order_history:{email digest}, field cursor:{cursor}:limit:{limit}
+        TTL: CacheConfig.ORDER_HISTORY_TTL (whole hash)
+
+        Args:
+            email: The user's email (orders are matched through their client)
+            cursor: Cursor from the previous page (None for the first page)
+            limit: Orders per page
+
+        Returns:
+            Tuple of (orders, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor, datetime, int) if cursor else None
+        cache_key = self._user_key(email)
+        field = f"cursor:{cursor or ''}:limit:{limit}"
+
+        cached = self.cache.get_field(cache_key, field)
+        if cached is not None:
+            logger.debug("Cache HIT: %s %s", cache_key, field)
+            return get_list_adapter(OrderPublic).validate_python(cached["orders"]), cached["next_cursor"]
+
+        logger.debug("Cache MISS: %s %s", cache_key, field)
+        orders, next_cursor = self._fetch_page(email, after, limit)
+        self.cache.set_field(
+            cache_key,
+            field,
+            {
+                "orders": get_list_adapter(OrderPublic).dump_python(orders, mode="json"),
+                "next_cursor": next_cursor,
+            },
+            ttl=CacheConfig.ORDER_HISTORY_TTL,
+        )
+        return orders, next_cursor
+
+    def _fetch_page(self, email: str, after: Optional[tuple],
+                    limit: int) -> Tuple[List[OrderPublic], Optional[str]]:
+        # One page of orders (only orders with at least one line), their
+        # lines and products loaded by the profile in one more IN query
+        stmt = (
+            self._orders.select_loaded("order_with_details_and_products")
+            .join(ClientModel, OrderModel.client_id == ClientModel.id_key)
+            .where(ClientModel.email == email, OrderModel.order_details.any())
+            .order_by(OrderModel.date.desc(), OrderModel.id_key.desc())
+            .limit(limit + 1)
+        )
+        if after is not None:
+            after_date, after_id = after
+            stmt = stmt.where(or_(
+                OrderModel.date < after_date,
+                and_(OrderModel.date == after_date, OrderModel.id_key < after_id),
+            ))
+        rows = self.db.scalars(stmt).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].date, rows[-1].id_key)
+
+        orders = [
+            OrderPublic(
+                id_key=order.id_key,
+                date=order.date,
+                total=order.total,
+                status=str(order.status) if order.status else None,
+                items=[
+                    OrderItemPublic(
+                        product_id=line.product_id,
+                        name=line.product.name if line.product is not None else None,
+                        quantity=int(line.quantity or 0),
+                        unit_price=float(line.price or 0),
+                    )
+                    for line in sorted(order.order_details, key=lambda line: line.id_key)
+                ],
+            )
+            for order in rows
+        ]
+        return orders, next_cursor
+
+    def emails_for(self, order_ids: Iterable[int] = (), client_ids: Iterable[int] = ()) -> List[str]:
+        """
+        Get the emails whose history shows the given orders/clients
+
+        One query, for writers that do not read the owner anyway (admin
+        order updates and deletes). Returns an empty list without querying
+        when the cache is unavailable.
+        """
+        order_ids = [i for i in order_ids if i is not None]
+        client_ids = [i for i in client_ids if i is not None]
+        if not self.cache.is_available() or not (order_ids or client_ids):
+            return []
+
+        stmt = (
+            select(ClientModel.email)
+            .outerjoin(OrderModel, OrderModel.client_id == ClientModel.id_key)
+            .where(or_(ClientModel.id_key.in_(client_ids), OrderModel.id_key.in_(order_ids)))
+            .distinct()
+        )
+        return [email for email in self.db.execute(stmt).scalars() if email]
+
+    def invalidate_emails(self, emails: Iterable[Optional[str]]) -> None:
+        """Drop every cached history page of the given users (one DEL)"""
+        keys = [self._user_key(email) for email in set(emails) if email]
+        deleted = self.cache.delete_many(keys)
+        logger.debug("Invalidated the order history of %s users", deleted)
+
+    def invalidate_all(self) -> None:
+        """Drop every cached history page (bulk order changes, off the request path)"""
+        self.cache.delete_pattern(f"{self.cache_prefix}:*")
+
+    def _user_key(self, email: str) -> str:
+        # Hashed so cache keys carry no personal data
+        digest = hashlib.sha256(email.encode()).hexdigest()[:16]
+        return f"{self.cache_prefix}:{digest}"
@@ -2,14 +2,23 @@
 import logging
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Optional
 
+from models.bill import BillModel
+from models.enums import Status
 from models.order import OrderModel
+from models.order_detail import OrderDetailModel
 from repositories.order_repository import OrderRepository
 from repositories.client_repository import ClientRepository
 from repositories.bill_repository import BillRepository
+from repositories.product_repository import ProductRepository
 from repositories.base_repository_impl import InstanceNotFoundError
+from schemas.checkout_schema import CheckoutLine, CheckoutRequest, CheckoutResponse
 from schemas.order_schema import OrderSchema
 from services.base_service_impl import BaseServiceImpl
+from services.inventory_service import hot_inventory
+from services.order_history_service import OrderHistoryService
+from services.unit_of_work import transactional
 from utils.logging_utils import get_sanitized_logger
 
 logger = get_sanitized_logger(__name__)
@@ -27,11 +36,17 @@ class OrderService(BaseServiceImpl):
         )
         self._client_repository = ClientRepository(db)
         self._bill_repository = BillRepository(db)
+        self._product_repository = ProductRepository(db)
+        self._history = OrderHistoryService(db)
 
     def save(self, schema: OrderSchema) -> OrderSchema:
         """
         Create a new order with validation
 
+        The order starts with a total of 0: totals are maintained by the
+        server from the order details (OrderDetailService, repair_totals),
+        so a client-supplied total is ignored.
+
         Args:
             schema: Order data to create
 
@@ -42,32 +57,25 @@ class OrderService(BaseServiceImpl):
             InstanceNotFoundError: If client or bill doesn't exist
             ValueError: If validation fails
         """
-        # Validate client exists
-        try:
-            self._client_repository.find(schema.client_id)
-        except InstanceNotFoundError:
-            logger.error(f"Client with id {schema.client_id} not found")
-            raise InstanceNotFoundError(f"Client with id {schema.client_id} not found")
-
-        # Validate bill exists
-        try:
-            self._bill_repository.find(schema.bill_id)
-        except InstanceNotFoundError:
-            logger.error(f"Bill with id {schema.bill_id} not found")
-            raise InstanceNotFoundError(f"Bill with id {schema.bill_id} not found")
+        client_email = self._validate_references(schema.client_id, schema.bill_id)
 
         # Ensure date is persisted even if not explicitly provided
-        data = schema.model_dump(exclude_unset=True)
+        data = schema.model_dump(exclude_unset=True, exclude={"total"})
+        data["total"] = 0.0
         if not data.get("date"):
             data["date"] = datetime.utcnow()
 
         logger.info(f"Creating order for client {schema.client_id}")
-        return self.repository.save(OrderModel(**data))
+        order = self.repository.save(OrderModel(**data))
+        self._history.invalidate_emails([client_email])
+        return order
 
     def update(self, id_key: int, schema: OrderSchema) -> OrderSchema:
         """
         Update an order with validation
 
+        The total is not writable: it only changes with the order details.
+
         Args:
             id_key: Order ID
             schema: Updated order data
@@ -94,5 +102,172 @@ class OrderService(BaseServiceImpl):
                 logger.error(f"Bill with id {schema.bill_id} not found")
                 raise InstanceNotFoundError(f"Bill with id {schema.bill_id} not found")
 
+        # The order may move to another client: drop both users' history
+        emails = self._history.emails_for(order_ids=[id_key], client_ids=[schema.client_id])
+
         logger.info(f"Updating order {id_key}")
-        return super().update(id_key, schema)
+        order = self.repository.update(id_key, schema.model_dump(exclude_unset=True, exclude={"total"}))
+        self._history.invalidate_emails(emails)
+        return order
+
+    def delete(self, id_key: int) -> None:
+        """
+        Delete an order and drop its owner's cached order history
+
+        Args:
+            id_key: Order ID to delete
+
+        Raises:
+            InstanceNotFoundError: If the order doesn't exist
+        """
+        emails = self._history.emails_for(order_ids=[id_key])
+        super().delete(id_key)
+        self._history.invalidate_emails(emails)
+
+    def _validate_references(self, client_id: int, bill_id: int) -> Optional[str]:
+        """
+        Check that an order's client and bill exist, and get the client's email
+
+        The bill is read with the "bill_with_client" loading profile: when
+        the bill belongs to the order's client (the usual case), one query
+        validates both.
+
+        Raises:
+            InstanceNotFoundError: If the client or the bill doesn't exist
+        """
+        bill = self._bill_repository.session.scalars(
+            self._bill_repository.select_loaded("bill_with_client").where(BillModel.id_key == bill_id)
+        ).first()
+        if bill is None:
+            logger.error("Bill with id %s not found", bill_id)
+            raise InstanceNotFoundError(f"Bill with id {bill_id} not found")
+        if bill.client_id == client_id and bill.client is not None:
+            return bill.client.email
+
+        try:
+            return self._client_repository.find(client_id, fields=("id_key", "email")).email
+        except InstanceNotFoundError:
+            logger.error("Client with id %s not found", client_id)
+            raise InstanceNotFoundError(f"Client with id {client_id} not found")
+
+    def repair_totals(self, batch_size: int = 1000) -> int:
+        """
+        Recompute every order total from its details, one committed batch at a time
+
+        Totals are maintained incrementally by OrderDetailService; this job
+        fixes orders written before that (or by hand) without holding locks
+        on the whole table.
+
+        Args:
+            batch_size: Orders per UPDATE/commit
+
+        Returns:
+            Number of totals corrected
+        """
+        corrected, last_id = 0, 0
+        session = self.repository.session
+        while True:
+            try:
+                batch_corrected, last_id = self.repository.recompute_totals(last_id, batch_size)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error repairing order totals after id {last_id}: {e}")
+                raise
+            if last_id is None:
+                break
+            corrected += batch_corrected
+            logger.info(f"Repaired order totals up to id {last_id} ({corrected} corrected)")
+
+        if corrected:
+            self._history.invalidate_all()
+        return corrected
+
+    @transactional
+    def checkout(self, request: CheckoutRequest) -> CheckoutResponse:
+        """
+        Create an order and all its details in a single transaction
+
+        Stock is reserved with one conditional UPDATE per product, always in
+        ascending product id order: overlapping carts lock rows in the same
+        order and cannot deadlock. Unit prices come from the UPDATE's
+        RETURNING clause and the order total is computed here, never taken
+        from the client. Any failure rolls back every reservation, so no
+        partial order is left behind. Hot products are reserved in Redis
+        (no row lock) and confirmed only after the commit.
+
+        Args:
+            request: Client, bill, delivery method and cart lines
+
+        Returns:
+            The created order and its lines
+
+        Raises:
+            InstanceNotFoundError: If the client, bill or a product doesn't exist
+            ValueError: If a product has insufficient stock
+            HotInventoryUnavailableError: If the cart has a hot product and Redis is down
+        """
+        # Validate references before any product row is locked
+        client_email = self._validate_references(request.client_id, request.bill_id)
+
+        # Merge repeated products, then lock in a global (sorted) order
+        quantities = {}
+        for item in request.items:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+
+        session = self.repository.session
+        reservations = []
+        try:
+            details = []
+            total = 0.0
+            for product_id in sorted(quantities):
+                quantity = quantities[product_id]
+                if hot_inventory.is_hot(product_id):
+                    price = self._product_repository.find(product_id, fields=("price",)).price
+                    reservations.append(hot_inventory.reserve(session, product_id, quantity))
+                else:
+                    price, _ = self._product_repository.decrement_stock(product_id, quantity)
+                total += price * quantity
+                details.append(OrderDetailModel(product_id=product_id, quantity=quantity, price=price))
+
+            order = OrderModel(
+                date=datetime.utcnow(),
+                total=round(total, 2),
+                delivery_method=request.delivery_method,
+                status=Status.PENDING,
+                client_id=request.client_id,
+                bill_id=request.bill_id,
+            )
+            order.order_details = details
+            session.add(order)
+            session.flush()
+
+            # Build the response before commit expires the instances
+            response = CheckoutResponse(
+                order=OrderSchema.model_validate(order),
+                items=[CheckoutLine.model_validate(detail, from_attributes=True) for detail in details],
+            )
+            session.commit()
+
+        except (InstanceNotFoundError, ValueError) as e:
+            session.rollback()
+            for reservation in reservations:
+                hot_inventory.release(reservation)
+            logger.error(f"Checkout rejected for client {request.client_id}: {e}")
+            raise
+        except Exception as e:
+            session.rollback()
+            for reservation in reservations:
+                hot_inventory.release(reservation)
+            logger.error(f"Error during checkout for client {request.client_id}: {e}")
+            raise
+
+        for reservation in reservations:
+            hot_inventory.confirm(reservation)
+        self._history.invalidate_emails([client_email])
+
+        logger.info(
+            f"Checkout created order {response.order.id_key} with {len(details)} lines, "
+            f"total {response.order.total}"
+        )
+        return response
@@ -0,0 +1,144 @@
+"""
+Password Hasher Module
+
+Runs bcrypt hashing and verification in a dedicated, bounded process pool
+instead of the request worker. Each call costs ~250ms of CPU at the default
+cost, so a login or registration burst used to starve every other request
+served by the same worker.
+
+At most PasswordHashConfig.MAX_PENDING operations may be queued or running
+at once; beyond that PasswordHasherBusyError is raised (503) instead of
+letting the backlog, and the request threads waiting on it, grow.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from config.constants import PasswordHashConfig
+from utils.logging_utils import get_sanitized_logger
+from utils.security import hash_password, verify_and_update_password, verify_password
+
+logger = get_sanitized_logger(__name__)
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the password hashing pool is saturated or unavailable"""
+    pass
+
+
+class PasswordHasher:
+    """Bounded process pool for bcrypt (hash / verify / verify-and-upgrade)"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Initialize the hasher (the pool itself is started on first use)
+
+        Args:
+            max_workers: Worker processes (default PasswordHashConfig.WORKERS)
+            max_pending: Queued + running operations allowed before rejecting
+            timeout: Seconds to wait for a result before giving up
+            executor: Executor to use instead of the process pool (tests)
+        """
+        self.max_workers = max_workers or PasswordHashConfig.WORKERS
+        self.max_pending = max_pending or PasswordHashConfig.MAX_PENDING
+        self.timeout = timeout or PasswordHashConfig.TIMEOUT
+        self._executor = executor
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Operations currently queued or running"""
+        return self._pending
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured bcrypt cost"""
+        return self._run(hash_password, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against a stored hash"""
+        return self._run(verify_password, password, hashed_password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password and upgrade its hash if the bcrypt cost changed
+
+        Returns:
+            (valid, new_hash) - new_hash is None unless the caller should store it
+        """
+        return self._run(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (restarted lazily on the next call)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, func, *args):
+        """
+        Run func(*args) in the pool and wait for its result
+
+        Raises:
+            PasswordHasherBusyError: If the queue is full, the pool broke or the call timed out
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning("Password hashing pool saturated (%s pending)", self._pending)
+                raise PasswordHasherBusyError("Too many authentication requests, try again shortly")
+            self._pending += 1
+            executor = self._get_executor()
+
+        try:
+            future = executor.submit(func, *args)
+        except BrokenProcessPool:
+            self._release()
+            raise self._discard(executor)
+        except BaseException:
+            self._release()
+            raise
+        else:
+            future.add_done_callback(lambda _: self._release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            raise self._discard(executor)
+        except FutureTimeoutError:
+            logger.warning("Password hashing timed out after %ss", self.timeout)
+            raise PasswordHasherBusyError("Authentication timed out, try again shortly")
+
+    def _get_executor(self) -> Executor:
+        # Called with the lock held. Spawned workers start clean instead of
+        # forking the server's threads, DB pool and Redis sockets.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("Started password hashing pool with %s workers", self.max_workers)
+        return self._executor
+
+    def _discard(self, executor: Executor) -> PasswordHasherBusyError:
+        """Drop a broken pool so the next call starts a new one; returns the error to raise"""
+        logger.error("Password hashing pool broke, restarting it on the next call")
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        return PasswordHasherBusyError("Authentication temporarily unavailable")
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher()
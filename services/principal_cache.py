@@ -0,0 +1,75 @@
+"""
+Principal Cache Module
+
+Caches the authenticated user (UserPublic) resolved by get_current_user so
+authenticated requests skip the users table lookup. A user's principals live
+in one hash (auth:principal:{user_id}) with one field per bearer token
+digest, so changing the user (profile update, deactivation) drops all of
+them with a single DEL. The hash lives for CacheConfig.PRINCIPAL_TTL seconds
+at most and never past the expiry of the token written last; each field
+also carries its own token's expiry, so a later write renewing the hash
+never lets an older token's entry outlive that token.
+"""
+import hashlib
+import time
+from typing import Optional
+
+from config.constants import CacheConfig
+from schemas.auth_schema import UserPublic
+from services.cache_service import cache_service
+from utils.logging_utils import get_sanitized_logger
+
+logger = get_sanitized_logger(__name__)
+
+
+class PrincipalCache:
+    """Redis cache of authenticated principals (no-op when Redis is down)"""
+
+    cache_prefix = "auth:principal"
+
+    def __init__(self, cache=None):
+        self.cache = cache or cache_service
+
+    def get(self, user_id: int, token: str) -> Optional[UserPublic]:
+        """Get the cached principal for a user and token, if any"""
+        cached = self.cache.get_field(self._key(user_id), self._field(token))
+        if cached is None:
+            return None
+        if cached["expires_at"] is not None and cached["expires_at"] <= time.time():
+            return None
+        return UserPublic.model_validate(cached["principal"])
+
+    def set(self, user_id: int, token: str, principal: UserPublic, expires_at: Optional[float] = None) -> None:
+        """
+        Cache a principal
+
+        Args:
+            user_id: Authenticated user ID (the token's subject)
+            token: Bearer token the principal was resolved from
+            principal: The user to cache
+            expires_at: Token expiry (epoch seconds); the entry never outlives it
+        """
+        ttl = CacheConfig.PRINCIPAL_TTL
+        if expires_at is not None:
+            ttl = min(ttl, int(expires_at - time.time()))
+        if ttl <= 0:
+            return
+        entry = {"principal": principal.model_dump(mode="json"), "expires_at": expires_at}
+        self.cache.set_field(self._key(user_id), self._field(token), entry, ttl=ttl)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every cached principal of a user (all of their tokens)"""
+        self.cache.delete(self._key(user_id))
+        logger.debug("Invalidated cached principals for user %s", user_id)
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.cache_prefix}:{user_id}"
+
+    @staticmethod
+    def _field(token: str) -> str:
+        # The token itself is a credential: only its digest goes into Redis
+        return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
@@ -1,13 +1,16 @@
 """Product service with Redis caching integration and sanitized logging."""
 import logging
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from models.product import ProductModel
 from repositories.product_repository import ProductRepository
 from schemas.product_schema import ProductSchema
 from services.base_service_impl import BaseServiceImpl
+from schemas.base_schema import get_list_adapter
 from services.cache_service import cache_service
+from services.inventory_service import hot_inventory
 from utils.logging_utils import get_sanitized_logger
 
 logger = get_sanitized_logger(__name__)  # P11: Sanitized logging
@@ -26,31 +29,37 @@ class ProductService(BaseServiceImpl):
         self.cache = cache_service
         self.cache_prefix = "products"
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[ProductSchema]:
+    def get_all(self, skip: int = 0, limit: int = 100,
+                fields: Optional[Iterable[str]] = None) -> List[ProductSchema]:
         """
         Get all products with caching
 
         Cache key pattern: products:list:skip:{skip}:limit:{limit}
+        With a sparse fieldset: products:list:fields:{a,b}:limit:{limit}:skip:{skip}
         TTL: 5 minutes (default REDIS_CACHE_TTL)
         """
-        # Build cache key
+        fields = self.repository.resolve_fields(fields)
+        schema = self.repository.schema_for(fields)
+
+        # Build cache key (the field set is part of the key)
         cache_key = self.cache.build_key(
             self.cache_prefix,
             "list",
             skip=skip,
-            limit=limit
+            limit=limit,
+            **({"fields": ",".join(fields)} if fields else {})
         )
 
         # Try to get from cache
         cached_products = self.cache.get(cache_key)
         if cached_products is not None:
-            logger.debug(f"Cache HIT: {cache_key}")
-            # Convert dict list back to ProductSchema list
-            return [ProductSchema(**p) for p in cached_products]
+            logger.debug("Cache HIT: %s", cache_key)
+            # Convert dict list back to ProductSchema list in one bulk validation
+            return get_list_adapter(schema).validate_python(cached_products)
 
         # Cache miss - get from database
-        logger.debug(f"Cache MISS: {cache_key}")
-        products = super().get_all(skip, limit)
+        logger.debug("Cache MISS: %s", cache_key)
+        products = super().get_all(skip, limit, fields=fields)
 
         # Cache the result (convert to dict for JSON serialization)
         products_dict = [p.model_dump() for p in products]
@@ -58,30 +67,65 @@ class ProductService(BaseServiceImpl):
 
         return products
 
-    def get_one(self, id_key: int) -> ProductSchema:
+    def get_one(self, id_key: int, fields: Optional[Iterable[str]] = None) -> ProductSchema:
         """
         Get single product by ID with caching
 
-        Cache key pattern: products:id:{id_key}
+        Cache: hash products:id:{id_key}, one field per field set
+        ("all", or the sparse fieldset "a,b"), dropped together on writes
         TTL: 5 minutes
         """
-        cache_key = self.cache.build_key(self.cache_prefix, "id", id=id_key)
+        fields = self.repository.resolve_fields(fields)
+        schema = self.repository.schema_for(fields)
+        cache_key = self._item_key(id_key)
+        variant = self._variant(fields)
 
         # Try cache first
-        cached_product = self.cache.get(cache_key)
+        cached_product = self.cache.get_field(cache_key, variant)
         if cached_product is not None:
-            logger.debug(f"Cache HIT: {cache_key}")
-            return ProductSchema(**cached_product)
+            logger.debug("Cache HIT: %s %s", cache_key, variant)
+            return schema(**cached_product)
 
         # Get from database
-        logger.debug(f"Cache MISS: {cache_key}")
-        product = super().get_one(id_key)
+        logger.debug("Cache MISS: %s %s", cache_key, variant)
+        product = super().get_one(id_key, fields=fields)
 
         # Cache the result
-        self.cache.set(cache_key, product.model_dump())
+        self.cache.set_field(cache_key, variant, product.model_dump())
 
         return product
 
+    def get_many(self, ids: List[int], fields: Optional[Iterable[str]] = None) -> List[ProductSchema]:
+        """
+        Get several products by ID, reusing the per-product cache
+
+        Cached products are read in one pipelined round trip (same hashes
+        and fields as get_one); only the misses hit the database, in one
+        IN (...) query, and are written back to the cache.
+        """
+        fields = self.repository.resolve_fields(fields)
+        schema = self.repository.schema_for(fields)
+        ids = list(dict.fromkeys(ids))
+        variant = self._variant(fields)
+        key_fields = [(self._item_key(id_key), variant) for id_key in ids]
+
+        found = {}
+        for id_key, cached in zip(ids, self.cache.get_field_many(key_fields)):
+            if cached is not None:
+                found[id_key] = schema(**cached)
+
+        missing = [id_key for id_key in ids if id_key not in found]
+        logger.debug("Batch cache: %s hits, %s misses", len(found), len(missing))
+        if missing:
+            products = super().get_many(missing, fields=fields)
+            found.update((p.id_key, p) for p in products)
+            self.cache.set_field_many({
+                (self._item_key(p.id_key), variant): p.model_dump()
+                for p in products
+            })
+
+        return [found[id_key] for id_key in ids if id_key in found]
+
     def save(self, schema: ProductSchema) -> ProductSchema:
         """
         Create new product and invalidate list cache
@@ -97,6 +141,10 @@ class ProductService(BaseServiceImpl):
         """
         Update product with transactional cache invalidation
 
+        Stock changes to hot products are applied to their Redis counter as
+        a delta once the update is committed (the old stock is read under
+        the row lock the update takes anyway).
+
         Args:
             id_key: Product ID to update
             schema: Validated ProductSchema with new data
@@ -108,23 +156,29 @@ class ProductService(BaseServiceImpl):
             InstanceNotFoundError: If product doesn't exist
             ValueError: If validation fails
         """
-        # Build cache keys BEFORE update (prepare for invalidation)
-        cache_key = self.cache.build_key(self.cache_prefix, "id", id=id_key)
-
         try:
+            old_stock = None
+            if hot_inventory.is_hot(id_key) and "stock" in schema.model_fields_set:
+                old_stock = self._repository.session.execute(
+                    select(ProductModel.stock).where(ProductModel.id_key == id_key).with_for_update()
+                ).scalar_one_or_none()
+
             # Update in database (atomic transaction)
             product = super().update(id_key, schema)
 
+            if old_stock is not None:
+                hot_inventory.adjust(id_key, product.stock - old_stock)
+
             # Only invalidate cache AFTER successful DB commit
-            self.cache.delete(cache_key)
+            self._invalidate_item_cache(id_key)
             self._invalidate_list_cache()
 
-            logger.info(f"Product {id_key} updated and cache invalidated successfully")
+            logger.info("Product %s updated and cache invalidated successfully", id_key)
             return product
 
         except Exception as e:
             # If update fails, cache remains consistent (no invalidation)
-            logger.error(f"Failed to update product {id_key}: {e}")
+            logger.error("Failed to update product %s: %s", id_key, e)
             raise
 
     def delete(self, id_key: int) -> None:
@@ -147,28 +201,38 @@ class ProductService(BaseServiceImpl):
         has_sales = self._repository.session.scalars(stmt).first()
 
         if has_sales:
-            logger.error(
-                f"Cannot delete product {id_key}: has associated sales history"
-            )
+            logger.error("Cannot delete product %s: has associated sales history", id_key)
             raise ValueError(
                 f"Cannot delete product {id_key}: product has associated sales history. "
                 f"Consider marking as inactive instead of deleting."
             )
 
         # Safe to delete
-        logger.info(f"Deleting product {id_key} (no sales history)")
+        logger.info("Deleting product %s (no sales history)", id_key)
         super().delete(id_key)
 
         # Invalidate specific product cache
-        cache_key = self.cache.build_key(self.cache_prefix, "id", id=id_key)
-        self.cache.delete(cache_key)
+        self._invalidate_item_cache(id_key)
 
         # Invalidate list cache
         self._invalidate_list_cache()
 
+    def _item_key(self, id_key: int) -> str:
+        """Hash holding every cached field set of one product"""
+        return self.cache.build_key(self.cache_prefix, "id", id=id_key)
+
+    @staticmethod
+    def _variant(fields: Optional[tuple]) -> str:
+        """Hash field of a field set ("all" for the full schema)"""
+        return ",".join(fields) if fields else "all"
+
+    def _invalidate_item_cache(self, id_key: int):
+        """Invalidate the full and sparse-fieldset caches of one product (one DEL)"""
+        self.cache.delete(self._item_key(id_key))
+
     def _invalidate_list_cache(self):
         """Invalidate all product list caches"""
         pattern = f"{self.cache_prefix}:list:*"
         deleted_count = self.cache.delete_pattern(pattern)
         if deleted_count > 0:
-            logger.info(f"Invalidated {deleted_count} product list cache entries")
+            logger.info("Invalidated %s product list cache entries", deleted_count)
@@ -0,0 +1,130 @@
+"""Review aggregates (average rating, count, histogram) with Redis caching."""
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from config.constants import CacheConfig
+from models.product_rating_stats import RATING_BUCKETS, rating_bucket
+from repositories.product_rating_stats_repository import ProductRatingStatsRepository
+from schemas.base_schema import get_list_adapter
+from schemas.review_schema import ProductRatingStatsSchema, RatingStats, ReviewSummary
+from services.cache_service import cache_service
+from utils.logging_utils import get_sanitized_logger
+from utils.tracing import traced_service
+
+logger = get_sanitized_logger(__name__)
+
+
+@traced_service
+class RatingStatsService:
+    """
+    Incrementally maintained review aggregates
+
+    Review writes call record_created/record_updated/record_deleted before
+    committing, so product_rating_stats changes in the same transaction as
+    the review; after the commit they call invalidate(). Reads never
+    aggregate the reviews table.
+    """
+
+    cache_prefix = "reviews:stats"
+
+    def __init__(self, db: Session):
+        self.repository = ProductRatingStatsRepository(db)
+        self.cache = cache_service
+
+    def record_created(self, product_id: int, rating: float) -> None:
+        """Add a new review to its product's aggregates (does not commit)"""
+        self.repository.apply_delta(product_id, rating, 1, {rating_bucket(rating): 1})
+
+    def record_updated(self, product_id: int, old_rating: float, new_rating: float) -> None:
+        """Apply a review's rating change (does not commit)"""
+        if old_rating == new_rating:
+            return
+        buckets = {}
+        buckets[rating_bucket(old_rating)] = buckets.get(rating_bucket(old_rating), 0) - 1
+        buckets[rating_bucket(new_rating)] = buckets.get(rating_bucket(new_rating), 0) + 1
+        self.repository.apply_delta(
+            product_id, new_rating - old_rating, 0, {b: d for b, d in buckets.items() if d}
+        )
+
+    def record_deleted(self, product_id: int, rating: float) -> None:
+        """Remove a deleted review from its product's aggregates (does not commit)"""
+        self.repository.apply_delta(product_id, -rating, -1, {rating_bucket(rating): -1})
+
+    def get_summary(self) -> List[ReviewSummary]:
+        """
+        Get average rating and count of every reviewed product
+
+        Cache key: reviews:stats:summary
+        TTL: CacheConfig.REVIEW_STATS_TTL
+        """
+        cache_key = self.cache.build_key(self.cache_prefix, "summary")
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache HIT: %s", cache_key)
+            return get_list_adapter(ReviewSummary).validate_python(cached)
+
+        logger.debug("Cache MISS: %s", cache_key)
+        summary = [
+            ReviewSummary(product_id=stats.product_id, avg_rating=self._average(stats), count=stats.rating_count)
+            for stats in self.repository.find_reviewed()
+        ]
+        self.cache.set(
+            cache_key,
+            get_list_adapter(ReviewSummary).dump_python(summary),
+            ttl=CacheConfig.REVIEW_STATS_TTL,
+        )
+        return summary
+
+    def get_product_stats(self, product_id: int) -> RatingStats:
+        """
+        Get one product's average rating, count and histogram (zeros if unreviewed)
+
+        Cache key: reviews:stats:product:{product_id}
+        TTL: CacheConfig.REVIEW_STATS_TTL
+        """
+        cache_key = self.cache.build_key(self.cache_prefix, "product", product_id)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache HIT: %s", cache_key)
+            return RatingStats.model_validate(cached)
+
+        logger.debug("Cache MISS: %s", cache_key)
+        stats = self.repository.find_by_product(product_id) or ProductRatingStatsSchema(product_id=product_id)
+        result = RatingStats(
+            product_id=product_id,
+            avg_rating=self._average(stats),
+            count=stats.rating_count,
+            histogram={bucket: getattr(stats, f"rating_{bucket}") for bucket in RATING_BUCKETS},
+        )
+        self.cache.set(cache_key, result.model_dump(), ttl=CacheConfig.REVIEW_STATS_TTL)
+        return result
+
+    def rebuild(self, product_ids: Optional[List[int]] = None) -> int:
+        """
+        Recompute aggregates from the reviews table and commit (backfills)
+
+        Returns:
+            Number of products with reviews after the rebuild
+        """
+        session = self.repository.session
+        try:
+            rebuilt = self.repository.rebuild(product_ids)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error rebuilding review aggregates: {e}")
+            raise
+
+        self.cache.delete_pattern(f"{self.cache_prefix}:*")
+        logger.info(f"Rebuilt review aggregates for {rebuilt} products")
+        return rebuilt
+
+    def invalidate(self, product_id: int) -> None:
+        """Drop the cached summary and the product's cached stats"""
+        self.cache.delete(self.cache.build_key(self.cache_prefix, "summary"))
+        self.cache.delete(self.cache.build_key(self.cache_prefix, "product", product_id))
+
+    @staticmethod
+    def _average(stats: ProductRatingStatsSchema) -> float:
+        return stats.rating_sum / stats.rating_count if stats.rating_count else 0.0
@@ -0,0 +1,157 @@
+"""Product review listing with cursor pagination and first-page caching."""
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from config.constants import CacheConfig, PaginationConfig
+from models.enums import ReviewSort
+from models.review import ReviewModel
+from models.user import UserModel
+from schemas.base_schema import get_list_adapter
+from schemas.review_schema import ReviewPublic
+from services.cache_service import cache_service
+from utils.cursor import decode_cursor, encode_cursor
+from utils.logging_utils import get_sanitized_logger
+from utils.tracing import traced_service
+
+logger = get_sanitized_logger(__name__)
+
+
+def user_label(name: Optional[str], lastname: Optional[str], email: str) -> str:
+    """Public reviewer name: "name lastname", or the email when both are empty"""
+    parts = [part.strip() for part in (name, lastname) if part and part.strip()]
+    return " ".join(parts) or email
+
+
+@traced_service
+class ReviewListingService:
+    """
+    Read a product's reviews one page at a time
+
+    Each sort order is a keyset on a composite index:
+    newest -> (product_id, id_key), highest/lowest -> (product_id, rating, id_key).
+    First pages, which product pages request most, are cached in one hash
+    per product and dropped with a single DEL on every review write for
+    that product.
+    """
+
+    cache_prefix = "reviews:product"
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.cache = cache_service
+
+    def get_page(self, product_id: int, sort: ReviewSort = ReviewSort.NEWEST,
+                 cursor: Optional[str] = None,
+                 limit: int = PaginationConfig.REVIEWS_DEFAULT_LIMIT) -> Tuple[List[ReviewPublic], Optional[str]]:
+        """
+        Get one page of a product's reviews
+
+        Cache (first pages only): hash reviews:product:{id}, field limit:{limit}:sort:{sort}
+        TTL: CacheConfig.REVIEW_PAGE_TTL (whole hash)
+
+        Args:
+            product_id: Reviewed product
+            sort: newest, highest or lowest rating first
+            cursor: Cursor from the previous page (None for the first page)
+            limit: Reviews per page
+
+        Returns:
+            Tuple of (reviews, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if cursor:
+            after = (
+                decode_cursor(cursor, int) if sort == ReviewSort.NEWEST
+                else decode_cursor(cursor, float, int)
+            )
+            return self._fetch_page(product_id, sort, after, limit)
+
+        cache_key = self._product_key(product_id)
+        field = f"limit:{limit}:sort:{sort.value}"
+        cached = self.cache.get_field(cache_key, field)
+        if cached is not None:
+            logger.debug("Cache HIT: %s %s", cache_key, field)
+            return get_list_adapter(ReviewPublic).validate_python(cached["reviews"]), cached["next_cursor"]
+
+        logger.debug("Cache MISS: %s %s", cache_key, field)
+        reviews, next_cursor = self._fetch_page(product_id, sort, None, limit)
+        self.cache.set_field(
+            cache_key,
+            field,
+            {"reviews": get_list_adapter(ReviewPublic).dump_python(reviews), "next_cursor": next_cursor},
+            ttl=CacheConfig.REVIEW_PAGE_TTL,
+        )
+        return reviews, next_cursor
+
+    def _fetch_page(self, product_id: int, sort: ReviewSort, after: Optional[tuple],
+                    limit: int) -> Tuple[List[ReviewPublic], Optional[str]]:
+        stmt = (
+            select(
+                ReviewModel.id_key,
+                ReviewModel.rating,
+                ReviewModel.comment,
+                ReviewModel.product_id,
+                ReviewModel.user_id,
+                UserModel.name,
+                UserModel.lastname,
+                UserModel.email,
+            )
+            .join(UserModel, ReviewModel.user_id == UserModel.id_key)
+            .where(ReviewModel.product_id == product_id)
+            .limit(limit + 1)
+        )
+
+        if sort == ReviewSort.NEWEST:
+            stmt = stmt.order_by(ReviewModel.id_key.desc())
+            if after is not None:
+                stmt = stmt.where(ReviewModel.id_key < after[0])
+        elif sort == ReviewSort.HIGHEST:
+            stmt = stmt.order_by(ReviewModel.rating.desc(), ReviewModel.id_key.desc())
+            if after is not None:
+                rating, id_key = after
+                stmt = stmt.where(or_(
+                    ReviewModel.rating < rating,
+                    and_(ReviewModel.rating == rating, ReviewModel.id_key < id_key),
+                ))
+        else:
+            stmt = stmt.order_by(ReviewModel.rating.asc(), ReviewModel.id_key.asc())
+            if after is not None:
+                rating, id_key = after
+                stmt = stmt.where(or_(
+                    ReviewModel.rating > rating,
+                    and_(ReviewModel.rating == rating, ReviewModel.id_key > id_key),
+                ))
+
+        rows = self.db.execute(stmt).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = (
+                encode_cursor(last.id_key) if sort == ReviewSort.NEWEST
+                else encode_cursor(last.rating, last.id_key)
+            )
+
+        reviews = [
+            ReviewPublic(
+                id_key=row.id_key,
+                rating=row.rating,
+                comment=row.comment,
+                product_id=row.product_id,
+                user_id=row.user_id,
+                user_name=user_label(row.name, row.lastname, row.email),
+            )
+            for row in rows
+        ]
+        return reviews, next_cursor
+
+    def invalidate(self, product_id: int) -> None:
+        """Drop the product's cached first pages (one DEL)"""
+        self.cache.delete(self._product_key(product_id))
+
+    def _product_key(self, product_id: int) -> str:
+        return f"{self.cache_prefix}:{product_id}"
@@ -0,0 +1,142 @@
+"""
+Unit of Work helpers for write services
+
+Provides the @transactional decorator used by services whose writes take
+row locks (order details, checkout). Each attempt runs in one transaction
+with PostgreSQL lock/statement timeouts; transient failures (deadlocks,
+serialization failures, lock timeouts) are rolled back and retried with
+jittered exponential backoff instead of surfacing as 500s.
+
+The backoff sleeps the calling thread: decorated services must be called
+from plain `def` routes (run in FastAPI's threadpool), never from
+`async def` routes, or a retry would stall the event loop.
+"""
+import functools
+import random
+import time
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from config.constants import DatabaseConfig
+from utils.logging_utils import get_sanitized_logger
+from utils.metrics import DB_TRANSACTIONS
+
+logger = get_sanitized_logger(__name__)
+
+# PostgreSQL SQLSTATEs worth retrying: the whole transaction can succeed on replay
+RETRYABLE_PGCODES = {
+    "40001",  # serialization_failure
+    "40P01",  # deadlock_detected
+    "55P03",  # lock_not_available (lock_timeout, NOWAIT)
+}
+
+
+class TransientDatabaseError(Exception):
+    """
+    TransientDatabaseError is raised when a write keeps failing with
+    retryable database errors after all retries
+    """
+    pass
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """
+    Check whether a database error is transient
+
+    PostgreSQL errors are classified by SQLSTATE (see RETRYABLE_PGCODES);
+    SQLite's "database is locked" is its equivalent of a lock timeout.
+    """
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    if getattr(orig, "pgcode", None) in RETRYABLE_PGCODES:
+        return True
+    return "database is locked" in str(orig)
+
+
+def retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry (1-based)"""
+    ceiling = min(
+        DatabaseConfig.TX_RETRY_MAX_DELAY,
+        DatabaseConfig.TX_RETRY_BASE_DELAY * (2 ** (attempt - 1)),
+    )
+    return random.uniform(0, ceiling)
+
+
+def apply_transaction_timeouts(session: Session) -> None:
+    """
+    Bound how long the current transaction may wait on locks or run
+
+    SET LOCAL only lasts until commit/rollback, so pooled connections keep
+    their defaults. No-op on databases other than PostgreSQL.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    session.execute(text(f"SET LOCAL lock_timeout = {int(DatabaseConfig.TX_LOCK_TIMEOUT_MS)}"))
+    session.execute(text(f"SET LOCAL statement_timeout = {int(DatabaseConfig.TX_STATEMENT_TIMEOUT_MS)}"))
+
+
+def transactional(func: Callable) -> Callable:
+    """
+    Run a service write as a retryable transaction
+
+    The decorated method must belong to a service exposing
+    `self.repository.session` and must commit its own work (repository
+    save/update/remove do). Nested decorated calls join the outer attempt.
+
+    Outcomes are counted in the db_transactions_total metric (committed,
+    retried, exhausted) by operation, e.g. "OrderService.checkout".
+
+    Raises:
+        TransientDatabaseError: If retryable errors persist after
+            DatabaseConfig.TX_MAX_RETRIES retries
+    """
+    operation = func.__qualname__
+    committed = DB_TRANSACTIONS.labels(operation, "committed")
+    retried = DB_TRANSACTIONS.labels(operation, "retried")
+    exhausted = DB_TRANSACTIONS.labels(operation, "exhausted")
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        session = self.repository.session
+        if session.info.get("transactional_active"):
+            return func(self, *args, **kwargs)
+
+        attempt = 0
+        session.info["transactional_active"] = True
+        try:
+            while True:
+                try:
+                    apply_transaction_timeouts(session)
+                    result = func(self, *args, **kwargs)
+                    committed.inc()
+                    return result
+                except Exception as e:
+                    if not is_retryable_error(e):
+                        raise
+                    session.rollback()
+                    attempt += 1
+
+                    if attempt > DatabaseConfig.TX_MAX_RETRIES:
+                        exhausted.inc()
+                        logger.error(f"{operation} failed after {attempt} attempts: {e}")
+                        raise TransientDatabaseError(
+                            f"{operation} could not complete because of concurrent updates, "
+                            f"please retry"
+                        ) from e
+
+                    delay = retry_delay(attempt)
+                    retried.inc()
+                    logger.warning(
+                        f"Retryable database error in {operation} "
+                        f"(attempt {attempt}/{DatabaseConfig.TX_MAX_RETRIES}, "
+                        f"retrying in {delay * 1000:.0f} ms): {e}"
+                    )
+                    time.sleep(delay)
+        finally:
+            session.info.pop("transactional_active", None)
+
+    return wrapper
@@ -3,6 +3,7 @@ import os
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 from datetime import datetime, date
 from typing import Generator
@@ -15,6 +16,8 @@ os.environ['POSTGRES_USER'] = 'postgres'
 os.environ['POSTGRES_PASSWORD'] = 'postgres'
 os.environ['REDIS_HOST'] = 'localhost'
 os.environ['REDIS_PORT'] = '6379'
+# Repository reads raise on lazy loads so new N+1 queries fail the suite
+os.environ.setdefault('ORM_RAISELOAD_DEFAULT', 'true')
 
 from models.base_model import base as Base
 from main import create_fastapi_app
@@ -24,17 +27,17 @@ from main import create_fastapi_app
 TEST_DATABASE_URL = "sqlite:///:memory:"  # In-memory SQLite for fast testing
 
 
-@pytest.fixture(scope="session")
+@pytest.fixture(scope="function")
 def engine():
-    """Create test database engine."""
+    """Create a fresh test database engine for each test."""
     test_engine = create_engine(
         TEST_DATABASE_URL,
         connect_args={"check_same_thread": False},  # SQLite specific
+        poolclass=StaticPool,  # One connection: threadpool routes see the same database
         echo=False
     )
     Base.metadata.create_all(bind=test_engine)
     yield test_engine
-    Base.metadata.drop_all(bind=test_engine)
     test_engine.dispose()
 
 
@@ -43,19 +46,8 @@ def db_session(engine) -> Generator[Session, None, None]:
     """Create a new database session for each test."""
     TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     session = TestSessionLocal()
-
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
-        # Clean all tables after each test
-        for table in reversed(Base.metadata.sorted_tables):
-            session.execute(table.delete())
-        session.commit()
+    yield session
+    session.close()
 
 
 @pytest.fixture(scope="function")
@@ -338,3 +330,49 @@ def mock_redis(monkeypatch):
             return results
 
     return MockRedis()
+
+
+# In-memory stand-in for services.cache_service.cache_service
+@pytest.fixture
+def memory_cache():
+    """In-memory cache with the cache_service interface used by services."""
+    import fnmatch
+    from services.cache_service import cache_service
+
+    class MemoryCache:
+        def __init__(self):
+            self.store = {}
+
+        def is_available(self):
+            return True
+
+        def build_key(self, prefix, *args, **kwargs):
+            return cache_service.build_key(prefix, *args, **kwargs)
+
+        def get(self, key):
+            return self.store.get(key)
+
+        def set(self, key, value, ttl=None):
+            self.store[key] = value
+            return True
+
+        def get_field(self, key, field):
+            return self.store.get(key, {}).get(field)
+
+        def set_field(self, key, field, value, ttl=None):
+            self.store.setdefault(key, {})[field] = value
+            return True
+
+        def delete(self, key):
+            return self.store.pop(key, None) is not None
+
+        def delete_many(self, keys):
+            return sum(self.store.pop(key, None) is not None for key in keys)
+
+        def delete_pattern(self, pattern):
+            keys = fnmatch.filter(list(self.store), pattern)
+            for key in keys:
+                del self.store[key]
+            return len(keys)
+
+    return MemoryCache()
@@ -0,0 +1,202 @@
+"""
+Tests for authentication hot-path caching
+
+Tests verify:
+- The authenticated principal is cached per (user, token)
+- Profile updates drop the user's cached principals
+- Cache entries never outlive the token
+- Verified JWT payloads are cached (bounded, expiry-aware) and decoded
+  once per request across the rate limiter and auth dependencies
+"""
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from config.database import get_db
+from controllers.auth_controller import router
+from middleware.rate_limiter import RateLimiter, RateLimiterMiddleware
+from models.user import UserModel
+from schemas.auth_schema import UserPublic
+from services.principal_cache import PrincipalCache, principal_cache
+from utils import security
+from utils.security import _TokenPayloadCache, create_access_token, decode_access_token, token_payload_cache
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def db_session(db_session):
+    """Shared test session with one active user"""
+    db_session.add(UserModel(email="ana@example.com", name="Ana", password_hash="x", is_active=True, is_admin=False))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def cache(memory_cache):
+    with patch.object(principal_cache, "cache", memory_cache):
+        yield memory_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_token_cache():
+    token_payload_cache.clear()
+    yield
+    token_payload_cache.clear()
+
+
+@pytest.fixture
+def jwt_decode():
+    with patch.object(security.jwt, "decode", wraps=security.jwt.decode) as decode:
+        yield decode
+
+
+@pytest.fixture
+def api(db_session, cache):
+    app = FastAPI()
+    app.include_router(router, prefix="/auth")
+    app.dependency_overrides[get_db] = lambda: db_session
+    return TestClient(app)
+
+
+def bearer(user_id=1):
+    return {"Authorization": f"Bearer {create_access_token(subject=str(user_id))}"}
+
+
+def count_statements(engine, func):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        func()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(statements)
+
+
+# ============================================================================
+# PRINCIPAL CACHE
+# ============================================================================
+
+class TestPrincipalCache:
+
+    def test_second_request_skips_user_query(self, api, engine):
+        headers = bearer()
+
+        assert count_statements(engine, lambda: api.get("/auth/me", headers=headers)) == 1
+        assert count_statements(engine, lambda: api.get("/auth/me", headers=headers)) == 0
+        assert api.get("/auth/me", headers=headers).json()["email"] == "ana@example.com"
+
+    def test_entries_are_per_token(self, api, cache):
+        api.get("/auth/me", headers=bearer())
+        api.get("/auth/me", headers={"Authorization": f"Bearer {create_access_token('1', {'x': 1})}"})
+
+        assert list(cache.store) == ["auth:principal:1"]
+        assert len(cache.store["auth:principal:1"]) == 2
+
+    def test_update_me_invalidates(self, api, cache):
+        headers = bearer()
+        api.get("/auth/me", headers=headers)
+        cache.delete_pattern = Mock(side_effect=AssertionError("KEYS scan on a write"))
+
+        api.put("/auth/me", json={"name": "Anita"}, headers=headers)
+
+        assert api.get("/auth/me", headers=headers).json()["name"] == "Anita"
+
+    def test_invalid_token_is_never_cached(self, api, cache):
+        response = api.get("/auth/me", headers={"Authorization": "Bearer not-a-jwt"})
+
+        assert response.status_code == 401
+        assert cache.store == {}
+
+    def test_ttl_capped_by_token_expiry(self, memory_cache):
+        ttls = []
+        memory_cache.set_field = lambda key, field, value, ttl=None: ttls.append(ttl)
+        principal = UserPublic(id_key=1, email="ana@example.com", is_active=True, is_admin=False)
+        cache = PrincipalCache(memory_cache)
+
+        cache.set(1, "token", principal, expires_at=time.time() + 10)
+        cache.set(1, "token", principal, expires_at=time.time() - 1)
+
+        assert len(ttls) == 1 and ttls[0] <= 10
+
+    def test_entry_never_outlives_its_token(self, memory_cache):
+        principal = UserPublic(id_key=1, email="ana@example.com", is_active=True, is_admin=False)
+        cache = PrincipalCache(memory_cache)
+
+        cache.set(1, "short", principal, expires_at=time.time() + 10)
+        cache.set(1, "long", principal, expires_at=time.time() + 3600)
+
+        with patch("services.principal_cache.time.time", return_value=time.time() + 60):
+            assert cache.get(1, "short") is None
+            assert cache.get(1, "long") == principal
+
+
+# ============================================================================
+# TOKEN PAYLOAD CACHE
+# ============================================================================
+
+class TestTokenPayloadCache:
+
+    def test_repeat_decode_skips_verification(self, jwt_decode):
+        token = create_access_token(subject="1")
+
+        first = decode_access_token(token)
+        second = decode_access_token(token)
+
+        assert first == second and first["sub"] == "1"
+        assert jwt_decode.call_count == 1
+
+    def test_returned_payload_is_a_copy(self):
+        token = create_access_token(subject="1")
+        decode_access_token(token)["sub"] = "2"
+
+        assert decode_access_token(token)["sub"] == "1"
+
+    def test_invalid_token_is_not_cached(self, jwt_decode):
+        assert decode_access_token("not-a-jwt") is None
+        assert decode_access_token("not-a-jwt") is None
+        assert jwt_decode.call_count == 2
+
+    def test_expired_entry_is_evicted(self):
+        cache = _TokenPayloadCache(maxsize=8)
+        cache.put("live", {"sub": "1", "exp": time.time() + 60})
+        cache.put("dead", {"sub": "2", "exp": time.time() - 1})
+
+        assert cache.get("live")["sub"] == "1"
+        assert cache.get("dead") is None
+        assert "dead" not in cache._entries
+
+    def test_bounded_lru(self):
+        cache = _TokenPayloadCache(maxsize=2)
+        cache.put("a", {"sub": "a"})
+        cache.put("b", {"sub": "b"})
+        cache.get("a")
+        cache.put("c", {"sub": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") and cache.get("c")
+
+    def test_one_decode_per_request_across_middleware_and_auth(self, db_session, cache, jwt_decode):
+        app = FastAPI()
+        app.add_middleware(RateLimiterMiddleware)
+        app.include_router(router, prefix="/auth")
+        app.dependency_overrides[get_db] = lambda: db_session
+        token = create_access_token(subject="1", extra={"is_admin": True})
+
+        # Middleware is built on the first request; maxsize 0 disables the LRU
+        with patch("middleware.rate_limiter.get_async_redis_client", return_value=MagicMock()), \
+                patch.object(RateLimiter, "_is_admin_request",
+                             autospec=True, side_effect=RateLimiter._is_admin_request) as is_admin, \
+                patch.object(token_payload_cache, "maxsize", 0):
+            response = TestClient(app).get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert is_admin.call_count == 1
+        assert jwt_decode.call_count == 1
@@ -0,0 +1,157 @@
+"""
+Tests for whole-cart checkout
+
+Tests verify:
+- Order and details are created in one transaction with a server-side total
+- Products are decremented in ascending id order (deadlock-free locking)
+- Any failing line rolls back the whole cart
+- POST /orders/checkout status codes
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from config.database import get_db
+from controllers.order_controller import OrderController
+from models.bill import BillModel
+from models.category import CategoryModel
+from models.client import ClientModel
+from models.order import OrderModel
+from models.order_detail import OrderDetailModel
+from models.product import ProductModel
+from models.enums import DeliveryMethod
+from repositories.base_repository_impl import InstanceNotFoundError
+from schemas.checkout_schema import CheckoutItem, CheckoutRequest
+from services.order_service import OrderService
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def shop(db_session):
+    """Client, bill and three products (ids 1..3) with 5 units each"""
+    category = CategoryModel(name="Electronics")
+    client = ClientModel(name="Jane", lastname="Doe", email="jane@example.com")
+    db_session.add_all([category, client])
+    db_session.flush()
+    db_session.add_all([
+        ProductModel(name=f"Product {i}", price=price, stock=5, category_id=category.id_key)
+        for i, price in enumerate([10.0, 2.5, 7.25])
+    ])
+    bill = BillModel(bill_number="B-1", total=0, client_id=client.id_key)
+    db_session.add(bill)
+    db_session.commit()
+    return {"client_id": client.id_key, "bill_id": bill.id_key}
+
+
+def cart(shop, *items):
+    return CheckoutRequest(
+        client_id=shop["client_id"],
+        bill_id=shop["bill_id"],
+        delivery_method=DeliveryMethod.HOME_DELIVERY,
+        items=[CheckoutItem(product_id=p, quantity=q) for p, q in items],
+    )
+
+
+def stock_levels(db_session):
+    db_session.expire_all()
+    return [p.stock for p in db_session.query(ProductModel).order_by(ProductModel.id_key)]
+
+
+# ============================================================================
+# SERVICE
+# ============================================================================
+
+class TestCheckoutService:
+    """OrderService.checkout"""
+
+    def test_creates_order_and_lines_with_server_total(self, db_session, shop):
+        result = OrderService(db_session).checkout(cart(shop, (3, 2), (1, 1), (3, 1)))
+
+        assert result.order.total == pytest.approx(10.0 + 3 * 7.25)
+        assert [(line.product_id, line.quantity, line.price) for line in result.items] == [
+            (1, 1, 10.0),
+            (3, 3, 7.25),
+        ]
+        assert stock_levels(db_session) == [4, 5, 2]
+        assert db_session.query(OrderDetailModel).count() == 2
+
+    def test_locks_products_in_ascending_id_order(self, db_session, engine, shop):
+        updated = []
+
+        def capture(conn, cursor, statement, parameters, *args):
+            if statement.startswith("UPDATE products"):
+                updated.append(parameters[1])
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            OrderService(db_session).checkout(cart(shop, (3, 1), (1, 1), (2, 1)))
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+        assert updated == [1, 2, 3]
+
+    def test_insufficient_stock_rolls_back_whole_cart(self, db_session, shop):
+        with pytest.raises(ValueError, match="Insufficient stock for product 3"):
+            OrderService(db_session).checkout(cart(shop, (1, 2), (3, 6)))
+
+        assert stock_levels(db_session) == [5, 5, 5]
+        assert db_session.query(OrderModel).count() == 0
+
+    def test_unknown_product_rolls_back_whole_cart(self, db_session, shop):
+        with pytest.raises(InstanceNotFoundError, match="Product with id 99"):
+            OrderService(db_session).checkout(cart(shop, (1, 1), (99, 1)))
+
+        assert stock_levels(db_session) == [5, 5, 5]
+        assert db_session.query(OrderModel).count() == 0
+
+    def test_unknown_client(self, db_session, shop):
+        with pytest.raises(InstanceNotFoundError, match="Client with id 42"):
+            OrderService(db_session).checkout(
+                cart({**shop, "client_id": 42}, (1, 1))
+            )
+
+
+# ============================================================================
+# ENDPOINT
+# ============================================================================
+
+class TestCheckoutEndpoint:
+    """POST /orders/checkout"""
+
+    @pytest.fixture
+    def api_client(self, db_session):
+        app = FastAPI()
+        app.include_router(OrderController().router, prefix="/orders")
+        app.dependency_overrides[get_db] = lambda: db_session
+        return TestClient(app)
+
+    def payload(self, shop, items):
+        return {
+            "client_id": shop["client_id"],
+            "bill_id": shop["bill_id"],
+            "delivery_method": DeliveryMethod.DRIVE_THRU.value,
+            "items": [{"product_id": p, "quantity": q} for p, q in items],
+        }
+
+    def test_checkout_created(self, api_client, shop):
+        response = api_client.post("/orders/checkout", json=self.payload(shop, [(2, 4)]))
+
+        assert response.status_code == 201
+        body = response.json()
+        assert body["order"]["total"] == 10.0
+        assert body["items"][0]["price"] == 2.5
+
+    def test_checkout_insufficient_stock_is_400(self, api_client, shop):
+        response = api_client.post("/orders/checkout", json=self.payload(shop, [(2, 50)]))
+
+        assert response.status_code == 400
+        assert "Insufficient stock" in response.json()["detail"]
+
+    def test_checkout_rejects_empty_cart(self, api_client, shop):
+        response = api_client.post("/orders/checkout", json=self.payload(shop, []))
+
+        assert response.status_code == 422
@@ -1,13 +1,17 @@
 """
 Concurrency Tests for Race Condition Fixes
 
-Tests concurrent operations to validate SELECT FOR UPDATE locks
-and ensure stock consistency under high concurrency.
+Tests concurrent operations to validate atomic stock updates and row
+locks, and ensure stock consistency under high concurrency.
 """
 import pytest
 import concurrent.futures
 import threading
-from sqlalchemy.orm import Session
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from models.base_model import base as Base
 
 from models.product import ProductModel
 from models.order import OrderModel
@@ -15,6 +19,7 @@ from models.order_detail import OrderDetailModel
 from models.client import ClientModel
 from models.bill import BillModel
 from models.category import CategoryModel
+from models.enums import DeliveryMethod, Status
 from services.order_detail_service import OrderDetailService
 from services.product_service import ProductService
 from schemas.order_detail_schema import OrderDetailSchema
@@ -435,6 +440,121 @@ class TestConcurrentStockOperations:
         print("✅ Delete concurrency test PASSED - Stock restored correctly!")
 
 
+class TestAtomicStockDecrement:
+    """Conditional UPDATE ... RETURNING stock reservation (runs on file-backed SQLite)"""
+
+    @pytest.fixture
+    def session_factory(self, tmp_path):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'stock.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        Base.metadata.create_all(bind=engine)
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    @pytest.fixture
+    def hot_product(self, session_factory):
+        """Product with 10 units and an order to attach details to"""
+        with session_factory() as session:
+            category = CategoryModel(name="Electronics")
+            session.add(category)
+            session.flush()
+            product = ProductModel(name="Hot Product", price=99.99, stock=10, category_id=category.id_key)
+            client = ClientModel(name="Test", lastname="Client", email="atomic@example.com")
+            session.add_all([product, client])
+            session.flush()
+            bill = BillModel(bill_number="BILL-ATOMIC-001", total=0, client_id=client.id_key)
+            session.add(bill)
+            session.flush()
+            order = OrderModel(
+                total=0, delivery_method=DeliveryMethod.DRIVE_THRU, status=Status.PENDING,
+                client_id=client.id_key, bill_id=bill.id_key,
+            )
+            session.add(order)
+            session.commit()
+            return product.id_key, order.id_key
+
+    def test_concurrent_purchases_never_oversell(self, session_factory, hot_product):
+        """200 concurrent single-unit purchases on 10 units: exactly 10 succeed"""
+        product_id, order_id = hot_product
+
+        def buy(_):
+            with session_factory() as session:
+                try:
+                    OrderDetailService(session).save(
+                        OrderDetailSchema(quantity=1, price=99.99, order_id=order_id, product_id=product_id)
+                    )
+                    return "success"
+                except ValueError:
+                    return "insufficient_stock"
+                except Exception as e:
+                    return f"error: {e}"
+
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=50) as executor:
+            results = list(executor.map(buy, range(200)))
+        elapsed = time.perf_counter() - start
+        print(f"\n📊 200 purchases in {elapsed * 1000:.0f} ms ({200 / elapsed:,.0f} req/s)")
+
+        assert results.count("success") == 10
+        assert results.count("insufficient_stock") == 190
+        with session_factory() as session:
+            assert session.get(ProductModel, product_id).stock == 0
+            assert session.query(OrderDetailModel).count() == 10
+
+    def test_purchase_touches_product_row_once(self, session_factory, hot_product):
+        """Until the detail is inserted, the product row is touched by one statement"""
+        product_id, order_id = hot_product
+        statements = []
+
+        with session_factory() as session:
+            engine = session.get_bind()
+            listener = lambda conn, cursor, statement, *args: statements.append(statement)
+            event.listen(engine, "before_cursor_execute", listener)
+            try:
+                OrderDetailService(session).save(
+                    OrderDetailSchema(quantity=3, order_id=order_id, product_id=product_id)
+                )
+            finally:
+                event.remove(engine, "before_cursor_execute", listener)
+
+        insert_at = next(i for i, s in enumerate(statements) if s.startswith("INSERT INTO order_details"))
+        product_statements = [s for s in statements[:insert_at] if "products" in s]
+        assert len(product_statements) == 1
+        assert product_statements[0].startswith("UPDATE products SET stock=(products.stock - ?)")
+        assert "RETURNING" in product_statements[0]
+
+    def test_failed_validation_releases_reservation(self, session_factory, hot_product):
+        """A price mismatch after the decrement rolls the stock back"""
+        product_id, order_id = hot_product
+
+        with session_factory() as session:
+            with pytest.raises(ValueError, match="Price mismatch"):
+                OrderDetailService(session).save(
+                    OrderDetailSchema(quantity=2, price=1.0, order_id=order_id, product_id=product_id)
+                )
+
+        with session_factory() as session:
+            assert session.get(ProductModel, product_id).stock == 10
+
+    def test_update_and_delete_adjust_stock_by_difference(self, session_factory, hot_product):
+        product_id, order_id = hot_product
+
+        with session_factory() as session:
+            service = OrderDetailService(session)
+            detail = service.save(OrderDetailSchema(quantity=2, order_id=order_id, product_id=product_id))
+            service.update(detail.id_key, OrderDetailSchema(quantity=5, order_id=order_id, product_id=product_id))
+            assert session.get(ProductModel, product_id).stock == 5
+
+            with pytest.raises(ValueError, match="Insufficient stock"):
+                service.update(detail.id_key, OrderDetailSchema(quantity=20, order_id=order_id, product_id=product_id))
+
+            service.delete(detail.id_key)
+            session.expire_all()
+            assert session.get(ProductModel, product_id).stock == 10
+
+
 @pytest.mark.integration
 class TestConcurrentCacheOperations:
     """Test concurrent cache operations with distributed locks"""
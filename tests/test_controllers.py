@@ -216,7 +216,8 @@ class TestOrderEndpoints:
 
         assert response.status_code == 201
         data = response.json()
-        assert data["total"] == 500.0
+        # Totals are maintained from the order details, never taken from the client
+        assert data["total"] == 0.0
         assert data["client_id"] == client.id_key
 
     def test_create_order_invalid_client(self, api_client, seeded_db):
@@ -0,0 +1,360 @@
+"""
+Tests for Redis-backed hot-inventory reservations
+
+Most tests replace the Lua scripts with mocks returning the script's
+documented results, which covers the Python side:
+- Counters are seeded from the DB on first use; shortfalls raise ValueError
+- Hot products skip the DB row lock; reservations are confirmed after commit
+  and released when the write fails
+- Sold units are reconciled to ProductModel.stock in one batch
+- Selling a hot product without Redis fails closed with 503
+
+TestLuaScripts runs the real scripts on fakeredis with Lua support
+(fakeredis[lua], requirements-dev.txt) and is skipped without it:
+- Reserve / confirm / release / expiry keep counter and pending units exact
+- Admin stock changes through ProductService.update reach the counter
+"""
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from models.bill import BillModel
+from models.category import CategoryModel
+from models.client import ClientModel
+from models.enums import DeliveryMethod, Status
+from models.order import OrderModel
+from models.product import ProductModel
+from repositories.base_repository_impl import InstanceNotFoundError
+from schemas.checkout_schema import CheckoutItem, CheckoutRequest
+from schemas.order_detail_schema import OrderDetailSchema
+from services import inventory_service
+from services.inventory_service import (
+    ADJUST_SCRIPT,
+    CONFIRM_SCRIPT,
+    RELEASE_SCRIPT,
+    RESERVE_SCRIPT,
+    RESTOCK_SCRIPT,
+    SEED_SCRIPT,
+    TAKE_PENDING_SCRIPT,
+    HotInventoryService,
+    HotInventoryUnavailableError,
+)
+from services.order_detail_service import OrderDetailService
+from services.order_service import OrderService
+from services.product_service import ProductService
+from schemas.product_schema import ProductSchema
+
+HOT_PRODUCT_ID = 1
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def shop(db_session):
+    """Order and two products: id 1 (hot) and id 2, 10 units each"""
+    category = CategoryModel(name="Flash sale")
+    client = ClientModel(name="Jane", lastname="Doe", email="jane@example.com")
+    db_session.add_all([category, client])
+    db_session.flush()
+    db_session.add_all([
+        ProductModel(name="Console", price=499.0, stock=10, category_id=category.id_key),
+        ProductModel(name="Cable", price=9.5, stock=10, category_id=category.id_key),
+    ])
+    bill = BillModel(bill_number="B-1", total=0, client_id=client.id_key)
+    db_session.add(bill)
+    db_session.flush()
+    order = OrderModel(
+        total=0, delivery_method=DeliveryMethod.HOME_DELIVERY, status=Status.PENDING,
+        client_id=client.id_key, bill_id=bill.id_key,
+    )
+    db_session.add(order)
+    db_session.commit()
+    return {"client_id": client.id_key, "bill_id": bill.id_key, "order_id": order.id_key}
+
+
+@pytest.fixture
+def scripts():
+    """Script mocks keyed by Lua source, with happy-path results"""
+    return {
+        RESERVE_SCRIPT: Mock(return_value=[1, 7]),
+        CONFIRM_SCRIPT: Mock(return_value=3),
+        RELEASE_SCRIPT: Mock(return_value=3),
+        RESTOCK_SCRIPT: Mock(return_value=1),
+        ADJUST_SCRIPT: Mock(return_value=None),
+        SEED_SCRIPT: Mock(return_value=10),
+        TAKE_PENDING_SCRIPT: Mock(return_value=0),
+    }
+
+
+@pytest.fixture
+def hot(scripts):
+    """Global hot_inventory backed by a mock Redis, product 1 flagged hot"""
+    redis_client = Mock()
+    redis_client.register_script.side_effect = lambda source: scripts[source]
+    service = HotInventoryService(redis_client=redis_client)
+    with patch.object(inventory_service.InventoryConfig, "HOT_PRODUCT_IDS", frozenset({HOT_PRODUCT_ID})), \
+            patch("services.order_detail_service.hot_inventory", service), \
+            patch("services.order_service.hot_inventory", service), \
+            patch("services.product_service.hot_inventory", service):
+        yield service
+
+
+def stock_levels(db_session):
+    db_session.expire_all()
+    return [p.stock for p in db_session.query(ProductModel).order_by(ProductModel.id_key)]
+
+
+# ============================================================================
+# RESERVATIONS
+# ============================================================================
+
+class TestReserve:
+
+    def test_seeds_counter_on_first_use(self, hot, scripts, db_session, shop):
+        scripts[RESERVE_SCRIPT].side_effect = [[-2, 0], [1, 7]]
+
+        reservation = hot.reserve(db_session, HOT_PRODUCT_ID, 3)
+
+        assert reservation.remaining == 7
+        assert scripts[SEED_SCRIPT].call_args.kwargs["args"] == [10]
+        assert scripts[RESERVE_SCRIPT].call_count == 2
+
+    def test_shortfall_raises_value_error(self, hot, scripts, db_session, shop):
+        scripts[RESERVE_SCRIPT].return_value = [-1, 2]
+
+        with pytest.raises(ValueError, match="Requested: 3, Available: 2"):
+            hot.reserve(db_session, HOT_PRODUCT_ID, 3)
+
+    def test_unknown_product_is_not_seeded(self, hot, scripts, db_session, shop):
+        scripts[RESERVE_SCRIPT].return_value = [-2, 0]
+
+        with pytest.raises(InstanceNotFoundError, match="Product with id 99"):
+            hot.reserve(db_session, 99, 1)
+        scripts[SEED_SCRIPT].assert_not_called()
+
+    def test_fails_closed_without_redis(self, db_session):
+        with pytest.raises(HotInventoryUnavailableError):
+            HotInventoryService(redis_client=None).reserve(db_session, HOT_PRODUCT_ID, 1)
+
+    def test_redis_errors_become_unavailable(self, hot, scripts, db_session):
+        scripts[RESERVE_SCRIPT].side_effect = ConnectionError("connection refused")
+
+        with pytest.raises(HotInventoryUnavailableError):
+            hot.reserve(db_session, HOT_PRODUCT_ID, 1)
+
+
+# ============================================================================
+# SERVICE INTEGRATION
+# ============================================================================
+
+class TestHotOrderDetails:
+
+    def test_hot_product_skips_db_decrement_and_confirms(self, hot, scripts, db_session, shop):
+        detail = OrderDetailService(db_session).save(
+            OrderDetailSchema(order_id=shop["order_id"], product_id=HOT_PRODUCT_ID, quantity=3)
+        )
+
+        assert detail.price == 499.0
+        assert stock_levels(db_session) == [10, 10]
+        scripts[CONFIRM_SCRIPT].assert_called_once()
+        scripts[RELEASE_SCRIPT].assert_not_called()
+
+    def test_failed_write_releases_reservation(self, hot, scripts, db_session, shop):
+        with pytest.raises(ValueError, match="Price mismatch"):
+            OrderDetailService(db_session).save(OrderDetailSchema(
+                order_id=shop["order_id"], product_id=HOT_PRODUCT_ID, quantity=3, price=1.0
+            ))
+
+        scripts[RELEASE_SCRIPT].assert_called_once()
+        scripts[CONFIRM_SCRIPT].assert_not_called()
+
+    def test_delete_restocks_in_redis(self, hot, scripts, db_session, shop):
+        service = OrderDetailService(db_session)
+        detail = service.save(
+            OrderDetailSchema(order_id=shop["order_id"], product_id=HOT_PRODUCT_ID, quantity=3)
+        )
+
+        service.delete(detail.id_key)
+
+        assert scripts[RESTOCK_SCRIPT].call_args.kwargs["args"] == [3, HOT_PRODUCT_ID]
+        assert stock_levels(db_session) == [10, 10]
+
+    def test_moving_line_off_hot_product_restocks_it(self, hot, scripts, db_session, shop):
+        service = OrderDetailService(db_session)
+        detail = service.save(
+            OrderDetailSchema(order_id=shop["order_id"], product_id=HOT_PRODUCT_ID, quantity=3)
+        )
+
+        service.update(detail.id_key, OrderDetailSchema(order_id=shop["order_id"], product_id=2, quantity=2))
+
+        assert scripts[RESTOCK_SCRIPT].call_args.kwargs["args"] == [3, HOT_PRODUCT_ID]
+        assert stock_levels(db_session) == [10, 8]
+
+    def test_moving_line_onto_hot_product_reserves_it(self, hot, scripts, db_session, shop):
+        service = OrderDetailService(db_session)
+        detail = service.save(OrderDetailSchema(order_id=shop["order_id"], product_id=2, quantity=2))
+
+        service.update(detail.id_key, OrderDetailSchema(
+            order_id=shop["order_id"], product_id=HOT_PRODUCT_ID, quantity=3
+        ))
+
+        assert scripts[RESERVE_SCRIPT].call_args.kwargs["args"][0] == 3
+        assert scripts[CONFIRM_SCRIPT].call_count == 1
+        assert stock_levels(db_session) == [10, 10]
+
+    def test_checkout_mixes_hot_and_regular_products(self, hot, scripts, db_session, shop):
+        response = OrderService(db_session).checkout(CheckoutRequest(
+            client_id=shop["client_id"],
+            bill_id=shop["bill_id"],
+            delivery_method=DeliveryMethod.DRIVE_THRU,
+            items=[CheckoutItem(product_id=1, quantity=1), CheckoutItem(product_id=2, quantity=2)],
+        ))
+
+        assert response.order.total == pytest.approx(499.0 + 2 * 9.5)
+        assert stock_levels(db_session) == [10, 8]
+        scripts[CONFIRM_SCRIPT].assert_called_once()
+
+
+# ============================================================================
+# RECONCILIATION
+# ============================================================================
+
+class TestReconcile:
+
+    def test_applies_pending_units_in_one_batch(self, hot, scripts, db_session, shop):
+        hot.redis_client.srandmember.return_value = ["1", "2"]
+        scripts[TAKE_PENDING_SCRIPT].side_effect = [4, -1]
+
+        applied = hot.reconcile(db_session)
+
+        assert applied == {1: 4, 2: -1}
+        assert stock_levels(db_session) == [6, 11]
+
+    def test_failed_update_requeues_units(self, hot, scripts, db_session):
+        hot.redis_client.srandmember.return_value = ["1"]
+        scripts[TAKE_PENDING_SCRIPT].return_value = 4
+        session = Mock()
+        session.connection.return_value.execute.side_effect = RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            hot.reconcile(session)
+
+        pipe = hot.redis_client.pipeline.return_value
+        pipe.incrby.assert_called_once_with("inventory:pending:1", 4)
+        pipe.sadd.assert_called_once_with("inventory:dirty", 1)
+        session.rollback.assert_called_once()
+
+    def test_expired_reservations_are_released(self, hot, scripts):
+        hot.redis_client.zrangebyscore.return_value = ["abc"]
+        hot.redis_client.hget.return_value = "1"
+
+        assert hot.expire_reservations() == 1
+        assert scripts[RELEASE_SCRIPT].call_args.kwargs["keys"][2] == "inventory:stock:1"
+
+
+# ============================================================================
+# LUA SCRIPTS
+# ============================================================================
+
+@pytest.fixture
+def live():
+    """Global hot_inventory on fakeredis running the real Lua scripts, product 1 flagged hot"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    service = HotInventoryService(redis_client=fakeredis.FakeRedis(decode_responses=True))
+    with patch.object(inventory_service.InventoryConfig, "HOT_PRODUCT_IDS", frozenset({HOT_PRODUCT_ID})), \
+            patch("services.order_detail_service.hot_inventory", service), \
+            patch("services.order_service.hot_inventory", service), \
+            patch("services.product_service.hot_inventory", service), \
+            patch("services.product_service.cache_service") as cache:
+        cache.delete_pattern.return_value = 0
+        yield service
+
+
+def counters(service):
+    redis_client = service.redis_client
+    return (
+        int(redis_client.get("inventory:stock:1") or 0),
+        int(redis_client.get("inventory:pending:1") or 0),
+        redis_client.zcard("inventory:reservations"),
+    )
+
+
+class TestLuaScripts:
+
+    def test_reserve_confirm_release(self, live, db_session, shop):
+        first = live.reserve(db_session, HOT_PRODUCT_ID, 3)
+        second = live.reserve(db_session, HOT_PRODUCT_ID, 4)
+        assert (first.remaining, second.remaining) == (7, 3)
+        with pytest.raises(ValueError, match="Requested: 4, Available: 3"):
+            live.reserve(db_session, HOT_PRODUCT_ID, 4)
+
+        live.confirm(first)
+        assert live.release(second) == 4
+        assert live.release(second) == 0
+
+        assert counters(live) == (7, 3, 0)
+        assert live.redis_client.smembers("inventory:dirty") == {"1"}
+
+    def test_seed_subtracts_pending_units(self, live, db_session, shop):
+        live.redis_client.set("inventory:pending:1", 4)
+
+        assert live.reserve(db_session, HOT_PRODUCT_ID, 1).remaining == 5
+
+    def test_expired_reservation_confirmed_late_is_taken_again(self, live, db_session, shop):
+        reservation = live.reserve(db_session, HOT_PRODUCT_ID, 3, ttl=-1)
+
+        assert live.expire_reservations() == 1
+        assert counters(live) == (10, 0, 0)
+
+        live.confirm(reservation)
+        assert counters(live) == (7, 3, 0)
+
+    def test_sale_is_reconciled_to_the_database(self, live, db_session, shop):
+        OrderDetailService(db_session).save(
+            OrderDetailSchema(order_id=shop["order_id"], product_id=HOT_PRODUCT_ID, quantity=3)
+        )
+        assert counters(live) == (7, 3, 0)
+
+        assert live.reconcile(db_session) == {1: 3}
+        assert stock_levels(db_session) == [7, 10]
+        assert counters(live) == (7, 0, 0)
+
+    def test_admin_stock_change_reaches_the_counter(self, live, db_session, shop):
+        reservation = live.reserve(db_session, HOT_PRODUCT_ID, 3)
+
+        ProductService(db_session).update(HOT_PRODUCT_ID, ProductSchema(
+            name="Console", price=499.0, stock=25, category_id=1
+        ))
+        assert counters(live) == (22, 0, 1)
+
+        live.confirm(reservation)
+        live.reconcile(db_session)
+        assert stock_levels(db_session) == [22, 10]
+        assert counters(live) == (22, 0, 0)
+
+    def test_unseeded_counter_is_seeded_from_the_new_stock(self, live, db_session, shop):
+        ProductService(db_session).update(HOT_PRODUCT_ID, ProductSchema(
+            name="Console", price=499.0, stock=25, category_id=1
+        ))
+
+        assert live.redis_client.exists("inventory:stock:1") == 0
+        assert live.reserve(db_session, HOT_PRODUCT_ID, 1).remaining == 24
+
+
+def test_unavailable_hot_inventory_returns_503():
+    from main import create_fastapi_app
+
+    app = create_fastapi_app()
+
+    @app.get("/flash")
+    def flash():
+        raise HotInventoryUnavailableError("Hot inventory requires Redis")
+
+    response = TestClient(app).get("/flash")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
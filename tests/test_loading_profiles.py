@@ -0,0 +1,226 @@
+"""
+Tests for relationship loading profiles
+
+Tests verify:
+- Schema-derived eager loading keeps ORM reads at a constant query count
+- Named profiles load exactly the requested relationships
+- Service read paths (order history, order detail locks, order references,
+  product/category deletes) load through profiles under raiseload
+- raiseload default turns unplanned lazy loads into errors
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+
+from models.address import AddressModel
+from models.bill import BillModel
+from models.category import CategoryModel
+from models.client import ClientModel
+from models.enums import DeliveryMethod, PaymentType, Status
+from models.order import OrderModel
+from models.order_detail import OrderDetailModel
+from models.product import ProductModel
+from models.review import ReviewModel
+from repositories.bill_repository import BillRepository
+from repositories.client_repository import ClientRepository
+from repositories.loading_profiles import get_loading_profile
+from repositories.category_repository import CategoryRepository
+from repositories.order_repository import OrderRepository
+from repositories.product_repository import ProductRepository
+from services.order_detail_service import OrderDetailService
+from services.order_history_service import OrderHistoryService
+from services.order_service import OrderService
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def query_counter(engine):
+    """Count SELECT statements executed on the engine"""
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_execute)
+
+
+@pytest.fixture
+def shop(db_session):
+    """Three clients, each with two addresses and one order of two lines"""
+    category = CategoryModel(name="Electronics")
+    db_session.add(category)
+    db_session.flush()
+    products = [
+        ProductModel(name=f"Product {i}", price=10.0 + i, stock=10, category_id=category.id_key)
+        for i in range(2)
+    ]
+    db_session.add_all(products)
+    db_session.flush()
+
+    orders = []
+    for i in range(3):
+        client = ClientModel(name=f"Client {i}", lastname="Doe", email=f"c{i}@example.com")
+        db_session.add(client)
+        db_session.flush()
+        db_session.add_all([
+            AddressModel(street=f"Street {i}-{n}", city="Paris", client_id=client.id_key)
+            for n in range(2)
+        ])
+        bill = BillModel(
+            bill_number=f"B-{i}", date=date(2024, 1, 1), total=21.0,
+            payment_type=PaymentType.CASH, client_id=client.id_key,
+        )
+        db_session.add(bill)
+        db_session.flush()
+        order = OrderModel(
+            total=21.0, delivery_method=DeliveryMethod.HOME_DELIVERY, status=Status.PENDING,
+            client_id=client.id_key, bill_id=bill.id_key,
+        )
+        db_session.add(order)
+        db_session.flush()
+        db_session.add_all([
+            OrderDetailModel(quantity=1, price=p.price, order_id=order.id_key, product_id=p.id_key)
+            for p in products
+        ])
+        orders.append(order)
+
+    db_session.commit()
+    order_ids = [o.id_key for o in orders]
+    db_session.expunge_all()
+    return order_ids
+
+
+# ============================================================================
+# SCHEMA-DERIVED LOADING
+# ============================================================================
+
+class TestSchemaDerivedLoading:
+    """ORM fallback reads eager-load what the schema serializes"""
+
+    def test_find_all_query_count_does_not_grow_with_rows(self, db_session, shop, query_counter):
+        clients = ClientRepository(db_session).find_all()
+
+        assert len(clients) == 3
+        assert all(len(c.addresses) == 2 and len(c.orders) == 1 for c in clients)
+        # clients + addresses + orders, whatever the number of clients
+        assert len(query_counter) == 3
+
+    def test_find_many_uses_the_same_loading(self, db_session, shop, query_counter):
+        clients = ClientRepository(db_session).find_many([1, 2])
+
+        assert [len(c.addresses) for c in clients] == [2, 2]
+        assert len(query_counter) == 3
+
+    def test_nested_schemas_load_under_raiseload(self, db_session, shop):
+        """BillSchema -> client -> addresses/orders loads without lazy loads"""
+        bills = BillRepository(db_session).find_all()
+
+        assert [b.order.id_key for b in bills] == shop
+        assert all(len(b.client.addresses) == 2 for b in bills)
+
+
+# ============================================================================
+# NAMED PROFILES
+# ============================================================================
+
+class TestNamedProfiles:
+    """Services pick the loading shape per call"""
+
+    def test_order_with_details_and_products(self, db_session, shop, query_counter):
+        repo = OrderRepository(db_session)
+        stmt = repo.select_loaded("order_with_details_and_products").where(
+            OrderModel.id_key.in_(shop)
+        )
+
+        orders = db_session.scalars(stmt).unique().all()
+        names = [d.product.name for o in orders for d in o.order_details]
+
+        assert names.count("Product 0") == 3
+        assert len(query_counter) == 2
+
+    def test_get_entity_with_profile(self, db_session, shop):
+        order = OrderRepository(db_session).get_entity(shop[0], "order_with_client_and_bill")
+
+        assert order.client.name == "Client 0"
+        assert order.bill.bill_number == "B-0"
+
+    def test_unplanned_lazy_load_raises(self, db_session, shop):
+        order = OrderRepository(db_session).get_entity(shop[0], "order_with_details")
+
+        assert len(order.order_details) == 2
+        with pytest.raises(InvalidRequestError):
+            order.client
+
+    def test_raiseload_is_opt_in(self, db_session, shop, monkeypatch):
+        monkeypatch.setenv("ORM_RAISELOAD_DEFAULT", "false")
+
+        order = OrderRepository(db_session).get_entity(shop[0], "order_with_details")
+
+        assert order.client.name == "Client 0"
+
+    def test_unknown_or_mismatched_profile(self):
+        with pytest.raises(ValueError, match="Unknown loading profile"):
+            get_loading_profile(OrderModel, "order_with_everything")
+        with pytest.raises(ValueError, match="is for OrderModel"):
+            get_loading_profile(ClientModel, "order_with_details")
+
+
+# ============================================================================
+# SERVICE READ PATHS
+# ============================================================================
+
+class TestServiceProfiles:
+    """Hot service reads use named profiles and never lazy load"""
+
+    def test_order_history_page(self, db_session, shop, query_counter):
+        orders, _ = OrderHistoryService(db_session).get_page("c1@example.com")
+
+        assert [item.name for item in orders[0].items] == ["Product 0", "Product 1"]
+        # page of orders + lines with their products
+        assert len(query_counter) == 2
+
+    def test_lock_detail_reads_owner_and_product(self, db_session, shop, query_counter):
+        service = OrderDetailService(db_session)
+        detail = service._lock_detail(1)
+
+        assert service._owner_email(detail) == "c0@example.com"
+        assert detail.product.name == "Product 0"
+        assert len(query_counter) == 1
+
+    def test_order_references_in_one_query(self, db_session, shop, query_counter):
+        service = OrderService(db_session)
+
+        assert service._validate_references(1, 1) == "c0@example.com"
+        assert len(query_counter) == 1
+        # Bill of another client: the client is read separately
+        assert service._validate_references(2, 1) == "c1@example.com"
+
+    def test_product_delete_loads_dependents(self, db_session, shop):
+        product = ProductModel(name="Spare", price=1.0, stock=1, category_id=1)
+        db_session.add(product)
+        db_session.flush()
+        db_session.add(ReviewModel(rating=4.0, comment="Fine", product_id=product.id_key))
+        db_session.commit()
+        product_id = product.id_key
+        db_session.expunge_all()
+
+        ProductRepository(db_session).remove(product_id)
+
+        assert db_session.query(ReviewModel).count() == 0
+
+    def test_category_delete_loads_products(self, db_session, shop):
+        db_session.query(OrderDetailModel).delete()
+        db_session.commit()
+        db_session.expunge_all()
+
+        CategoryRepository(db_session).remove(1)
+
+        assert {p.category_id for p in db_session.query(ProductModel)} == {None}
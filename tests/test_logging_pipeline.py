@@ -0,0 +1,173 @@
+"""
+Tests for the queued, non-blocking log pipeline
+
+Tests verify:
+- Full queues drop records (newest or oldest) and count them instead of blocking,
+  also in the log_records_dropped_total metric
+- Installed pipelines move handler I/O off the logging thread
+- stop() flushes queued records
+- Request context is captured on the logging thread; JSON output carries it
+"""
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from config.logging_config import BoundedQueueHandler, JsonFormatter, LogPipeline
+from middleware.request_id_middleware import RequestContext, RequestIDFilter, request_context
+
+
+def record(message, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 0, message, None, None)
+
+
+def dropped_metric(handler, level):
+    return REGISTRY.get_sample_value("log_records_dropped_total", {"handler": handler, "level": level}) or 0.0
+
+
+class BlockingHandler(logging.Handler):
+    """Handler stuck on I/O until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.io_done = threading.Event()
+        self.messages = []
+
+    def emit(self, log_record):
+        self.io_done.wait()
+        self.messages.append(log_record.getMessage())
+
+
+@pytest.fixture
+def root_handlers():
+    root = logging.getLogger()
+    saved = root.handlers[:]
+    yield root
+    root.handlers = saved
+
+
+# ============================================================================
+# QUEUE HANDLER
+# ============================================================================
+
+class TestBoundedQueueHandler:
+
+    def test_drop_new_keeps_queued_records(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2))
+
+        for message, level in [("a", logging.INFO), ("b", logging.INFO), ("c", logging.ERROR)]:
+            handler.handle(record(message, level))
+
+        assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["a", "b"]
+        assert handler.dropped == {"ERROR": 1}
+
+    def test_drop_oldest_keeps_newest_records(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), drop_policy="drop_oldest")
+
+        for message in "abc":
+            handler.handle(record(message))
+
+        assert [handler.queue.get_nowait().getMessage() for _ in range(2)] == ["b", "c"]
+        assert handler.dropped == {"INFO": 1}
+
+    def test_unknown_policy_is_rejected(self):
+        with pytest.raises(ValueError):
+            BoundedQueueHandler(queue.Queue(), drop_policy="block")
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class TestLogPipeline:
+
+    def test_logging_does_not_wait_for_handler_io(self, root_handlers):
+        slow = BlockingHandler()
+        slow.set_name("slow")
+        root_handlers.handlers = [slow]
+        pipeline = LogPipeline()
+        pipeline.install(queue_size=3)
+        logger = logging.getLogger("tests.logging_pipeline")
+        before = dropped_metric("slow", "WARNING")
+
+        start = time.perf_counter()
+        for i in range(5):
+            logger.warning(f"record {i}")
+        elapsed = time.perf_counter() - start
+        dropped = pipeline.dropped()
+
+        slow.io_done.set()
+        pipeline.stop()
+
+        assert elapsed < 0.5
+        assert slow.messages[0] == "record 0"
+        assert len(slow.messages) + dropped["slow"]["WARNING"] == 5
+        assert dropped_metric("slow", "WARNING") - before == dropped["slow"]["WARNING"]
+
+    def test_handler_levels_are_kept(self, root_handlers):
+        errors = BlockingHandler()
+        errors.io_done.set()
+        errors.setLevel(logging.ERROR)
+        root_handlers.handlers = [errors]
+        pipeline = LogPipeline()
+        pipeline.install()
+        logger = logging.getLogger("tests.logging_pipeline")
+
+        logger.warning("skipped")
+        logger.error("kept")
+        pipeline.stop()
+
+        assert errors.messages == ["kept"]
+
+    def test_request_context_is_read_on_logging_thread(self, root_handlers):
+        captured = BlockingHandler()
+        captured.io_done.set()
+        captured.addFilter(RequestIDFilter())
+        captured.emit = lambda log_record: captured.messages.append(log_record.request_id)
+        root_handlers.handlers = [captured]
+        pipeline = LogPipeline()
+        pipeline.install()
+
+        token = request_context.set(RequestContext("abc-123", {"type": "http"}))
+        try:
+            logging.getLogger("tests.logging_pipeline").warning("in request")
+        finally:
+            request_context.reset(token)
+        pipeline.stop()
+
+        assert captured.messages == ["abc-123"]
+
+
+# ============================================================================
+# JSON FORMAT
+# ============================================================================
+
+class TestJsonFormatter:
+
+    def test_fields(self):
+        log_record = record("GET /items 200")
+        log_record.request_id, log_record.route, log_record.user_id = "abc-123", "/items", None
+        log_record.status, log_record.latency_ms = 200, 1.5
+
+        entry = json.loads(JsonFormatter().format(log_record))
+
+        assert entry["message"] == "GET /items 200"
+        assert entry["level"] == "INFO"
+        assert (entry["request_id"], entry["route"], entry["status"], entry["latency_ms"]) == ("abc-123", "/items", 200, 1.5)
+        assert "user_id" not in entry
+
+    def test_exception_is_one_line(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            log_record = logging.LogRecord("test", logging.ERROR, __file__, 0, "failed", None, sys.exc_info())
+
+        output = JsonFormatter().format(log_record)
+
+        assert "\n" not in output
+        assert "ValueError: boom" in json.loads(output)["exception"]
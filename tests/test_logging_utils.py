@@ -6,6 +6,7 @@ exposure of sensitive information in logs.
 """
 import pytest
 import logging
+from unittest.mock import Mock, patch
 from utils.logging_utils import (
     sanitize_string,
     get_error_id,
@@ -480,6 +481,39 @@ class TestP11SanitizedLogger:
         assert hasattr(logger, 'debug')
 
 
+    def test_disabled_level_skips_formatting_and_sanitizing(self, mock_logger):
+        """Disabled levels cost a level check: no formatting, no redaction"""
+        mock_logger.setLevel(logging.INFO)
+        sanitized_logger = SanitizedLogger(mock_logger)
+        key = Mock(__str__=Mock(return_value="products:1"))
+
+        with patch("utils.logging_utils.sanitize_string") as sanitize:
+            sanitized_logger.debug("Cache HIT: %s", key)
+
+        sanitize.assert_not_called()
+        key.__str__.assert_not_called()
+
+
+    def test_lazy_arguments_are_sanitized(self, mock_logger, caplog):
+        """Test %-style arguments are merged before redaction"""
+        sanitized_logger = SanitizedLogger(mock_logger)
+
+        with caplog.at_level(logging.INFO):
+            sanitized_logger.info("Login with %s", "password=secret123")
+
+        assert caplog.records[0].getMessage() == "Login with [PASSWORD_REDACTED]"
+
+
+    def test_filter_is_added_once(self, mock_logger):
+        """Test wrapping the same logger twice keeps one filter"""
+        mock_logger.filters = []
+
+        SanitizedLogger(mock_logger)
+        SanitizedLogger(mock_logger)
+
+        assert len(mock_logger.filters) == 1
+
+
 # ============================================================================
 # P11: INTEGRATION TESTS
 # ============================================================================
@@ -595,13 +629,16 @@ create_user_safe_error(): 2 tests
 ✅ test_create_user_safe_error_structure
 ✅ test_create_user_safe_error_default_operation
 
-SanitizedLogger: 6 tests
+SanitizedLogger: 9 tests
 ✅ test_sanitized_logger_error
 ✅ test_sanitized_logger_info
 ✅ test_sanitized_logger_debug
 ✅ test_sanitized_logger_warning
 ✅ test_sanitized_logger_critical
 ✅ test_get_sanitized_logger_factory
+✅ test_disabled_level_skips_formatting_and_sanitizing
+✅ test_lazy_arguments_are_sanitized
+✅ test_filter_is_added_once
 
 Integration Tests: 2 tests
 ✅ test_complete_error_logging_workflow
@@ -2,13 +2,13 @@
 Tests for Medium Priority Fixes (P8, P10, P11, P12)
 
 Tests verify the implementation of:
-- P8: Rate limiter atomic pipeline verification
+- P8: Rate limiter atomic check
 - P10: Product deletion with sales history validation
 - P11: Sanitized logging (tested separately in test_logging_utils.py)
 - P12: Health check with thresholds
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker, Session
@@ -49,125 +49,93 @@ def db_session():
 
 @pytest.fixture
 def mock_redis():
-    """Mock Redis client for rate limiter tests"""
-    redis_mock = Mock()
-    redis_mock.ping.return_value = True
-    redis_mock.set.return_value = True
-    redis_mock.get.return_value = None
-    redis_mock.incr.return_value = 1
-    redis_mock.expire.return_value = True
-    redis_mock.delete.return_value = 1
-
-    # Pipeline mock
-    pipeline_mock = Mock()
-    pipeline_mock.incr.return_value = None
-    pipeline_mock.expire.return_value = None
-    pipeline_mock.execute.return_value = [1, 1]  # [incr result, expire result]
-    redis_mock.pipeline.return_value = pipeline_mock
-
+    """Mock async Redis client for rate limiter tests (the GCRA script is mocked)"""
+    redis_mock = MagicMock()
+    script_mock = AsyncMock(return_value=[1, 99, 600, 0])  # [allowed, remaining, reset ms, retry ms]
+    redis_mock.register_script.return_value = script_mock
     return redis_mock
 
 
 @pytest.fixture
 def test_app_with_redis(mock_redis):
     """Create test FastAPI app with mocked Redis"""
-    with patch('middleware.rate_limiter.get_redis_client', return_value=mock_redis):
+    with patch('middleware.rate_limiter.get_async_redis_client', return_value=mock_redis):
         app = create_fastapi_app()
         client = TestClient(app)
         yield client, mock_redis
 
 
 # ============================================================================
-# P8: RATE LIMITER ATOMIC PIPELINE VERIFICATION
+# P8: RATE LIMITER ATOMIC SCRIPT
 # ============================================================================
 
 class TestP8RateLimiterAtomicOperations:
     """
-    Test P8: Rate limiter pipeline verification
+    Test P8: Rate limiter atomic check
 
     Validates that:
-    1. Pipeline results are verified
-    2. Incomplete pipeline results are handled
-    3. Failed expire operations are recovered
+    1. Each request is checked with a single atomic script call
+    2. Malformed results and Redis errors fail open
+    3. Exceeded limits are enforced with Retry-After
     """
 
-    def test_rate_limiter_pipeline_success(self, test_app_with_redis):
-        """Test normal pipeline operation with successful incr and expire"""
+    def test_rate_limiter_script_success(self, test_app_with_redis):
+        """Test normal operation: one script call, limit headers set"""
         client, mock_redis = test_app_with_redis
-
-        # Setup: Pipeline returns both results successfully
-        pipeline_mock = mock_redis.pipeline.return_value
-        pipeline_mock.execute.return_value = [1, 1]  # [incr=1, expire=success]
+        script_mock = mock_redis.register_script.return_value
 
         # Execute
-        response = client.get("/products")
+        response = client.get("/docs")
 
         # Verify
-        assert response.status_code in [200, 500]  # May fail due to DB, but not rate limited
-        assert "X-RateLimit-Limit" in response.headers
+        assert response.status_code == 200  # Not rate limited
+        assert response.headers["X-RateLimit-Limit"] == "100"
+        assert response.headers["X-RateLimit-Remaining"] == "99"
+        assert response.headers["X-RateLimit-Reset"] == "1"
+        assert script_mock.await_count == 1
 
 
-    def test_rate_limiter_pipeline_incomplete_results(self, test_app_with_redis):
+    def test_rate_limiter_incomplete_results(self, test_app_with_redis):
         """
-        Test P8 FIX: Pipeline returns incomplete results
+        Test script returns incomplete results
 
-        Verifies that incomplete pipeline results trigger fail-open behavior
+        Verifies that malformed results trigger fail-open behavior
         """
         client, mock_redis = test_app_with_redis
-
-        # Setup: Pipeline returns incomplete results (only 1 instead of 2)
-        pipeline_mock = mock_redis.pipeline.return_value
-        pipeline_mock.execute.return_value = [1]  # INCOMPLETE - missing expire result
+        mock_redis.register_script.return_value.return_value = [0]
 
         # Execute
-        response = client.get("/products")
+        response = client.get("/docs")
 
         # Verify: Should fail open (allow request)
-        assert response.status_code in [200, 500]  # Not 429 (rate limited)
+        assert response.status_code == 200  # Not 429 (rate limited)
+        assert "X-RateLimit-Limit" not in response.headers
 
 
-    def test_rate_limiter_expire_failure_recovery(self, test_app_with_redis):
-        """
-        Test P8 FIX: Expire operation fails, triggers recovery
-
-        Verifies that when expire fails (returns 0), the system:
-        1. Detects the failure
-        2. Attempts to force expire
-        3. Deletes key if force expire fails
-        """
+    def test_rate_limiter_redis_error_fails_open(self, test_app_with_redis):
+        """Test Redis errors during the check allow the request"""
         client, mock_redis = test_app_with_redis
-
-        # Setup: Pipeline returns expire failure (0)
-        pipeline_mock = mock_redis.pipeline.return_value
-        pipeline_mock.execute.return_value = [1, 0]  # [incr=1, expire=FAILED]
-
-        # Force expire also fails
-        mock_redis.expire.return_value = False
+        mock_redis.register_script.return_value.side_effect = ConnectionError("redis down")
 
         # Execute
-        response = client.get("/products")
+        response = client.get("/docs")
 
         # Verify: Should still allow request (not return 429)
-        assert response.status_code in [200, 500]
+        assert response.status_code == 200
 
-        # Verify recovery was attempted
-        # (In real scenario, delete would be called, but hard to verify in integration test)
 
-
-    def test_rate_limiter_exceeds_limit_with_valid_pipeline(self, test_app_with_redis):
-        """Test that valid pipeline operations still enforce rate limits"""
+    def test_rate_limiter_exceeds_limit(self, test_app_with_redis):
+        """Test that a denied check enforces the rate limit"""
         client, mock_redis = test_app_with_redis
-
-        # Setup: Pipeline returns high counter (exceeds limit)
-        pipeline_mock = mock_redis.pipeline.return_value
-        pipeline_mock.execute.return_value = [101, 1]  # [incr=101, expire=success]
+        mock_redis.register_script.return_value.return_value = [0, 0, 59400, 600]
 
         # Execute
-        response = client.get("/products")
+        response = client.get("/docs")
 
         # Verify: Should be rate limited
         assert response.status_code == 429
         assert "Rate limit exceeded" in response.json()["detail"]
+        assert response.headers["Retry-After"] == "1"
 
 
 # ============================================================================
@@ -630,10 +598,10 @@ class TestP12HealthCheckThresholds:
 TEST COVERAGE SUMMARY:
 
 P8 (Rate Limiter Atomic Operations): 4 tests
-✅ test_rate_limiter_pipeline_success
-✅ test_rate_limiter_pipeline_incomplete_results
-✅ test_rate_limiter_expire_failure_recovery
-✅ test_rate_limiter_exceeds_limit_with_valid_pipeline
+✅ test_rate_limiter_script_success
+✅ test_rate_limiter_incomplete_results
+✅ test_rate_limiter_redis_error_fails_open
+✅ test_rate_limiter_exceeds_limit
 
 P10 (Product Deletion Validation): 3 tests
 ✅ test_delete_product_without_sales_history_success
@@ -0,0 +1,170 @@
+"""
+Tests for the Prometheus metrics
+
+Tests verify:
+- Requests are counted and timed by route template, not raw path
+- Rate limit rejections, cache lookups and pool connections are tracked
+- /metrics aggregates every worker in multi-process mode
+"""
+import os
+import subprocess
+import sys
+import textwrap
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from controllers.metrics import router as metrics_router
+from middleware.request_pipeline import RequestPipelineMiddleware
+from services.cache_service import CacheService
+from utils.metrics import instrument_engine
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def script():
+    return AsyncMock(return_value=[1, 4, 12000, 0])
+
+
+@pytest.fixture
+def api(script):
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = script
+
+    app = FastAPI()
+
+    @app.get("/widgets/{widget_id}")
+    def widget(widget_id: int):
+        return {"widget_id": widget_id}
+
+    app.include_router(metrics_router, prefix="/metrics")
+    app.add_middleware(RequestPipelineMiddleware, calls=5, period=60, redis_client=redis_client)
+    return TestClient(app)
+
+
+# ============================================================================
+# REQUEST METRICS
+# ============================================================================
+
+class TestRequestMetrics:
+
+    def test_requests_are_labelled_by_route_template(self, api):
+        labels = {"method": "GET", "route": "/widgets/{widget_id}"}
+        before = sample("http_requests_total", status="200", **labels)
+        before_count = sample("http_request_duration_seconds_count", **labels)
+
+        api.get("/widgets/1")
+        api.get("/widgets/2")
+
+        assert sample("http_requests_total", status="200", **labels) == before + 2
+        assert sample("http_request_duration_seconds_count", **labels) == before_count + 2
+        assert sample("http_requests_in_progress") == 0
+
+    def test_unmatched_requests_share_one_label(self, api):
+        before = sample("http_requests_total", method="GET", route="none", status="404")
+
+        api.get("/missing/1")
+        api.get("/missing/2")
+
+        assert sample("http_requests_total", method="GET", route="none", status="404") == before + 2
+
+    def test_rate_limit_rejections(self, api, script):
+        script.return_value = [0, 0, 60000, 2500]
+        before = sample("rate_limit_rejections_total", limit="global")
+
+        response = api.get("/widgets/1")
+
+        assert response.status_code == 429
+        assert sample("rate_limit_rejections_total", limit="global") == before + 1
+
+    def test_metrics_endpoint(self, api):
+        api.get("/widgets/1")
+
+        response = api.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_requests_total{method="GET",route="/widgets/{widget_id}",status="200"}' in response.text
+
+
+# ============================================================================
+# CACHE AND POOL METRICS
+# ============================================================================
+
+class TestCacheAndPoolMetrics:
+
+    def test_cache_lookups(self):
+        cache = CacheService()
+        cache.enabled = True
+        cache.redis_client = MagicMock()
+        cache.redis_client.get.side_effect = ['{"a": 1}', None]
+        cache.redis_client.mget.return_value = ['1', None, None]
+        before = {result: sample("cache_requests_total", result=result) for result in ("hit", "miss")}
+
+        cache.get("k1")
+        cache.get("k2")
+        cache.get_many(["k3", "k4", "k5"])
+
+        assert sample("cache_requests_total", result="hit") == before["hit"] + 2
+        assert sample("cache_requests_total", result="miss") == before["miss"] + 3
+
+    def test_pool_gauges_follow_connections(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+        instrument_engine(engine)
+        instrument_engine(engine)
+        before = sample("db_pool_connections_checked_out")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            in_use = sample("db_pool_connections_checked_out")
+        engine.dispose()
+
+        assert in_use == before + 1
+        assert sample("db_pool_connections_checked_out") == before
+
+
+# ============================================================================
+# MULTI-PROCESS
+# ============================================================================
+
+WORKER = textwrap.dedent("""
+    from utils.metrics import request_metrics
+    for _ in range({count}):
+        request_metrics.start()
+        request_metrics.finish("GET", "/products/{{id_key}}", 200, 0.01)
+""")
+
+SCRAPE = textwrap.dedent("""
+    from utils.metrics import render_metrics
+    print(render_metrics()[0].decode())
+""")
+
+
+def run(code, env):
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def test_workers_are_aggregated(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+    run(WORKER.format(count=2), env)
+    run(WORKER.format(count=3), env)
+    output = run(SCRAPE, env)
+
+    assert 'http_requests_total{method="GET",route="/products/{id_key}",status="200"} 5.0' in output
+    assert 'http_request_duration_seconds_count{method="GET",route="/products/{id_key}"} 5.0' in output
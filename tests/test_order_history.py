@@ -0,0 +1,214 @@
+"""
+Tests for the paginated, cached order history (/orders/me)
+
+Tests verify:
+- Cursor pagination walks orders newest first without gaps or repeats
+- Lines are loaded in one IN query per page
+- Pages are cached in one hash per user and dropped on that user's order
+  writes with one DEL (no KEYS scan)
+- Malformed cursors are rejected with 400
+"""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from config.database import get_db
+from controllers.auth_controller import get_current_user
+from controllers.order_history_controller import router
+from models.bill import BillModel
+from models.category import CategoryModel
+from models.client import ClientModel
+from models.enums import DeliveryMethod, Status
+from models.order import OrderModel
+from models.order_detail import OrderDetailModel
+from models.product import ProductModel
+from schemas.auth_schema import UserPublic
+from schemas.order_detail_schema import OrderDetailSchema
+from services.cache_service import CacheService
+from services.order_detail_service import OrderDetailService
+from services.order_history_service import OrderHistoryService
+from utils.cursor import decode_cursor, encode_cursor
+
+EMAIL = "jane@example.com"
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def history(db_session):
+    """Five orders with one line each (two share a date) and one empty order"""
+    category = CategoryModel(name="Books")
+    client = ClientModel(name="Jane", lastname="Doe", email=EMAIL)
+    other = ClientModel(name="John", lastname="Roe", email="john@example.com")
+    db_session.add_all([category, client, other])
+    db_session.flush()
+    product = ProductModel(name="Novel", price=12.0, stock=100, category_id=category.id_key)
+    bill = BillModel(bill_number="B-1", total=0, client_id=client.id_key)
+    db_session.add_all([product, bill])
+    db_session.flush()
+
+    dates = [START, START + timedelta(days=1), START + timedelta(days=1),
+             START + timedelta(days=2), START + timedelta(days=3)]
+    for owner, date in [(client, d) for d in dates] + [(other, START)]:
+        order = OrderModel(
+            date=date, total=12.0, delivery_method=DeliveryMethod.DRIVE_THRU, status=Status.PENDING,
+            client_id=owner.id_key, bill_id=bill.id_key,
+        )
+        order.order_details = [OrderDetailModel(product_id=product.id_key, quantity=1, price=12.0)]
+        db_session.add(order)
+    db_session.add(OrderModel(
+        date=START + timedelta(days=9), total=0, delivery_method=DeliveryMethod.DRIVE_THRU,
+        status=Status.PENDING, client_id=client.id_key, bill_id=bill.id_key,
+    ))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def fake_cache(memory_cache):
+    with patch("services.order_history_service.cache_service", memory_cache):
+        yield memory_cache
+
+
+@pytest.fixture
+def api_client(db_session, fake_cache):
+    app = FastAPI()
+    app.include_router(router, prefix="/orders")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: UserPublic(
+        id_key=1, email=EMAIL, is_active=True, is_admin=False
+    )
+    return TestClient(app)
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+
+class TestOrderHistoryPagination:
+
+    def test_walks_pages_newest_first(self, api_client, history):
+        seen, cursor = [], None
+        while True:
+            response = api_client.get("/orders/me", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+            assert response.status_code == 200
+            seen.extend(order["id_key"] for order in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        # Orders 2 and 3 share a date: ties are broken by id, descending
+        assert seen == [5, 4, 3, 2, 1]
+
+    def test_orders_carry_their_lines(self, api_client, history):
+        order = api_client.get("/orders/me", params={"limit": 1}).json()[0]
+
+        assert order["items"] == [{"product_id": 1, "name": "Novel", "quantity": 1, "unit_price": 12.0}]
+
+    def test_two_queries_per_page(self, api_client, history, engine):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            api_client.get("/orders/me", params={"limit": 3})
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 2
+
+    def test_invalid_cursor_is_400(self, api_client, history):
+        response = api_client.get("/orders/me", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("values", [
+        ("2024-01-01T00:00:00", 7),
+        (START, "7"),
+        (START, True),
+        ({"$dt": "yesterday"}, 7),
+    ])
+    def test_tampered_cursor_is_400(self, api_client, history, values):
+        response = api_client.get("/orders/me", params={"cursor": encode_cursor(*values)})
+
+        assert response.status_code == 400
+
+    def test_cursor_round_trip(self):
+        assert decode_cursor(encode_cursor(START, 7), datetime, int) == (START, 7)
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(START), datetime, int)
+
+
+# ============================================================================
+# CACHING
+# ============================================================================
+
+class TestOrderHistoryCache:
+
+    def test_second_request_is_served_from_cache(self, api_client, history, engine, fake_cache):
+        first = api_client.get("/orders/me").json()
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            second = api_client.get("/orders/me").json()
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert second == first
+        assert statements == []
+        assert len(fake_cache.store) == 1
+
+    def test_order_detail_write_invalidates_owner_history(self, api_client, history, fake_cache):
+        api_client.get("/orders/me")
+
+        OrderDetailService(history).save(OrderDetailSchema(order_id=5, product_id=1, quantity=2))
+
+        assert fake_cache.store == {}
+        order = api_client.get("/orders/me", params={"limit": 1}).json()[0]
+        assert [item["quantity"] for item in order["items"]] == [1, 2]
+
+    def test_writes_invalidate_without_key_scans(self, api_client, history, fake_cache):
+        fake_cache.delete_pattern = Mock(side_effect=AssertionError("KEYS scan on a write"))
+        service = OrderDetailService(history)
+        detail = service.save(OrderDetailSchema(order_id=5, product_id=1, quantity=2))
+
+        api_client.get("/orders/me")
+        service.update(detail.id_key, OrderDetailSchema(order_id=5, product_id=1, quantity=3))
+        assert fake_cache.store == {}
+
+        api_client.get("/orders/me")
+        service.delete(detail.id_key)
+        assert fake_cache.store == {}
+
+    def test_moved_line_invalidates_both_owners(self, history, fake_cache):
+        history_service = OrderHistoryService(history)
+        history_service.get_page(EMAIL)
+        history_service.get_page("john@example.com")
+        detail = OrderDetailService(history).save(OrderDetailSchema(order_id=5, product_id=1, quantity=1))
+        history_service.get_page(EMAIL)
+
+        OrderDetailService(history).update(detail.id_key, OrderDetailSchema(order_id=6, product_id=1, quantity=1))
+
+        assert fake_cache.store == {}
+
+    def test_user_pages_share_one_hash(self):
+        cache = CacheService()
+        cache.enabled = True
+        cache.redis_client = MagicMock()
+
+        cache.set_field("order_history:abc", "cursor::limit:10", {"orders": []}, ttl=60)
+        cache.delete_many(["order_history:abc", "order_history:def"])
+
+        pipe = cache.redis_client.pipeline.return_value
+        pipe.hset.assert_called_once_with("order_history:abc", "cursor::limit:10", '{"orders": []}')
+        pipe.expire.assert_called_once_with("order_history:abc", 60)
+        cache.redis_client.delete.assert_called_once_with("order_history:abc", "order_history:def")
+        cache.redis_client.keys.assert_not_called()
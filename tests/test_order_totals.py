@@ -0,0 +1,189 @@
+"""
+Tests for server-maintained order totals
+
+Tests verify:
+- Order detail create/update/delete apply the line amount delta to the order total
+- Failed writes and mismatching prices leave the total untouched
+- Orders start at 0 and the total cannot be written through the order API
+- The repair job resets drifted totals to the sum of the details
+"""
+from datetime import date
+
+import pytest
+
+from models.bill import BillModel
+from models.category import CategoryModel
+from models.client import ClientModel
+from models.enums import DeliveryMethod, PaymentType, Status
+from models.order import OrderModel
+from models.order_detail import OrderDetailModel
+from models.product import ProductModel
+from repositories.base_repository_impl import InstanceNotFoundError
+from repositories.order_repository import OrderRepository
+from schemas.order_detail_schema import OrderDetailSchema
+from schemas.order_schema import OrderSchema
+from services.order_detail_service import OrderDetailService
+from services.order_service import OrderService
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def shop(db_session):
+    """Two empty orders and two products (10.0 and 2.5, 10 units each)"""
+    category = CategoryModel(name="Electronics")
+    client = ClientModel(name="Jane", lastname="Doe", email="jane@example.com")
+    db_session.add_all([category, client])
+    db_session.flush()
+    db_session.add_all([
+        ProductModel(name="Mouse", price=10.0, stock=10, category_id=category.id_key),
+        ProductModel(name="Cable", price=2.5, stock=10, category_id=category.id_key),
+    ])
+    bill = BillModel(
+        bill_number="B-1", date=date.today(), total=0, payment_type=PaymentType.CARD, client_id=client.id_key
+    )
+    db_session.add(bill)
+    db_session.flush()
+    db_session.add_all([
+        OrderModel(
+            total=0, delivery_method=DeliveryMethod.HOME_DELIVERY, status=Status.PENDING,
+            client_id=client.id_key, bill_id=bill.id_key,
+        )
+        for _ in range(2)
+    ])
+    db_session.commit()
+    return db_session
+
+
+def totals(db_session):
+    db_session.expire_all()
+    return [o.total for o in db_session.query(OrderModel).order_by(OrderModel.id_key)]
+
+
+def add_line(db_session, order_id, product_id, quantity):
+    return OrderDetailService(db_session).save(
+        OrderDetailSchema(order_id=order_id, product_id=product_id, quantity=quantity)
+    )
+
+
+# ============================================================================
+# INCREMENTAL TOTALS
+# ============================================================================
+
+class TestIncrementalTotals:
+
+    def test_create_adds_line_amount(self, shop):
+        add_line(shop, 1, 1, 2)
+        add_line(shop, 1, 2, 4)
+
+        assert totals(shop) == [pytest.approx(30.0), 0]
+
+    def test_update_applies_difference(self, shop):
+        detail = add_line(shop, 1, 1, 2)
+
+        OrderDetailService(shop).update(detail.id_key, OrderDetailSchema(
+            order_id=1, product_id=1, quantity=5, price=10.0
+        ))
+
+        assert totals(shop) == [pytest.approx(50.0), 0]
+
+    def test_update_moving_line_adjusts_both_orders(self, shop):
+        detail = add_line(shop, 1, 2, 4)
+
+        OrderDetailService(shop).update(detail.id_key, OrderDetailSchema(
+            order_id=2, product_id=2, quantity=4, price=2.5
+        ))
+
+        assert totals(shop) == [pytest.approx(0.0), pytest.approx(10.0)]
+
+    def test_delete_subtracts_line_amount(self, shop):
+        kept = add_line(shop, 1, 1, 1)
+        removed = add_line(shop, 1, 2, 2)
+
+        OrderDetailService(shop).delete(removed.id_key)
+
+        assert kept.price == 10.0
+        assert totals(shop) == [pytest.approx(10.0), 0]
+
+    def test_failed_write_leaves_total_untouched(self, shop):
+        with pytest.raises(ValueError, match="Insufficient stock"):
+            add_line(shop, 1, 1, 50)
+
+        assert totals(shop) == [0, 0]
+
+    def test_update_rejects_price_manipulation(self, shop):
+        detail = add_line(shop, 1, 1, 2)
+
+        with pytest.raises(ValueError, match="Price mismatch"):
+            OrderDetailService(shop).update(detail.id_key, OrderDetailSchema(
+                order_id=1, product_id=1, quantity=2, price=0.01
+            ))
+
+        assert totals(shop) == [pytest.approx(20.0), 0]
+
+    def test_update_to_other_product_takes_its_price(self, shop):
+        detail = add_line(shop, 1, 1, 2)
+
+        OrderDetailService(shop).update(detail.id_key, OrderDetailSchema(
+            order_id=1, product_id=2, quantity=2
+        ))
+
+        assert totals(shop) == [pytest.approx(5.0), 0]
+
+    def test_update_to_other_product_moves_stock(self, shop):
+        detail = add_line(shop, 1, 1, 2)
+
+        OrderDetailService(shop).update(detail.id_key, OrderDetailSchema(
+            order_id=1, product_id=2, quantity=3
+        ))
+
+        shop.expire_all()
+        assert [p.stock for p in shop.query(ProductModel).order_by(ProductModel.id_key)] == [10, 7]
+        assert totals(shop) == [pytest.approx(7.5), 0]
+
+    def test_order_total_is_not_client_writable(self, shop):
+        service = OrderService(shop)
+        order = service.save(OrderSchema(
+            total=500.0, delivery_method=DeliveryMethod.HOME_DELIVERY,
+            status=Status.PENDING, client_id=1, bill_id=1,
+        ))
+        add_line(shop, order.id_key, 1, 1)
+
+        service.update(order.id_key, OrderSchema(
+            total=999.0, delivery_method=DeliveryMethod.HOME_DELIVERY,
+            status=Status.DELIVERED, client_id=1, bill_id=1,
+        ))
+
+        assert order.total == 0
+        assert totals(shop) == [0, 0, pytest.approx(10.0)]
+
+    def test_unknown_order(self, shop):
+        with pytest.raises(InstanceNotFoundError, match="Order with id 9"):
+            OrderRepository(shop).adjust_total(9, 1.0)
+
+
+# ============================================================================
+# REPAIR JOB
+# ============================================================================
+
+class TestRepairTotals:
+
+    def test_resets_drifted_totals_in_batches(self, shop):
+        shop.add_all([
+            OrderDetailModel(order_id=1, product_id=1, quantity=3, price=10.0),
+            OrderDetailModel(order_id=1, product_id=2, quantity=2, price=2.5),
+        ])
+        shop.query(OrderModel).filter(OrderModel.id_key == 2).update({"total": 999.0})
+        shop.commit()
+
+        corrected = OrderService(shop).repair_totals(batch_size=1)
+
+        assert corrected == 2
+        assert totals(shop) == [pytest.approx(35.0), pytest.approx(0.0)]
+
+    def test_consistent_totals_are_not_rewritten(self, shop):
+        add_line(shop, 1, 1, 2)
+
+        assert OrderService(shop).repair_totals() == 0
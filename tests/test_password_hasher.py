@@ -0,0 +1,132 @@
+"""
+Tests for bcrypt offloading to the bounded password hashing pool
+
+Tests verify:
+- Hashing and verification run in worker processes
+- A saturated pool rejects work instead of queueing it
+- Logins upgrade hashes made with an outdated bcrypt cost
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from config.database import get_db
+from controllers import auth_controller
+from models.user import UserModel
+from services.password_hasher import PasswordHasher, PasswordHasherBusyError
+
+OLD_COST = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+NEW_COST = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def db_session(db_session):
+    """Shared test session with one user hashed at the old cost"""
+    db_session.add(UserModel(email="ana@example.com", name="Ana", password_hash=OLD_COST.hash("secret123"),
+                             is_active=True, is_admin=False))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def hasher():
+    # In-process executor so the patched cost factor applies to the workers
+    executor = ThreadPoolExecutor(max_workers=2)
+    with patch("utils.security.pwd_context", NEW_COST), \
+            patch.object(auth_controller, "password_hasher", PasswordHasher(max_pending=2, executor=executor)) as h:
+        yield h
+    executor.shutdown()
+
+
+@pytest.fixture
+def api(db_session, hasher):
+    app = FastAPI()
+    app.include_router(auth_controller.router, prefix="/auth")
+    app.dependency_overrides[get_db] = lambda: db_session
+    return TestClient(app)
+
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+class TestPasswordHasher:
+
+    def test_hash_and_verify_in_worker_processes(self):
+        hasher = PasswordHasher(max_workers=1)
+        try:
+            hashed = hasher.hash("secret123")
+
+            assert hasher.verify("secret123", hashed)
+            assert not hasher.verify("wrong", hashed)
+            assert hasher.pending == 0
+        finally:
+            hasher.shutdown()
+
+    def test_saturated_pool_rejects(self):
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        hasher = PasswordHasher(max_pending=1, executor=executor)
+        blocked = threading.Thread(target=hasher._run, args=(release.wait,))
+        blocked.start()
+        try:
+            while hasher.pending == 0:
+                pass
+            with pytest.raises(PasswordHasherBusyError):
+                hasher.hash("secret123")
+        finally:
+            release.set()
+            blocked.join()
+            executor.shutdown()
+
+        assert hasher.pending == 0
+
+    def test_timeout_is_reported_as_busy(self):
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        hasher = PasswordHasher(timeout=0.01, executor=executor)
+        try:
+            with pytest.raises(PasswordHasherBusyError):
+                hasher._run(release.wait)
+        finally:
+            release.set()
+            executor.shutdown()
+
+
+# ============================================================================
+# LOGIN / REGISTER
+# ============================================================================
+
+class TestAuthEndpoints:
+
+    def test_login_upgrades_outdated_hash(self, api, db_session):
+        response = api.post("/auth/login", json={"email": "ana@example.com", "password": "secret123"})
+
+        assert response.status_code == 200
+        stored = db_session.query(UserModel).one().password_hash
+        assert stored.startswith("$2b$05$")
+        assert NEW_COST.verify("secret123", stored)
+
+    def test_wrong_password_keeps_hash(self, api, db_session):
+        before = db_session.query(UserModel).one().password_hash
+
+        response = api.post("/auth/login", json={"email": "ana@example.com", "password": "wrong-pass"})
+
+        assert response.status_code == 401
+        assert db_session.query(UserModel).one().password_hash == before
+
+    def test_register_hashes_in_pool(self, api, hasher):
+        with patch.object(hasher, "_run", wraps=hasher._run) as run:
+            response = api.post("/auth/register", json={"email": "bo@example.com", "password": "secret123"})
+
+        assert response.status_code == 201
+        assert run.call_count == 1
@@ -0,0 +1,376 @@
+"""
+Tests for the pure ASGI rate limiter
+
+Tests verify:
+- One GCRA script call per request, keyed by client IP
+- Limit headers are added without buffering streamed responses
+- Preflight, health check and admin requests bypass the limiter
+- Non-HTTP scopes pass straight through
+- Local mode: per-worker buckets with batched sync, bounded overshoot and
+  bounded memory (stale windows pruned, bucket count capped)
+- Route policies are compiled once and checked with the global limit
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from controllers.order_detail_controller import OrderDetailController
+from middleware.endpoint_rate_limiter import RateLimitPolicy, RoutePolicyTable, limit_routes, order_rate_limit
+from middleware.rate_limiter import LocalRateLimiter, RateLimiterMiddleware
+from utils.security import create_access_token
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def script():
+    return AsyncMock(return_value=[1, 4, 12000, 0])
+
+
+@pytest.fixture
+def api(script):
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = script
+
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    @app.get("/health_check")
+    def health_check():
+        return {"status": "healthy"}
+
+    app.add_middleware(RateLimiterMiddleware, calls=5, period=60, redis_client=redis_client)
+    return TestClient(app)
+
+
+# ============================================================================
+# RATE LIMITER
+# ============================================================================
+
+class TestRateLimiterMiddleware:
+
+    def test_single_script_call_per_request(self, api, script):
+        response = api.get("/items", headers={"X-Forwarded-For": "203.0.113.7, 10.0.0.1"})
+
+        assert response.status_code == 200
+        script.assert_awaited_once_with(keys=["rate_limit:203.0.113.7"], args=[5, 60000, 12000])
+        assert response.headers["X-RateLimit-Remaining"] == "4"
+        assert response.headers["X-RateLimit-Reset"] == "12"
+
+    def test_denied_request_gets_429(self, api, script):
+        script.return_value = [0, 0, 60000, 2500]
+
+        response = api.get("/items")
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+        assert response.json()["retry_after"] == 3
+
+    def test_streaming_response_passes_through(self, api):
+        with api.stream("GET", "/stream") as response:
+            chunks = list(response.iter_bytes())
+
+        assert b"".join(chunks) == b"abc"
+        assert response.headers["X-RateLimit-Limit"] == "5"
+
+    def test_bypassed_requests_skip_redis(self, api, script):
+        admin = create_access_token(subject="1", extra={"is_admin": True})
+
+        api.get("/health_check")
+        api.options("/items")
+        api.get("/items", headers={"Authorization": f"Bearer {admin}"})
+
+        script.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_non_http_scope_passes_through(self, script):
+        inner = AsyncMock()
+        redis_client = MagicMock()
+        redis_client.register_script.return_value = script
+        middleware = RateLimiterMiddleware(inner, redis_client=redis_client)
+
+        await middleware({"type": "lifespan"}, None, None)
+
+        inner.assert_awaited_once()
+        script.assert_not_awaited()
+
+
+# ============================================================================
+# LOCAL (BATCHED) MODE
+# ============================================================================
+
+class FakeRedis:
+    """Shared counters behind an async pipeline, like redis.asyncio"""
+
+    def __init__(self):
+        self.counters = {}
+        self.executed = 0
+        self.fail = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incrby(self, key, amount):
+        self.commands.append(("incrby", key, amount))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("redis down")
+        self.redis.executed += 1
+        results = []
+        for command, key, value in self.commands:
+            if command == "incrby":
+                self.redis.counters[key] = self.redis.counters.get(key, 0) + value
+                results.append(self.redis.counters[key])
+            else:
+                results.append(True)
+        return results
+
+
+class Clock:
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def workers(count, redis, clock, calls=50):
+    return [LocalRateLimiter(calls, 60, redis_client=redis, clock=clock) for _ in range(count)]
+
+
+class TestLocalRateLimiter:
+
+    def test_single_worker_is_exact(self):
+        limiter = LocalRateLimiter(5, 60, redis_client=FakeRedis(), clock=Clock())
+
+        results = [limiter.acquire("1.2.3.4") for _ in range(7)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False] * 2
+        assert results[0].remaining == 4
+        assert results[-1].retry_after_ms == 20_000  # rest of the 60s window
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("worker_count,per_sync", [(2, 1), (4, 3), (8, 5)])
+    async def test_overshoot_is_bounded(self, worker_count, per_sync):
+        redis, clock = FakeRedis(), Clock()
+        pool = workers(worker_count, redis, clock)
+
+        admitted = 0
+        for _ in range(100):
+            for limiter in pool:
+                admitted += sum(limiter.acquire("k").allowed for _ in range(per_sync))
+            for limiter in pool:
+                await limiter.sync()
+
+        assert 50 <= admitted <= 50 + (worker_count - 1) * per_sync
+        assert redis.counters["rate_limit:local:k:16666"] == admitted
+
+    @pytest.mark.asyncio
+    async def test_sync_applies_other_workers_consumption(self):
+        redis, clock = FakeRedis(), Clock()
+        first, second = workers(2, redis, clock, calls=10)
+
+        for _ in range(8):
+            first.acquire("k")
+        await first.sync()
+        second.acquire("k")
+        await second.sync()
+
+        assert second.acquire("k").remaining == 0
+        assert not second.acquire("k").allowed
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_keeps_counts_for_next_batch(self):
+        redis, clock = FakeRedis(), Clock()
+        limiter = LocalRateLimiter(10, 60, redis_client=redis, clock=clock)
+        for _ in range(3):
+            limiter.acquire("k")
+
+        redis.fail = True
+        await limiter.sync()
+        redis.fail = False
+        await limiter.sync()
+
+        assert redis.counters == {"rate_limit:local:k:16666": 3}
+
+    @pytest.mark.asyncio
+    async def test_new_window_refills_and_drops_old_buckets(self):
+        redis, clock = FakeRedis(), Clock()
+        limiter = LocalRateLimiter(2, 60, redis_client=redis, clock=clock)
+        limiter.acquire("a")
+        limiter.acquire("a")
+        limiter.acquire("b")
+
+        clock.now += 60
+        assert limiter.acquire("a").allowed
+        await limiter.sync()
+
+        assert list(limiter._buckets) == ["a"]
+
+    def test_old_buckets_are_dropped_without_redis(self):
+        clock = Clock()
+        with patch("middleware.rate_limiter.get_async_redis_client", return_value=None):
+            limiter = LocalRateLimiter(2, 60, clock=clock)
+        for i in range(100):
+            limiter.acquire(f"10.0.0.{i}")
+
+        clock.now += 60
+        limiter.acquire("10.0.1.1")
+
+        assert list(limiter._buckets) == ["10.0.1.1"]
+
+    def test_bucket_count_is_capped(self):
+        limiter = LocalRateLimiter(2, 60, redis_client=FakeRedis(), clock=Clock(), max_buckets=3)
+        limiter.acquire("a")
+        limiter.acquire("a")
+        for key in ("b", "c", "d"):
+            limiter.acquire(key)
+
+        assert list(limiter._buckets) == ["b", "c", "d"]
+        assert limiter.acquire("d").allowed
+        assert not limiter.acquire("d").allowed
+
+    def test_middleware_local_mode_makes_no_redis_call_per_request(self, script):
+        redis_client = MagicMock()
+        redis_client.register_script.return_value = script
+        app = FastAPI()
+
+        @app.get("/items")
+        def items():
+            return {"ok": True}
+
+        app.add_middleware(RateLimiterMiddleware, calls=2, period=60, redis_client=redis_client, mode="local")
+        client = TestClient(app)
+
+        statuses = [client.get("/items").status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+        script.assert_not_awaited()
+
+    def test_route_policy_in_local_mode(self, script):
+        app = FastAPI()
+
+        @app.post("/checkout")
+        @RateLimitPolicy("orders", 1, 60)
+        async def checkout():
+            return {"ok": True}
+
+        app.add_middleware(RateLimiterMiddleware, calls=100, period=60, redis_client=None, mode="local")
+        client = TestClient(app)
+
+        assert client.post("/checkout").status_code == 200
+        response = client.post("/checkout")
+        assert response.status_code == 429
+        assert response.headers["X-RateLimit-Limit"] == "1"
+
+
+# ============================================================================
+# ROUTE POLICIES
+# ============================================================================
+
+@pytest.fixture
+def policy_app(script):
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = script
+    app = FastAPI()
+
+    @app.get("/orders/{id_key}")
+    def get_order(id_key: int):
+        return {"id_key": id_key}
+
+    @app.post("/orders/checkout")
+    @RateLimitPolicy("orders", 2, 60)
+    def checkout():
+        return {"ok": True}
+
+    app.include_router(OrderDetailController().router, prefix="/order_details")
+    app.add_middleware(RateLimiterMiddleware, calls=5, period=60, redis_client=redis_client)
+    return app
+
+
+class TestRoutePolicies:
+
+    def test_table_matches_dispatched_route(self, policy_app):
+        table = RoutePolicyTable(policy_app.routes)
+
+        assert table.match("POST", "/orders/checkout").name == "orders"
+        assert table.match("POST", "/order_details/") == order_rate_limit
+        assert table.match("PUT", "/order_details/1") is None
+        assert table.match("GET", "/orders/checkout") is None
+        assert "GET" not in table._table
+
+    def test_global_and_route_limits_in_one_script_call(self, policy_app, script):
+        client = TestClient(policy_app)
+
+        client.post("/orders/checkout")
+        client.get("/orders/1")
+
+        assert script.await_count == 2
+        checkout_call, read_call = script.await_args_list
+        assert checkout_call.kwargs == {
+            "keys": ["rate_limit:testclient", "rate_limit:route:orders:testclient"],
+            "args": [5, 60000, 12000, 2, 60000, 30000],
+        }
+        assert read_call.kwargs["keys"] == ["rate_limit:testclient"]
+
+    def test_denied_by_route_policy(self, policy_app, script):
+        script.return_value = [0, 0, 60000, 30000, 2]
+
+        response = TestClient(policy_app).post("/orders/checkout")
+
+        assert response.status_code == 429
+        assert response.json()["detail"] == "Rate limit exceeded. Maximum 2 requests per 60 seconds."
+        assert response.headers["X-RateLimit-Limit"] == "2"
+        assert response.headers["Retry-After"] == "30"
+
+    def test_app_declares_expensive_routes(self):
+        from main import create_fastapi_app
+        table = RoutePolicyTable(create_fastapi_app().routes)
+
+        assert table.match("POST", "/orders/checkout") == order_rate_limit
+        assert table.match("POST", "/order_details/") == order_rate_limit
+        assert table.match("POST", "/reviews/").name == "reviews"
+        assert table.match("POST", "/clients/").name == "clients"
+        assert table.match("GET", "/products/") is None
+
+    def test_policies_do_not_wrap_endpoints(self):
+        def create():
+            return None
+
+        assert order_rate_limit(create) is create
+
+    def test_unknown_generated_route_is_rejected(self):
+        router = OrderDetailController().router
+
+        with pytest.raises(ValueError):
+            limit_routes(router, {"create_many": order_rate_limit})
@@ -0,0 +1,407 @@
+"""
+Tests for the high-performance read paths
+
+Tests verify:
+- Column-projected repository reads with bulk TypeAdapter validation
+- Generic read routes returning pre-validated JSON
+- Sparse fieldsets (`fields=`) on repository reads and read routes, cached
+  per product in one hash
+- Exact/estimated total counts exposed through X-Total-Count
+- Batch fetch by ids (`?ids=1,2,3`) with per-id cache lookups
+"""
+import pytest
+from unittest.mock import Mock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError, field_validator
+
+from config.constants import PaginationConfig
+from config.database import get_db
+from controllers.client_controller import ClientController
+from controllers.product_controller import ProductController
+from models.address import AddressModel
+from models.category import CategoryModel
+from models.client import ClientModel
+from models.product import ProductModel
+from repositories.base_repository_impl import InstanceNotFoundError
+from repositories.client_repository import ClientRepository
+from repositories.product_repository import ProductRepository
+from schemas.base_schema import BaseSchema, get_partial_schema
+from schemas.category_schema import CategorySchema
+from schemas.client_schema import ClientSchema
+from schemas.product_schema import ProductSchema
+from services.cache_service import CacheService
+from services.category_service import CategoryService
+from services.client_service import ClientService
+from services.product_service import ProductService
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def products(db_session):
+    """Seed one category with five products"""
+    category = CategoryModel(name="Electronics")
+    db_session.add(category)
+    db_session.flush()
+
+    models = [
+        ProductModel(
+            name=f"Product {i}",
+            price=10.0 + i,
+            stock=i,
+            image_url=f"/uploads/{i}.webp",
+            category_id=category.id_key,
+        )
+        for i in range(5)
+    ]
+    db_session.add_all(models)
+    db_session.commit()
+    return models
+
+
+@pytest.fixture
+def api_client(db_session):
+    """Minimal app exposing the generic product and client routes"""
+    app = FastAPI()
+    app.include_router(ProductController().router, prefix="/products")
+    app.include_router(ClientController().router, prefix="/clients")
+
+    def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+# ============================================================================
+# PROJECTED REPOSITORY READS
+# ============================================================================
+
+class TestProjectedReads:
+    """Repository reads through column projection"""
+
+    def test_find_all_matches_orm_validation(self, db_session, products):
+        """Projected rows validate to the same schemas as ORM entities"""
+        result = ProductRepository(db_session).find_all(skip=0, limit=1000)
+
+        expected = [ProductSchema.model_validate(p) for p in products]
+        assert result == expected
+        assert all(isinstance(item, ProductSchema) for item in result)
+
+    def test_find_all_respects_pagination(self, db_session, products):
+        """skip/limit still apply on the projected query"""
+        result = ProductRepository(db_session).find_all(skip=1, limit=2)
+
+        assert [p.id_key for p in result] == [products[1].id_key, products[2].id_key]
+
+    def test_find_uses_projection(self, db_session, products):
+        """find returns a validated schema without loading an ORM entity"""
+        product_id = products[0].id_key
+        db_session.expunge_all()
+
+        result = ProductRepository(db_session).find(product_id)
+
+        assert result.name == "Product 0"
+        assert len(db_session.identity_map) == 0
+
+    def test_find_not_found(self, db_session):
+        """Missing records still raise InstanceNotFoundError"""
+        with pytest.raises(InstanceNotFoundError):
+            ProductRepository(db_session).find(9999)
+
+    def test_relationship_schema_falls_back_to_orm(self, db_session):
+        """Schemas that serialize relationships keep the ORM read path"""
+        client = ClientModel(name="John", lastname="Doe", email="john@example.com")
+        db_session.add(client)
+        db_session.flush()
+        db_session.add(AddressModel(street="Main", city="Paris", client_id=client.id_key))
+        db_session.commit()
+
+        result = ClientRepository(db_session).find_all()
+
+        assert len(result) == 1
+        assert result[0].addresses[0].street == "Main"
+
+
+# ============================================================================
+# PRE-VALIDATED ROUTE RESPONSES
+# ============================================================================
+
+class TestPreValidatedResponses:
+    """Generic read routes serialize once, without response_model re-validation"""
+
+    def test_get_all_returns_json_list(self, api_client, products):
+        response = api_client.get("/products/?limit=10")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert len(body) == 5
+        assert body[0] == {
+            "id_key": products[0].id_key,
+            "name": "Product 0",
+            "price": 10.0,
+            "stock": 0,
+            "image_url": "/uploads/0.webp",
+            "category_id": products[0].category_id,
+        }
+
+    def test_get_one_returns_json_object(self, api_client, products):
+        response = api_client.get(f"/products/{products[2].id_key}")
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "Product 2"
+
+    def test_response_model_still_documented(self, api_client):
+        schema = api_client.app.openapi()
+        get_all = schema["paths"]["/products/"]["get"]
+        content = get_all["responses"]["200"]["content"]["application/json"]["schema"]
+        assert content["items"]["$ref"].endswith("/ProductSchema")
+
+
+# ============================================================================
+# SPARSE FIELDSETS
+# ============================================================================
+
+class TestSparseFieldsets:
+    """Column projection driven by the `fields` parameter"""
+
+    def test_resolve_fields_adds_id_and_keeps_schema_order(self, db_session):
+        repo = ProductRepository(db_session)
+
+        assert repo.resolve_fields(["price", "name"]) == ("id_key", "name", "price")
+        assert repo.resolve_fields(None) is None
+
+    def test_resolve_fields_rejects_unknown_and_relationship_fields(self, db_session):
+        with pytest.raises(ValueError, match="bogus"):
+            ProductRepository(db_session).resolve_fields(["name", "bogus"])
+        with pytest.raises(ValueError, match="addresses"):
+            ClientRepository(db_session).resolve_fields(["addresses"])
+
+    def test_find_all_returns_only_requested_fields(self, db_session, products):
+        first_id = products[0].id_key
+        db_session.expunge_all()
+
+        result = ProductRepository(db_session).find_all(fields=["name", "price"])
+
+        assert len(result) == 5
+        assert result[0].model_dump() == {"id_key": first_id, "name": "Product 0", "price": 10.0}
+        assert len(db_session.identity_map) == 0
+
+    def test_relationship_schema_projects_columns_only(self, db_session):
+        client = ClientModel(name="John", lastname="Doe", email="john@example.com")
+        db_session.add(client)
+        db_session.commit()
+
+        result = ClientRepository(db_session).find(client.id_key, fields=["email"])
+
+        assert result.model_dump() == {"id_key": client.id_key, "email": "john@example.com"}
+
+    def test_cache_key_includes_field_set(self, db_session, products):
+        service = ProductService(db_session)
+        service.cache = Mock()
+        service.cache.get.return_value = None
+        service.cache.build_key.side_effect = CacheService.build_key.__get__(service.cache)
+
+        service.get_all(skip=0, limit=10, fields=["price", "name"])
+
+        key = service.cache.set.call_args[0][0]
+        assert key == "products:list:fields:id_key,name,price:limit:10:skip:0"
+
+    def test_item_field_sets_share_one_hash(self, db_session, products):
+        service = ProductService(db_session)
+        service.cache = Mock()
+        service.cache.get_field.return_value = None
+        service.cache.delete_pattern.return_value = 0
+        service.cache.build_key.side_effect = CacheService.build_key.__get__(service.cache)
+        product_id = products[0].id_key
+
+        service.get_one(product_id)
+        service.get_one(product_id, fields=["price"])
+        service.update(product_id, ProductSchema(name="Renamed", price=10.0, stock=5, category_id=products[0].category_id))
+
+        key = f"products:id:id:{product_id}"
+        assert [c.args[:2] for c in service.cache.set_field.call_args_list] == [(key, "all"), (key, "id_key,price")]
+        service.cache.delete.assert_called_once_with(key)
+        assert all(c.args[0] == "products:list:*" for c in service.cache.delete_pattern.call_args_list)
+
+    def test_category_write_is_one_del(self, db_session, products, memory_cache):
+        service = CategoryService(db_session)
+        service.cache = memory_cache
+        category_id = products[0].category_id
+
+        service.get_all()
+        service.get_one(category_id)
+        service.get_one(category_id, fields=["name"])
+        assert memory_cache.store[f"categories:id:id:{category_id}"].keys() == {"all", "id_key,name"}
+
+        memory_cache.delete_pattern = Mock(side_effect=AssertionError("KEYS scan on a write"))
+        service.update(category_id, CategorySchema(name="Renamed"))
+
+        assert memory_cache.store == {}
+        assert service.get_one(category_id).name == "Renamed"
+
+    def test_partial_schema_keeps_field_validators(self):
+        class PriceSchema(BaseSchema):
+            name: str
+            price: float
+
+            @field_validator("price")
+            @classmethod
+            def not_thirteen(cls, value):
+                if value == 13:
+                    raise ValueError("unlucky price")
+                return value
+
+        partial = get_partial_schema(PriceSchema, ("id_key", "price"))
+
+        with pytest.raises(ValidationError, match="unlucky price"):
+            partial(price=13)
+        assert get_partial_schema(PriceSchema, ("id_key", "name"))(name="x").name == "x"
+
+    def test_get_all_route_with_fields(self, api_client, products):
+        response = api_client.get("/products/?fields=name,image_url")
+
+        assert response.status_code == 200
+        assert response.json()[0] == {
+            "id_key": products[0].id_key,
+            "name": "Product 0",
+            "image_url": "/uploads/0.webp",
+        }
+
+    def test_get_one_route_with_fields(self, api_client, products):
+        response = api_client.get(f"/products/{products[1].id_key}?fields=price")
+
+        assert response.status_code == 200
+        assert response.json() == {"id_key": products[1].id_key, "price": 11.0}
+
+    def test_invalid_field_returns_400(self, api_client, products):
+        response = api_client.get("/products/?fields=name,password_hash")
+
+        assert response.status_code == 400
+        assert "password_hash" in response.json()["detail"]
+
+
+# ============================================================================
+# TOTAL COUNTS
+# ============================================================================
+
+class TestTotalCounts:
+    """Totals for pagination without unbounded COUNT(*) scans"""
+
+    def test_unfiltered_count_is_exact_on_small_tables(self, db_session, products):
+        assert ProductRepository(db_session).count() == (5, True)
+
+    def test_count_is_cached(self, db_session, products):
+        service = ProductService(db_session)
+        with patch("services.base_service_impl.cache_service") as cache:
+            cache.get.return_value = None
+            cache.build_key.side_effect = CacheService().build_key
+
+            service.count()
+
+            key, value = cache.set.call_args[0]
+            assert key == "products:list:count"
+            assert value == {"total": 5, "exact": True}
+
+            cache.get.return_value = {"total": 42, "exact": False}
+            assert service.count() == (42, False)
+
+    def test_save_and_delete_drop_cached_count(self, db_session):
+        service = ClientService(db_session)
+        with patch("services.base_service_impl.cache_service") as cache:
+            cache.build_key.side_effect = CacheService().build_key
+
+            client = service.save(ClientSchema(name="Ana", lastname="Ruiz", email="ana@example.com"))
+            service.delete(client.id_key)
+
+            assert [c.args for c in cache.delete.call_args_list] == [("clients:list:count",)] * 2
+
+    def test_include_total_sets_headers(self, api_client, products):
+        response = api_client.get("/products/?limit=2&include_total=true")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        assert response.headers["X-Total-Count"] == "5"
+        assert response.headers["X-Total-Count-Exact"] == "true"
+
+    def test_include_total_above_threshold(self, api_client, products):
+        with patch.object(PaginationConfig, "EXACT_COUNT_THRESHOLD", 2):
+            response = api_client.get("/products/?limit=2&include_total=true")
+
+        assert response.status_code == 200
+        # Outside PostgreSQL the unfiltered total stays an exact COUNT(*)
+        assert response.headers["X-Total-Count"] == "5"
+        assert response.headers["X-Total-Count-Exact"] == "true"
+
+    def test_total_headers_are_opt_in(self, api_client, products):
+        response = api_client.get("/products/?limit=2")
+
+        assert "X-Total-Count" not in response.headers
+
+
+# ============================================================================
+# BATCH FETCH BY IDS
+# ============================================================================
+
+class TestBatchFetch:
+    """One IN (...) query instead of one request per id"""
+
+    def test_find_many_keeps_requested_order_and_skips_missing(self, db_session, products):
+        ids = [products[3].id_key, 9999, products[0].id_key, products[3].id_key]
+
+        result = ProductRepository(db_session).find_many(ids)
+
+        assert [p.id_key for p in result] == [products[3].id_key, products[0].id_key]
+        assert result[0].name == "Product 3"
+
+    def test_find_many_with_fields_and_orm_fallback(self, db_session, products):
+        client = ClientModel(name="John", lastname="Doe", email="john@example.com")
+        db_session.add(client)
+        db_session.commit()
+
+        partial = ProductRepository(db_session).find_many([products[1].id_key], fields=["price"])
+        full = ClientRepository(db_session).find_many([client.id_key])
+
+        assert partial[0].model_dump() == {"id_key": products[1].id_key, "price": 11.0}
+        assert full[0].addresses == []
+
+    def test_find_many_enforces_cap(self, db_session):
+        with patch.object(PaginationConfig, "MAX_BATCH_IDS", 3):
+            with pytest.raises(ValueError, match="Too many ids"):
+                ProductRepository(db_session).find_many([1, 2, 3, 4])
+
+    def test_service_reads_cache_hits_and_queries_only_misses(self, db_session, products):
+        service = ProductService(db_session)
+        service.cache = Mock()
+        service.cache.build_key.side_effect = CacheService.build_key.__get__(service.cache)
+        cached = {**ProductSchema.model_validate(products[0]).model_dump(), "name": "Cached"}
+        service.cache.get_field_many.return_value = [cached, None]
+
+        with patch.object(service.repository, "find_many", wraps=service.repository.find_many) as find_many:
+            result = service.get_many([products[0].id_key, products[1].id_key])
+
+        find_many.assert_called_once_with([products[1].id_key], fields=None)
+        assert [p.name for p in result] == ["Cached", "Product 1"]
+        written = service.cache.set_field_many.call_args[0][0]
+        assert list(written) == [(f"products:id:id:{products[1].id_key}", "all")]
+
+    def test_get_all_route_with_ids(self, api_client, products):
+        ids = f"{products[4].id_key},{products[2].id_key}"
+        response = api_client.get(f"/products/?ids={ids}&fields=name")
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id_key": products[4].id_key, "name": "Product 4"},
+            {"id_key": products[2].id_key, "name": "Product 2"},
+        ]
+
+    def test_ids_route_rejects_bad_input(self, api_client, products):
+        assert api_client.get("/products/?ids=1,abc").status_code == 400
+        with patch.object(PaginationConfig, "MAX_BATCH_IDS", 2):
+            response = api_client.get("/products/?ids=1,2,3")
+        assert response.status_code == 400
+        assert "Too many ids" in response.json()["detail"]
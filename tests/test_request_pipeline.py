@@ -0,0 +1,155 @@
+"""
+Tests for the fused request pipeline middleware
+
+Tests verify:
+- Request IDs are echoed or generated, and visible to handlers and log records
+- Timing and rate limit headers are added without buffering streamed bodies
+- 429 responses still carry the request ID and CORS headers
+- One access log line per request, sampled for successful requests
+- Log records carry the route and user id of the request
+"""
+import logging
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.request_id_middleware import RequestIDFilter, request_context, set_request_user
+from middleware.request_pipeline import RequestPipelineMiddleware
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def script():
+    return AsyncMock(return_value=[1, 4, 12000, 0])
+
+
+@pytest.fixture
+def api(script):
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = script
+
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(request: Request):
+        record = logging.LogRecord("test", logging.INFO, __file__, 0, "", None, None)
+        RequestIDFilter().filter(record)
+        return {"state": request.state.request_id, "log": record.request_id}
+
+    @app.get("/users/{user_id}/items")
+    def user_items(user_id: int):
+        set_request_user(user_id)
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    @app.get("/boom")
+    def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestPipelineMiddleware, calls=5, period=60, redis_client=redis_client)
+    app.add_middleware(CORSMiddleware, allow_origins=["https://shop.example.com"])
+    return TestClient(app)
+
+
+def access_records(caplog):
+    return [r for r in caplog.records if r.name == "middleware.request_pipeline"]
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class TestRequestPipelineMiddleware:
+
+    def test_request_id_is_echoed(self, api):
+        response = api.get("/items", headers={"X-Request-ID": "abc-123"})
+
+        assert response.headers["X-Request-ID"] == "abc-123"
+        assert response.json() == {"state": "abc-123", "log": "abc-123"}
+        assert request_context.get() is None
+
+    def test_request_id_is_generated(self, api):
+        response = api.get("/items")
+
+        request_id = response.headers["X-Request-ID"]
+        assert uuid.UUID(request_id)
+        assert response.json()["state"] == request_id
+
+    def test_timing_and_limit_headers(self, api, script):
+        response = api.get("/items")
+
+        assert response.headers["X-Response-Time"].endswith("ms")
+        assert response.headers["X-RateLimit-Remaining"] == "4"
+        script.assert_awaited_once()
+
+    def test_streaming_response_passes_through(self, api):
+        with api.stream("GET", "/stream") as response:
+            chunks = list(response.iter_bytes())
+
+        assert b"".join(chunks) == b"abc"
+        assert "X-Request-ID" in response.headers
+
+    def test_rejected_request_keeps_request_id_and_cors(self, api, script):
+        script.return_value = [0, 0, 60000, 2500]
+
+        response = api.get("/items", headers={"X-Request-ID": "abc-123", "Origin": "https://shop.example.com"})
+
+        assert response.status_code == 429
+        assert response.headers["X-Request-ID"] == "abc-123"
+        assert response.headers["access-control-allow-origin"] == "https://shop.example.com"
+        assert response.headers["Retry-After"] == "3"
+
+    def test_one_access_log_line_per_request(self, api, caplog):
+        with caplog.at_level(logging.INFO, logger="middleware.request_pipeline"):
+            api.get("/items", headers={"X-Request-ID": "abc-123"})
+
+        records = access_records(caplog)
+        assert len(records) == 1
+        assert records[0].getMessage().startswith("GET /items 200 (")
+        assert records[0].status == 200
+        assert records[0].latency_ms >= 0
+
+    def test_errors_are_logged_and_raised(self, api, caplog):
+        with caplog.at_level(logging.INFO, logger="middleware.request_pipeline"), pytest.raises(RuntimeError):
+            api.get("/boom", headers={"X-Request-ID": "abc-123"})
+
+        records = access_records(caplog)
+        assert [r.levelno for r in records] == [logging.ERROR]
+        assert records[0].status == 500
+
+    def test_records_carry_route_and_user(self, api, caplog):
+        caplog.handler.addFilter(RequestIDFilter())
+        with caplog.at_level(logging.INFO, logger="middleware.request_pipeline"):
+            api.get("/users/7/items", headers={"X-Request-ID": "abc-123"})
+
+        record = access_records(caplog)[0]
+        assert (record.request_id, record.route, record.user_id) == ("abc-123", "/users/{user_id}/items", 7)
+
+    def test_successful_requests_are_sampled(self, script, caplog):
+        redis_client = MagicMock()
+        redis_client.register_script.return_value = script
+        app = FastAPI()
+
+        @app.get("/items")
+        def items():
+            return {"ok": True}
+
+        app.add_middleware(RequestPipelineMiddleware, access_log_sample_rate=0.0, redis_client=redis_client)
+        client = TestClient(app)
+
+        with caplog.at_level(logging.INFO, logger="middleware.request_pipeline"):
+            client.get("/items")
+            client.get("/missing")
+
+        assert [r.status for r in access_records(caplog)] == [404]
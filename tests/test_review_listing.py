@@ -0,0 +1,158 @@
+"""
+Tests for paginated, cached product review listings
+
+Tests verify:
+- Cursor pagination for newest / highest / lowest without gaps or repeats
+- Listing queries are index range scans with no sort step
+- First pages are cached in one hash per product and dropped (one DEL) on
+  review writes
+"""
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from config.database import get_db
+from controllers.auth_controller import get_current_admin
+from controllers.review_controller import router
+from models.category import CategoryModel
+from models.enums import ReviewSort
+from models.product import ProductModel
+from models.review import ReviewModel
+from models.user import UserModel
+from schemas.auth_schema import UserPublic
+from services.review_listing_service import ReviewListingService, user_label
+
+RATINGS = [4.0, 5.0, 2.0, 4.0, 1.0, 5.0, 3.0]
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def reviews(db_session):
+    """Seven reviews of product 1 (ids 1..7, RATINGS) and one of product 2"""
+    category = CategoryModel(name="Games")
+    db_session.add(category)
+    db_session.flush()
+    db_session.add_all([
+        ProductModel(name="Board game", price=30.0, stock=5, category_id=category.id_key),
+        ProductModel(name="Puzzle", price=15.0, stock=5, category_id=category.id_key),
+    ])
+    users = [
+        UserModel(email=f"user{i}@example.com", name=f"User {i}" if i % 2 else None,
+                  password_hash="x", is_active=True, is_admin=True)
+        for i in range(len(RATINGS))
+    ]
+    db_session.add_all(users)
+    db_session.flush()
+    db_session.add_all([
+        ReviewModel(product_id=1, user_id=user.id_key, rating=rating, comment="Great fun for the family")
+        for user, rating in zip(users, RATINGS)
+    ])
+    db_session.add(ReviewModel(product_id=2, user_id=users[0].id_key, rating=3.0))
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def cache(memory_cache):
+    with patch("services.review_listing_service.cache_service", memory_cache), \
+            patch("services.rating_stats_service.cache_service", memory_cache):
+        yield memory_cache
+
+
+@pytest.fixture
+def api(db_session, cache):
+    app = FastAPI()
+    app.include_router(router, prefix="/reviews")
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_admin] = lambda: UserPublic(
+        id_key=1, email="user0@example.com", is_active=True, is_admin=True
+    )
+    return TestClient(app)
+
+
+def walk(api, sort, limit=3):
+    seen, cursor = [], None
+    while True:
+        params = {"sort": sort, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = api.get("/reviews/product/1", params=params)
+        assert response.status_code == 200
+        seen.extend((r["id_key"], r["rating"]) for r in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return seen
+
+
+# ============================================================================
+# PAGINATION
+# ============================================================================
+
+class TestReviewPagination:
+
+    def test_newest_first(self, api, reviews):
+        assert [id_key for id_key, _ in walk(api, "newest")] == [7, 6, 5, 4, 3, 2, 1]
+
+    def test_highest_first_breaks_ties_by_newest(self, api, reviews):
+        assert walk(api, "highest") == [(6, 5.0), (2, 5.0), (4, 4.0), (1, 4.0), (7, 3.0), (3, 2.0), (5, 1.0)]
+
+    def test_lowest_first(self, api, reviews):
+        assert [rating for _, rating in walk(api, "lowest", limit=2)] == sorted(RATINGS)
+
+    def test_user_labels(self, api, reviews):
+        labels = {r["user_id"]: r["user_name"] for r in api.get("/reviews/product/1").json()}
+
+        assert labels[1] == "user0@example.com"
+        assert labels[2] == "User 1"
+        assert user_label("  Ana ", " ", "a@example.com") == "Ana"
+
+    def test_invalid_sort_and_cursor(self, api, reviews):
+        assert api.get("/reviews/product/1", params={"sort": "random"}).status_code == 422
+        assert api.get("/reviews/product/1", params={"cursor": "bogus"}).status_code == 400
+
+    @pytest.mark.parametrize("sort", list(ReviewSort))
+    def test_listing_is_an_index_scan_without_sort(self, reviews, sort):
+        engine = reviews.get_bind()
+        captured = []
+        listener = lambda conn, cursor, statement, parameters, *args: captured.append((statement, parameters))
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            ReviewListingService(reviews)._fetch_page(1, sort, None, 3)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        statement, parameters = captured[0]
+        plan = reviews.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        plan = " ".join(str(row[-1]) for row in plan)
+        assert "SEARCH reviews USING" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+# ============================================================================
+# CACHING
+# ============================================================================
+
+class TestReviewPageCache:
+
+    def test_first_page_cached_until_review_write(self, api, reviews, cache):
+        cache.delete_pattern = Mock(side_effect=AssertionError("KEYS scan on a write"))
+        api.get("/reviews/product/1", params={"limit": 2})
+        api.get("/reviews/product/1", params={"limit": 2, "sort": "highest"})
+        assert list(cache.store) == ["reviews:product:1"]
+        assert list(cache.store["reviews:product:1"]) == ["limit:2:sort:newest", "limit:2:sort:highest"]
+
+        api.put("/reviews/7", json={"rating": 2.0})
+
+        assert "reviews:product:1" not in cache.store
+        first = api.get("/reviews/product/1", params={"limit": 2}).json()[0]
+        assert first["rating"] == 2.0
+
+    def test_later_pages_are_not_cached(self, api, reviews, cache):
+        cursor = api.get("/reviews/product/1", params={"limit": 2}).headers["X-Next-Cursor"]
+        api.get("/reviews/product/1", params={"limit": 2, "cursor": cursor})
+
+        assert len(cache.store) == 1
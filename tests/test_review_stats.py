@@ -0,0 +1,163 @@
+"""
+Tests for incrementally maintained review aggregates
+
+Tests verify:
+- Review create/update/delete keep product_rating_stats equal to a GROUP BY
+- GET /reviews/summary and /reviews/summary/{id} read the aggregates, cached
+- The rebuild job recomputes aggregates from the reviews table
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+from config.database import get_db
+from controllers.auth_controller import get_current_admin, get_current_user
+from controllers.review_controller import router
+from models.category import CategoryModel
+from models.product import ProductModel
+from models.product_rating_stats import ProductRatingStatsModel, rating_bucket
+from models.review import ReviewModel
+from models.user import UserModel
+from schemas.auth_schema import UserPublic
+from services.rating_stats_service import RatingStatsService
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def catalog(db_session):
+    """Two products and three admin reviewers (admins skip the purchase check)"""
+    category = CategoryModel(name="Games")
+    db_session.add(category)
+    db_session.flush()
+    db_session.add_all([
+        ProductModel(name="Board game", price=30.0, stock=5, category_id=category.id_key),
+        ProductModel(name="Puzzle", price=15.0, stock=5, category_id=category.id_key),
+    ])
+    db_session.add_all([
+        UserModel(email=f"admin{i}@example.com", password_hash="x", is_active=True, is_admin=True)
+        for i in range(3)
+    ])
+    db_session.commit()
+    return db_session
+
+
+@pytest.fixture
+def cache(memory_cache):
+    with patch("services.rating_stats_service.cache_service", memory_cache):
+        yield memory_cache
+
+
+@pytest.fixture
+def api(db_session, cache):
+    """Test client whose caller is switched with api.as_user(user_id)"""
+    app = FastAPI()
+    app.include_router(router, prefix="/reviews")
+    app.dependency_overrides[get_db] = lambda: db_session
+
+    current = {"id": 1}
+    user = lambda: UserPublic(
+        id_key=current["id"], email=f"admin{current['id'] - 1}@example.com", is_active=True, is_admin=True
+    )
+    app.dependency_overrides[get_current_user] = user
+    app.dependency_overrides[get_current_admin] = user
+
+    client = TestClient(app)
+    client.as_user = lambda user_id: current.update(id=user_id)
+    return client
+
+
+def review(api, user_id, product_id, rating):
+    api.as_user(user_id)
+    response = api.post("/reviews/", json={"product_id": product_id, "rating": rating})
+    assert response.status_code == 201
+    return response.json()["id_key"]
+
+
+def group_by_summary(db_session):
+    rows = db_session.execute(
+        select(ReviewModel.product_id, func.avg(ReviewModel.rating), func.count())
+        .group_by(ReviewModel.product_id)
+        .order_by(ReviewModel.product_id)
+    ).all()
+    return [{"product_id": p, "avg_rating": pytest.approx(a), "count": c} for p, a, c in rows]
+
+
+# ============================================================================
+# INCREMENTAL MAINTENANCE
+# ============================================================================
+
+class TestIncrementalStats:
+
+    def test_summary_matches_group_by(self, api, catalog):
+        review(api, 1, 1, 5.0)
+        review(api, 2, 1, 4.0)
+        review(api, 1, 2, 2.0)
+
+        assert api.get("/reviews/summary").json() == group_by_summary(catalog)
+
+    def test_update_moves_histogram_bucket(self, api, catalog):
+        review_id = review(api, 1, 1, 5.0)
+        review(api, 2, 1, 3.0)
+
+        api.put(f"/reviews/{review_id}", json={"rating": 1.0})
+
+        stats = api.get("/reviews/summary/1").json()
+        assert stats == {"product_id": 1, "avg_rating": 2.0, "count": 2,
+                         "histogram": {"1": 1, "2": 0, "3": 1, "4": 0, "5": 0}}
+
+    def test_delete_removes_review(self, api, catalog):
+        review(api, 1, 1, 5.0)
+        review_id = review(api, 2, 1, 3.0)
+
+        api.delete(f"/reviews/{review_id}")
+
+        assert api.get("/reviews/summary").json() == [{"product_id": 1, "avg_rating": 5.0, "count": 1}]
+
+    def test_unreviewed_product_has_zero_stats(self, api, catalog):
+        stats = api.get("/reviews/summary/2").json()
+
+        assert stats["count"] == 0
+        assert stats["avg_rating"] == 0.0
+
+    def test_rating_buckets_round_half_up(self):
+        assert [rating_bucket(r) for r in (1.0, 1.49, 1.5, 3.5, 4.99, 5.0)] == [1, 1, 2, 4, 5, 5]
+
+
+# ============================================================================
+# CACHING AND REBUILD
+# ============================================================================
+
+class TestStatsCacheAndRebuild:
+
+    def test_summary_is_cached_until_next_review(self, api, catalog, engine, cache):
+        review(api, 1, 1, 4.0)
+        api.get("/reviews/summary")
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            api.get("/reviews/summary")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert statements == []
+
+        review(api, 2, 1, 2.0)
+        assert api.get("/reviews/summary").json()[0]["count"] == 2
+
+    def test_rebuild_recomputes_from_reviews(self, api, catalog):
+        review(api, 1, 1, 5.0)
+        review(api, 2, 2, 3.0)
+        catalog.query(ProductRatingStatsModel).delete()
+        catalog.add(ReviewModel(product_id=2, user_id=3, rating=4.0))
+        catalog.commit()
+
+        assert RatingStatsService(catalog).rebuild() == 2
+        assert api.get("/reviews/summary").json() == group_by_summary(catalog)
+        assert api.get("/reviews/summary/2").json()["histogram"]["4"] == 1
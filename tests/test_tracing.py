@@ -0,0 +1,186 @@
+"""
+Tests for OpenTelemetry tracing
+
+Tests verify:
+- Server spans are named after the route template and parent service spans
+- Generated request ids are the trace id; incoming traceparents are continued
+- SQL statements and Redis commands get client spans, without their values
+- Head sampling follows the configured rate; nothing is traced when disabled
+"""
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import redis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind, StatusCode
+from sqlalchemy import create_engine, text
+
+from middleware.request_id_middleware import RequestIDFilter
+from middleware.request_pipeline import RequestPipelineMiddleware
+from utils.tracing import setup_tracing, shutdown_tracing, trace_engine, traced_service
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+TRACEPARENT = f"00-{TRACE_ID}-b7ad6b7169203331-01"
+
+
+@traced_service
+class WidgetService:
+
+    def get_widget(self, widget_id: int) -> dict:
+        record = logging.LogRecord("test", logging.INFO, __file__, 0, "", None, None)
+        RequestIDFilter().filter(record)
+        return {"widget_id": widget_id, "trace_id": record.trace_id}
+
+    async def count(self) -> int:
+        return 3
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def exporter():
+    span_exporter = InMemorySpanExporter()
+    setup_tracing(span_exporter, sample_rate=1.0)
+    yield span_exporter
+    shutdown_tracing()
+
+
+@pytest.fixture
+def api():
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = AsyncMock(return_value=[1, 4, 12000, 0])
+
+    app = FastAPI()
+    service = WidgetService()
+
+    @app.get("/widgets/{widget_id}")
+    def widget(widget_id: int):
+        return service.get_widget(widget_id)
+
+    @app.get("/count")
+    async def count():
+        return {"count": await service.count()}
+
+    app.add_middleware(RequestPipelineMiddleware, calls=5, period=60, redis_client=redis_client)
+    return TestClient(app)
+
+
+def spans_by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+# ============================================================================
+# REQUEST AND SERVICE SPANS
+# ============================================================================
+
+class TestRequestTracing:
+
+    def test_server_span_parents_service_span(self, exporter, api):
+        api.get("/widgets/1", headers={"X-Request-ID": "abc-123"})
+
+        spans = spans_by_name(exporter)
+        server, service = spans["GET /widgets/{widget_id}"], spans["WidgetService.get_widget"]
+        assert server.kind == SpanKind.SERVER
+        assert server.attributes["http.route"] == "/widgets/{widget_id}"
+        assert server.attributes["http.status_code"] == 200
+        assert server.attributes["http.request_id"] == "abc-123"
+        assert service.parent.span_id == server.context.span_id
+
+    def test_async_service_methods_are_traced(self, exporter, api):
+        api.get("/count")
+
+        assert "WidgetService.count" in spans_by_name(exporter)
+
+    def test_generated_request_id_is_trace_id(self, exporter, api):
+        response = api.get("/widgets/1")
+
+        server = spans_by_name(exporter)["GET /widgets/{widget_id}"]
+        trace_id = format(server.context.trace_id, "032x")
+        assert response.headers["X-Request-ID"] == trace_id
+        assert response.json()["trace_id"] == trace_id
+
+    def test_incoming_traceparent_is_continued(self, exporter, api):
+        response = api.get("/widgets/1", headers={"traceparent": TRACEPARENT})
+
+        server = spans_by_name(exporter)["GET /widgets/{widget_id}"]
+        assert format(server.context.trace_id, "032x") == TRACE_ID
+        assert response.headers["X-Request-ID"] == TRACE_ID
+
+    def test_unmatched_request_keeps_generic_name(self, exporter, api):
+        api.get("/missing")
+
+        assert list(spans_by_name(exporter)) == ["HTTP GET"]
+
+
+# ============================================================================
+# SQL AND REDIS SPANS
+# ============================================================================
+
+class TestClientSpans:
+
+    def test_sql_statements(self, exporter, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'trace.db'}")
+        trace_engine(engine)
+        trace_engine(engine)
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT :value"), {"value": "secret"})
+            with pytest.raises(Exception):
+                connection.execute(text("SELECT * FROM missing_table"))
+
+        select, failed = exporter.get_finished_spans()
+        assert (select.name, select.kind) == ("SELECT", SpanKind.CLIENT)
+        assert select.attributes["db.system"] == "sqlite"
+        assert "secret" not in str(dict(select.attributes))
+        assert failed.status.status_code == StatusCode.ERROR
+
+    def test_redis_commands(self, exporter):
+        client = redis.Redis(port=1, socket_connect_timeout=0.1)
+
+        with pytest.raises(redis.ConnectionError):
+            client.get("user:secret")
+
+        span = spans_by_name(exporter)["GET"]
+        assert span.attributes["db.system"] == "redis"
+        assert "user:secret" not in str(dict(span.attributes))
+        assert span.status.status_code == StatusCode.ERROR
+
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+class TestSampling:
+
+    def test_sample_rate_zero_records_nothing(self, api):
+        exporter = InMemorySpanExporter()
+        setup_tracing(exporter, sample_rate=0.0)
+        try:
+            response = api.get("/widgets/1")
+        finally:
+            shutdown_tracing()
+
+        assert exporter.get_finished_spans() == ()
+        assert response.status_code == 200
+
+    def test_sampled_parent_is_followed(self, api):
+        exporter = InMemorySpanExporter()
+        setup_tracing(exporter, sample_rate=0.0)
+        try:
+            api.get("/widgets/1", headers={"traceparent": TRACEPARENT})
+        finally:
+            shutdown_tracing()
+
+        assert "GET /widgets/{widget_id}" in spans_by_name(exporter)
+
+    def test_disabled_by_default(self, api):
+        assert setup_tracing() is None
+
+        response = api.get("/widgets/1")
+
+        assert response.json()["trace_id"] is None
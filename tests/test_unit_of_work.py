@@ -0,0 +1,179 @@
+"""
+Tests for transactional write retries
+
+Tests verify:
+- Retryable database errors are classified by SQLSTATE
+- Writes are rolled back and retried with backoff, then give up with 503
+- Outcomes are counted in db_transactions_total
+- Lock/statement timeouts are set per transaction on PostgreSQL only
+- Routes calling transactional services run in the threadpool, off the event loop
+"""
+import inspect
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from controllers.order_controller import OrderController
+from controllers.order_detail_controller import OrderDetailController
+from services.unit_of_work import (
+    TransientDatabaseError,
+    apply_transaction_timeouts,
+    is_retryable_error,
+    retry_delay,
+    transactional,
+)
+
+OPERATION = "FakeService.write"
+
+
+class PgError(Exception):
+    """Stand-in for a psycopg2 error carrying a SQLSTATE"""
+
+    def __init__(self, pgcode):
+        super().__init__(f"pgcode {pgcode}")
+        self.pgcode = pgcode
+
+
+def db_error(pgcode, error_class=OperationalError):
+    return error_class("UPDATE products ...", {}, PgError(pgcode))
+
+
+class FakeService:
+    """Service shape expected by @transactional"""
+
+    def __init__(self, failures):
+        self.repository = Mock()
+        self.repository.session.info = {}
+        self.repository.session.get_bind.return_value.dialect.name = "sqlite"
+        self.failures = list(failures)
+        self.calls = 0
+
+    @transactional
+    def write(self):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "done"
+
+
+def transactions(result):
+    return REGISTRY.get_sample_value("db_transactions_total", {"operation": OPERATION, "result": result}) or 0.0
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with patch("services.unit_of_work.time.sleep") as sleep:
+        yield sleep
+
+
+class TestRetryClassification:
+
+    @pytest.mark.parametrize("pgcode", ["40001", "40P01", "55P03"])
+    def test_transient_pgcodes_are_retryable(self, pgcode):
+        assert is_retryable_error(db_error(pgcode))
+
+    def test_other_errors_are_not_retryable(self):
+        assert not is_retryable_error(db_error("23505", IntegrityError))
+        assert not is_retryable_error(db_error("57014"))  # statement_timeout
+        assert not is_retryable_error(ValueError("Insufficient stock"))
+
+    def test_sqlite_busy_is_retryable(self):
+        error = OperationalError("UPDATE", {}, Exception("database is locked"))
+        assert is_retryable_error(error)
+
+    def test_backoff_is_jittered_and_capped(self):
+        with patch("services.unit_of_work.DatabaseConfig") as config:
+            config.TX_RETRY_BASE_DELAY = 0.1
+            config.TX_RETRY_MAX_DELAY = 0.3
+            delays = [retry_delay(attempt) for attempt in (1, 2, 3, 10) for _ in range(50)]
+
+        assert all(0 <= d <= 0.3 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestTransactionalDecorator:
+
+    def test_retries_then_succeeds(self, no_sleep):
+        service = FakeService([db_error("40P01"), db_error("40001")])
+        before = {result: transactions(result) for result in ("committed", "retried")}
+
+        assert service.write() == "done"
+        assert service.calls == 3
+        assert service.repository.session.rollback.call_count == 2
+        assert no_sleep.call_count == 2
+        assert transactions("retried") == before["retried"] + 2
+        assert transactions("committed") == before["committed"] + 1
+
+    def test_gives_up_after_max_retries(self):
+        before = transactions("exhausted")
+        with patch("services.unit_of_work.DatabaseConfig.TX_MAX_RETRIES", 2):
+            service = FakeService([db_error("40P01")] * 5)
+            with pytest.raises(TransientDatabaseError) as exc_info:
+                service.write()
+
+        assert service.calls == 3
+        assert isinstance(exc_info.value.__cause__, OperationalError)
+        assert transactions("exhausted") == before + 1
+
+    def test_non_retryable_errors_propagate_immediately(self):
+        service = FakeService([ValueError("Insufficient stock")])
+
+        with pytest.raises(ValueError):
+            service.write()
+        assert service.calls == 1
+        service.repository.session.rollback.assert_not_called()
+
+    def test_nested_calls_join_outer_attempt(self):
+        service = FakeService([])
+        service.repository.session.info["transactional_active"] = True
+        before = transactions("committed")
+
+        assert service.write() == "done"
+        assert transactions("committed") == before
+
+
+class TestTransactionTimeouts:
+
+    def test_set_local_on_postgres(self):
+        session = Mock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+
+        apply_transaction_timeouts(session)
+
+        statements = [str(call.args[0]) for call in session.execute.call_args_list]
+        assert statements[0].startswith("SET LOCAL lock_timeout = ")
+        assert statements[1].startswith("SET LOCAL statement_timeout = ")
+
+    def test_noop_on_other_databases(self):
+        session = Mock()
+        session.get_bind.return_value.dialect.name = "sqlite"
+
+        apply_transaction_timeouts(session)
+
+        session.execute.assert_not_called()
+
+
+@pytest.mark.parametrize("controller_class", [OrderController, OrderDetailController])
+def test_write_routes_do_not_block_event_loop(controller_class):
+    endpoints = {route.name: route.endpoint for route in controller_class().router.routes}
+
+    assert endpoints
+    assert not any(inspect.iscoroutinefunction(endpoint) for endpoint in endpoints.values())
+
+
+def test_exhausted_retries_return_503():
+    from main import create_fastapi_app
+
+    app = create_fastapi_app()
+
+    @app.get("/boom")
+    def boom():
+        raise TransientDatabaseError("please retry")
+
+    response = TestClient(app).get("/boom")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,80 @@
+"""
+Cursor Utilities
+
+Opaque cursors for keyset (seek) pagination. A cursor encodes the sort key
+of the last row of a page; the next page continues strictly after it, so
+pages stay stable while rows are inserted and cost the same at any depth.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple, Type
+
+_DATETIME_TAG = "$dt"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and _DATETIME_TAG in value:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def _check_type(value: Any, expected: Type) -> Any:
+    # JSON has no int/bool/float distinction worth trusting: bools are
+    # never ids, and whole floats may come back as ints
+    if isinstance(value, bool):
+        raise ValueError
+    if expected is float and isinstance(value, int):
+        return float(value)
+    if not isinstance(value, expected):
+        raise ValueError
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode a row's sort key as an opaque URL-safe cursor
+
+    Args:
+        *values: Sort key values (JSON types or datetimes)
+
+    Returns:
+        The cursor string
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: Type) -> Tuple[Any, ...]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Cursors come back from clients, so each value is checked against the
+    expected sort key type before it reaches a query.
+
+    Args:
+        cursor: Cursor string from a previous page
+        *types: Expected type of each sort key value (e.g. datetime, int)
+
+    Returns:
+        Tuple of sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed or a value has the wrong type
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return tuple(
+            _check_type(_decode_value(value), expected) for value, expected in zip(values, types)
+        )
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
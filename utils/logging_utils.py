@@ -14,15 +14,30 @@ logger = logging.getLogger(__name__)
 
 # Patterns to detect and redact sensitive information
 SENSITIVE_PATTERNS = [
-    (r'password["\']?\s*[:=]\s*["\']?([^"\'&\s]+)', '[PASSWORD_REDACTED]'),
-    (r'token["\']?\s*[:=]\s*["\']?([^"\'&\s]+)', '[TOKEN_REDACTED]'),
-    (r'api[_-]?key["\']?\s*[:=]\s*["\']?([^"\'&\s]+)', '[API_KEY_REDACTED]'),
-    (r'secret["\']?\s*[:=]\s*["\']?([^"\'&\s]+)', '[SECRET_REDACTED]'),
-    (r'authorization["\']?\s*[:=]\s*["\']?([^"\'&\s]+)', '[AUTH_REDACTED]'),
+    (r'password["\']?\s*[:=]\s*["\']?[^"\'&\s]+', '[PASSWORD_REDACTED]'),
+    (r'token["\']?\s*[:=]\s*["\']?[^"\'&\s]+', '[TOKEN_REDACTED]'),
+    (r'api[_-]?key["\']?\s*[:=]\s*["\']?[^"\'&\s]+', '[API_KEY_REDACTED]'),
+    (r'secret["\']?\s*[:=]\s*["\']?[^"\'&\s]+', '[SECRET_REDACTED]'),
+    (r'authorization["\']?\s*[:=]\s*["\']?[^"\'&\s]+', '[AUTH_REDACTED]'),
     (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '[CARD_REDACTED]'),  # Credit cards
     (r'\b\d{3}-\d{2}-\d{4}\b', '[SSN_REDACTED]'),  # SSN
 ]
 
+# All patterns as one alternation, so a message is scanned once. The lookahead
+# skips positions that cannot start any pattern (keyword initials and digits;
+# extend it when adding a pattern) without trying every alternative there.
+_SENSITIVE_REGEX = re.compile(
+    r'(?=[ptas\d])(?:'
+    + '|'.join(f'(?P<p{i}>{pattern})' for i, (pattern, _) in enumerate(SENSITIVE_PATTERNS))
+    + ')',
+    re.IGNORECASE,
+)
+_REPLACEMENTS = {f'p{i}': replacement for i, (_, replacement) in enumerate(SENSITIVE_PATTERNS)}
+
+
+def _redact(match: re.Match) -> str:
+    return _REPLACEMENTS[match.lastgroup]
+
 
 def sanitize_string(text: str) -> str:
     """
@@ -37,12 +52,22 @@ def sanitize_string(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
 
-    sanitized = text
+    return _SENSITIVE_REGEX.sub(_redact, text)
+
 
-    for pattern, replacement in SENSITIVE_PATTERNS:
-        sanitized = re.sub(pattern, replacement, sanitized, flags=re.IGNORECASE)
+class SanitizingFilter(logging.Filter):
+    """
+    Redacts sensitive information from records as they are emitted
+
+    Attached to a logger, it only runs for records that passed the level
+    check, after lazy %-style arguments are merged into the message.
+    """
 
-    return sanitized
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        record.msg = sanitize_string(message)
+        record.args = None
+        return True
 
 
 def get_error_id() -> str:
@@ -166,30 +191,25 @@ def create_user_safe_error(error_id: str, operation: str = "operation") -> dict:
 class SanitizedLogger:
     """
     Wrapper around logging.Logger that automatically sanitizes all messages
+
+    The logging methods are the wrapped logger's own, so a disabled level
+    costs one level check: messages are formatted (pass arguments lazily,
+    e.g. logger.debug("Cache HIT: %s", key)) and sanitized by
+    SanitizingFilter only for records that are emitted.
     """
 
     def __init__(self, logger_instance: logging.Logger):
         self._logger = logger_instance
-
-    def debug(self, message: str, *args, **kwargs):
-        """Log debug message (sanitized)"""
-        self._logger.debug(sanitize_string(message), *args, **kwargs)
-
-    def info(self, message: str, *args, **kwargs):
-        """Log info message (sanitized)"""
-        self._logger.info(sanitize_string(message), *args, **kwargs)
-
-    def warning(self, message: str, *args, **kwargs):
-        """Log warning message (sanitized)"""
-        self._logger.warning(sanitize_string(message), *args, **kwargs)
-
-    def error(self, message: str, *args, **kwargs):
-        """Log error message (sanitized)"""
-        self._logger.error(sanitize_string(message), *args, **kwargs)
-
-    def critical(self, message: str, *args, **kwargs):
-        """Log critical message (sanitized)"""
-        self._logger.critical(sanitize_string(message), *args, **kwargs)
+        if not any(isinstance(f, SanitizingFilter) for f in logger_instance.filters):
+            logger_instance.addFilter(SanitizingFilter())
+
+        self.isEnabledFor = logger_instance.isEnabledFor
+        self.debug = logger_instance.debug
+        self.info = logger_instance.info
+        self.warning = logger_instance.warning
+        self.error = logger_instance.error
+        self.critical = logger_instance.critical
+        self.exception = logger_instance.exception
 
 
 def get_sanitized_logger(name: str) -> SanitizedLogger:
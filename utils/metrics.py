@@ -0,0 +1,185 @@
+"""
+Prometheus Metrics
+
+Request, rate limiting, cache, connection pool, transaction and logging metrics,
+exposed in the Prometheus text format by the /metrics endpoint.
+
+Collection is push-style and cheap: request metrics are recorded once per
+request by RequestPipelineMiddleware (children cached per route, no label
+validation on the hot path), pool gauges follow SQLAlchemy pool events,
+cache counters are incremented by CacheService. Nothing is computed at
+scrape time, so every worker's values are current.
+
+Multi-process: run_production.py sets PROMETHEUS_MULTIPROC_DIR before the
+uvicorn workers start. prometheus_client then keeps each worker's values in
+files there, and render_metrics() aggregates all workers (counters and
+histograms summed, gauges summed over live workers).
+"""
+import os
+from typing import Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    disable_created_metrics,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Route label of requests no route matched (404s, rate limit rejections)
+UNMATCHED_ROUTE = "none"
+
+# No *_created series: halves the counter output and nothing here uses them
+disable_created_metrics()
+
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ["method", "route"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled",
+    multiprocess_mode="livesum",
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected with 429, by binding limit",
+    ["limit"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by result (hit, miss, error)",
+    ["result"],
+)
+DB_TRANSACTIONS = Counter(
+    "db_transactions_total", "Transactional writes by operation and outcome (committed, retried, exhausted)",
+    ["operation", "result"],
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped because the handler's queue was full",
+    ["handler", "level"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out", "Database connections in use",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OPEN = Gauge(
+    "db_pool_connections_open", "Open database connections (idle + in use)",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_connections_max", "Maximum database connections (pool size + max overflow)",
+    multiprocess_mode="livesum",
+)
+
+CACHE_HITS = CACHE_REQUESTS.labels(result="hit")
+CACHE_MISSES = CACHE_REQUESTS.labels(result="miss")
+CACHE_ERRORS = CACHE_REQUESTS.labels(result="error")
+
+
+class RequestMetrics:
+    """Records HTTP request metrics, caching label children per route"""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, str, int], Counter] = {}
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def start(self) -> None:
+        """Count a request as in progress"""
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+
+    def finish(self, method: str, route: str, status: int, seconds: float) -> None:
+        """
+        Record a finished request
+
+        Args:
+            method: HTTP method (non-standard methods are recorded as OTHER)
+            route: Route template, or UNMATCHED_ROUTE
+            status: Response status code
+            seconds: Request latency
+        """
+        HTTP_REQUESTS_IN_PROGRESS.dec()
+        if method not in _METHODS:
+            method = "OTHER"
+
+        counter = self._counters.get((method, route, status))
+        if counter is None:
+            counter = self._counters[(method, route, status)] = HTTP_REQUESTS.labels(method, route, str(status))
+        counter.inc()
+
+        histogram = self._histograms.get((method, route))
+        if histogram is None:
+            histogram = self._histograms[(method, route)] = HTTP_REQUEST_DURATION.labels(method, route)
+        histogram.observe(seconds)
+
+
+# Global request metrics instance
+request_metrics = RequestMetrics()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Track an engine's connection pool in the pool gauges (idempotent)
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    if event.contains(engine, "checkout", _on_checkout):
+        return
+
+    pool = engine.pool
+    if hasattr(pool, "size") and hasattr(pool, "_max_overflow"):
+        DB_POOL_CAPACITY.inc(pool.size() + max(pool._max_overflow, 0))
+
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "close", _on_close)
+    event.listen(engine, "close_detached", _on_close)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    DB_POOL_OPEN.inc()
+
+
+def _on_close(dbapi_connection, *args) -> None:
+    DB_POOL_OPEN.dec()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Current metrics in the Prometheus text format
+
+    Returns:
+        (body, content type); aggregated over all workers in multi-process mode
+    """
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the aggregate (call on worker shutdown)"""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
@@ -1,13 +1,68 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor; hashes made with another cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-change")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRES_MINUTES = int(os.getenv("JWT_EXPIRES_MINUTES", "60"))
+JWT_PAYLOAD_CACHE_SIZE = int(os.getenv("JWT_PAYLOAD_CACHE_SIZE", "4096"))
+
+
+class _TokenPayloadCache:
+    """
+    Bounded, thread-safe LRU of verified token payloads
+
+    Keyed by a SHA-256 digest of the token (tokens are credentials), so a
+    token is verified once and later lookups cost a hash. Entries are
+    treated as absent once the payload's exp has passed.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                return None
+            exp = payload.get("exp")
+            if exp is not None and exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: str, payload: dict) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_payload_cache = _TokenPayloadCache(JWT_PAYLOAD_CACHE_SIZE)
 
 
 def hash_password(password: str) -> str:
@@ -18,6 +73,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password; on success also return a new hash if the stored one uses an outdated cost"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def create_access_token(subject: str, extra: dict | None = None, expires_minutes: int | None = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=expires_minutes or JWT_EXPIRES_MINUTES
@@ -29,7 +89,29 @@ def create_access_token(subject: str, extra: dict | None = None, expires_minutes
 
 
 def decode_access_token(token: str) -> dict | None:
+    key = token_payload_cache.key(token)
+    cached = token_payload_cache.get(key)
+    if cached is not None:
+        return dict(cached)
     try:
-        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
     except JWTError:
         return None
+    token_payload_cache.put(key, payload)
+    return dict(payload)
+
+
+def decode_request_token(request, token: str) -> dict | None:
+    """
+    Decode a bearer token once per request
+
+    The verified payload is stashed on request.state, so the rate limiter
+    and the auth dependencies of the same request share one decode.
+    """
+    state = request.state
+    if getattr(state, "access_token", None) == token:
+        return state.token_payload
+    payload = decode_access_token(token)
+    state.access_token = token
+    state.token_payload = payload
+    return payload
@@ -0,0 +1,356 @@
+"""
+OpenTelemetry Tracing
+
+Spans for each request and for where it spends its time:
+
+- Server span per request (RequestPipelineMiddleware), named after the
+  route template ("GET /orders/me"), continuing an incoming W3C traceparent
+- Service method spans (traced / traced_service; every BaseService
+  subclass is traced automatically)
+- SQL statement spans from SQLAlchemy engine events (trace_engine)
+- Redis command and pipeline spans (sync and asyncio clients)
+
+Requests without an X-Request-ID get the trace id as request id, so log
+lines and traces share one id; a client-provided id is recorded on the
+server span as http.request_id.
+
+Tracing is off unless TRACING_ENABLED=true (or setup_tracing() is given an
+exporter, e.g. InMemorySpanExporter in tests). When off, every hook is a
+single None check.
+
+Usage:
+    @traced_service
+    class ReportService:
+        def build(self): ...      # span "ReportService.build"
+"""
+import functools
+import inspect
+import logging
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+import wrapt
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import Headers
+from starlette.types import Scope
+
+from config.constants import TracingConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_STATEMENT_LENGTH = 2048
+
+_propagator = TraceContextTextMapPropagator()
+
+
+class _TracingState:
+    """Active provider and tracer (None while tracing is off)"""
+    provider: Optional[TracerProvider] = None
+    tracer: Optional[trace.Tracer] = None
+
+
+_state = _TracingState()
+
+
+def setup_tracing(
+    exporter: Optional[SpanExporter] = None,
+    sample_rate: Optional[float] = None,
+) -> Optional[TracerProvider]:
+    """
+    Start tracing
+
+    Args:
+        exporter: Span exporter, exported synchronously (tests); default:
+            OTLP/HTTP in batches, if TRACING_ENABLED
+        sample_rate: Share of new traces recorded (default: TracingConfig.SAMPLE_RATE)
+
+    Returns:
+        The tracer provider, or None if tracing is disabled
+    """
+    if exporter is None and not TracingConfig.ENABLED:
+        return None
+
+    if exporter is None:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        processor = BatchSpanProcessor(OTLPSpanExporter())
+    else:
+        processor = SimpleSpanProcessor(exporter)
+
+    rate = TracingConfig.SAMPLE_RATE if sample_rate is None else sample_rate
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": TracingConfig.SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(rate)),
+    )
+    provider.add_span_processor(processor)
+
+    shutdown_tracing()
+    _state.provider = provider
+    _state.tracer = provider.get_tracer(__name__)
+    _instrument_redis()
+    logger.info(f"✅ Tracing enabled: {TracingConfig.SERVICE_NAME}, sampling {rate:.0%} of new traces")
+    return provider
+
+
+def shutdown_tracing() -> None:
+    """Export pending spans and stop tracing"""
+    provider = _state.provider
+    _state.provider = _state.tracer = None
+    if provider is not None:
+        provider.shutdown()
+
+
+def get_tracer() -> Optional[trace.Tracer]:
+    """Active tracer, None while tracing is off"""
+    return _state.tracer
+
+
+# =============================================================================
+# SERVER SPANS
+# =============================================================================
+
+def start_server_span(scope: Scope, headers: Headers) -> Tuple[Optional[Span], Optional[object]]:
+    """
+    Start a request's server span and make it current
+
+    Args:
+        scope: ASGI HTTP scope
+        headers: Request headers (read for traceparent)
+
+    Returns:
+        (span, context token), both None while tracing is off
+    """
+    tracer = _state.tracer
+    if tracer is None:
+        return None, None
+
+    span = tracer.start_span(
+        f"HTTP {scope['method']}",
+        context=_propagator.extract(headers),
+        kind=SpanKind.SERVER,
+        attributes={
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+            "http.scheme": scope.get("scheme", "http"),
+        },
+    )
+    return span, otel_context.attach(trace.set_span_in_context(span))
+
+
+def trace_id_of(span: Optional[Span]) -> Optional[str]:
+    """Hex trace id of a span, None without a valid one"""
+    if span is None:
+        return None
+    span_context = span.get_span_context()
+    return format(span_context.trace_id, "032x") if span_context.is_valid else None
+
+
+def end_server_span(
+    span: Span,
+    token: object,
+    scope: Scope,
+    status_code: int,
+    request_id: str,
+    user_id: Optional[int] = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    """
+    Name a server span after the matched route, record the outcome and end it
+
+    Args:
+        span: Span from start_server_span
+        token: Context token from start_server_span
+        scope: ASGI HTTP scope (routed)
+        status_code: Response status code
+        request_id: Request id (X-Request-ID)
+        user_id: Authenticated user id, if any
+        error: Exception raised by the app, if any
+    """
+    route = getattr(scope.get("route"), "path", None)
+    if route:
+        span.update_name(f"{scope['method']} {route}")
+        span.set_attribute("http.route", route)
+    span.set_attribute("http.status_code", status_code)
+    span.set_attribute("http.request_id", request_id)
+    if user_id is not None:
+        span.set_attribute("enduser.id", str(user_id))
+    if error is not None:
+        span.record_exception(error)
+    if error is not None or status_code >= 500:
+        span.set_status(Status(StatusCode.ERROR))
+    span.end()
+    otel_context.detach(token)
+
+
+# =============================================================================
+# SERVICE SPANS
+# =============================================================================
+
+def traced(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator running a function (sync or async) in a span
+
+    Args:
+        name: Span name
+    """
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                tracer = _state.tracer
+                if tracer is None:
+                    return await func(*args, **kwargs)
+                with tracer.start_as_current_span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _state.tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def traced_service(cls: type) -> type:
+    """
+    Class decorator tracing the public methods a class defines
+
+    Spans are named "<Class>.<method>". Properties, static/class methods
+    and generators are left alone.
+
+    Args:
+        cls: Service class
+
+    Returns:
+        The same class
+    """
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(member) or inspect.isgeneratorfunction(member):
+            continue
+        setattr(cls, name, traced(f"{cls.__name__}.{name}")(member))
+    return cls
+
+
+# =============================================================================
+# SQL SPANS
+# =============================================================================
+
+def trace_engine(engine: Engine) -> None:
+    """
+    Record a span per SQL statement executed on an engine (idempotent)
+
+    Statements are recorded as sent (bound parameters are not).
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    tracer = _state.tracer
+    if tracer is None or context is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    context._otel_span = tracer.start_span(
+        operation,
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": conn.engine.dialect.name,
+            "db.operation": operation,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+        },
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    span = getattr(context, "_otel_span", None)
+    if span is not None:
+        context._otel_span = None
+        span.end()
+
+
+def _handle_error(exception_context) -> None:
+    context = exception_context.execution_context
+    span = getattr(context, "_otel_span", None)
+    if span is not None:
+        context._otel_span = None
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+
+# =============================================================================
+# REDIS SPANS
+# =============================================================================
+
+_redis_instrumented = False
+
+
+def _instrument_redis() -> None:
+    """Wrap redis-py command execution (sync and asyncio, clients and pipelines) once"""
+    global _redis_instrumented
+    if _redis_instrumented:
+        return
+    _redis_instrumented = True
+    wrapt.wrap_function_wrapper("redis.client", "Redis.execute_command", _trace_command)
+    wrapt.wrap_function_wrapper("redis.client", "Pipeline.execute", _trace_pipeline)
+    wrapt.wrap_function_wrapper("redis.asyncio.client", "Redis.execute_command", _trace_async_command)
+    wrapt.wrap_function_wrapper("redis.asyncio.client", "Pipeline.execute", _trace_async_pipeline)
+
+
+def _redis_span(tracer: trace.Tracer, operation: str, **attributes: Any):
+    # Command names only: keys and values may hold user data
+    return tracer.start_as_current_span(
+        operation, kind=SpanKind.CLIENT, attributes={"db.system": "redis", "db.operation": operation, **attributes}
+    )
+
+
+def _trace_command(wrapped, instance, args, kwargs):
+    tracer = _state.tracer
+    if tracer is None or not args:
+        return wrapped(*args, **kwargs)
+    with _redis_span(tracer, str(args[0]).upper()):
+        return wrapped(*args, **kwargs)
+
+
+def _trace_pipeline(wrapped, instance, args, kwargs):
+    tracer = _state.tracer
+    if tracer is None:
+        return wrapped(*args, **kwargs)
+    with _redis_span(tracer, "PIPELINE", **{"db.redis.pipeline_length": len(instance.command_stack)}):
+        return wrapped(*args, **kwargs)
+
+
+async def _trace_async_command(wrapped, instance, args, kwargs):
+    tracer = _state.tracer
+    if tracer is None or not args:
+        return await wrapped(*args, **kwargs)
+    with _redis_span(tracer, str(args[0]).upper()):
+        return await wrapped(*args, **kwargs)
+
+
+async def _trace_async_pipeline(wrapped, instance, args, kwargs):
+    tracer = _state.tracer
+    if tracer is None:
+        return await wrapped(*args, **kwargs)
+    with _redis_span(tracer, "PIPELINE", **{"db.redis.pipeline_length": len(instance.command_stack)}):
+        return await wrapped(*args, **kwargs)